@@ -0,0 +1,74 @@
+"""
+STT yuklash hajmi benchmarki
+Sintetik yozuvlar (nutqqa o'xshash signal + fon shovqini) WAV va FLAC da solishtiriladi:
+1. FLAC dekodlanganda asl PCM bilan bir xilligini tekshiradi (sifat yo'qolmaydi)
+2. Audio soniyasiga to'g'ri keladigan hajm (KB/s) va kodlash vaqtini (ms/s) o'lchaydi
+
+Ishga tushirish:
+    python benchmarks/bench_audio_codec.py
+"""
+
+import contextlib
+import io
+import os
+import sys
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "jarvis"))
+
+from core.audio_codec import AudioEncoder, sf
+
+ROUNDS = 10
+# (nom, namuna chastotasi, davomiylik soniyada)
+CLIPS = [("16 kHz, 5 s", 16000, 5.0), ("44.1 kHz, 5 s", 44100, 5.0), ("16 kHz, 12 s", 16000, 12.0)]
+# Yuklash tezligi (Mbit/s) - sekin ofis kanali
+UPLINK_MBPS = 1.0
+
+
+def make_wav(rate, seconds, rng):
+    """Nutqqa o'xshash signal: modulyatsiyalangan garmonikalar, pauzalar va fon shovqini"""
+    t = np.arange(int(rate * seconds)) / rate
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 8))
+    envelope = np.clip(np.sin(2 * np.pi * 1.8 * t), 0, None) ** 2
+    signal = 6000 * voice * envelope + rng.normal(0, 150, len(t))
+    pcm = np.clip(signal, -32768, 32767).astype(np.int16)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(pcm.tobytes())
+    return buffer.getvalue(), pcm
+
+
+def main():
+    if sf is None:
+        print("soundfile o'rnatilmagan: pip install soundfile")
+        sys.exit(1)
+    rng = np.random.default_rng(7)
+    ok = True
+    print(f"{'yozuv':<14} | {'WAV':>9} | {'FLAC':>9} | {'nisbat':>6} | {'kodlash':>11} | yuklash ({UPLINK_MBPS:g} Mbit/s)")
+    for name, rate, seconds in CLIPS:
+        wav_bytes, pcm = make_wav(rate, seconds, rng)
+        encoder = AudioEncoder()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(ROUNDS):
+                flac = encoder.to_flac(wav_bytes)
+        decoded, _ = sf.read(io.BytesIO(flac), dtype="int16")
+        match = np.array_equal(decoded, pcm)
+        ok &= match
+        stats = encoder.stats()
+        wav_ms = len(wav_bytes) * 8 / (UPLINK_MBPS * 1e6) * 1000
+        flac_ms = len(flac) * 8 / (UPLINK_MBPS * 1e6) * 1000
+        print(f"{name:<14} | {len(wav_bytes) / 1024 / seconds:5.1f} KB/s | {stats['kb_per_second']:5.1f} KB/s | "
+              f"{stats['ratio']:6.2f} | {stats['encode_ms_per_second']:5.2f} ms/s | "
+              f"{wav_ms:5.0f} -> {flac_ms:5.0f} ms {'OK' if match else 'FARQ'}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Ma'lumotlar bazasi benchmarki
+Eski "har chaqiruvda connect/close" usulini va ulanishlar hovuzi (WAL + synchronous=NORMAL)
+bilan ishlaydigan DatabaseManager ni bir nechta oqimda solishtiradi.
+Har bir oqim get_answer / save_qa aralashmasini bajaradi; o'tkazuvchanlik va p99 kechikish o'lchanadi
+(yangi menejer bilan o'lchov write-behind navbati va get_answer keshini ham o'z ichiga oladi).
+Alohida bo'limlarda get_answer oldidagi kesh (topilgan va topilmagan savollar) va
+5000 ta sintetik dastur bilan save_apps (eski tsikl / executemany / faqat o'zgarganlar) o'lchanadi.
+Vaqtinchalik bazada ishlaydi - data/jarvis.db ga tegmaydi.
+
+Ishga tushirish:
+    python benchmarks/bench_database.py
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "jarvis"))
+
+from core.database import DatabaseManager
+
+THREADS = (1, 4, 8)
+OPS_PER_THREAD = 400
+WRITE_RATIO = 0.2
+SEED_ROWS = 500
+
+
+class LegacyDatabase:
+    """Eski DatabaseManager: har bir so'rovda yangi ulanish (etalon)"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE IF NOT EXISTS qa (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                     "question TEXT UNIQUE, answer TEXT, timestamp DATETIME)")
+        conn.commit()
+        conn.close()
+
+    def save_qa(self, question, answer):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.execute("INSERT OR REPLACE INTO qa (question, answer, timestamp) VALUES (?, ?, ?)",
+                     (question.lower().strip(), answer, datetime.now()))
+        conn.commit()
+        conn.close()
+
+    def get_answer(self, question):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        result = conn.execute("SELECT answer FROM qa WHERE question = ?",
+                              (question.lower().strip(),)).fetchone()
+        conn.close()
+        return result[0] if result else None
+
+    def close(self):
+        pass
+
+
+def worker(db, questions, rng, latencies, errors):
+    local = []
+    for _ in range(OPS_PER_THREAD):
+        question = rng.choice(questions)
+        start = time.perf_counter()
+        try:
+            if rng.random() < WRITE_RATIO:
+                db.save_qa(question, f"javob {rng.random()}")
+            else:
+                db.get_answer(question)
+        except Exception:
+            errors.append(1)
+        local.append(time.perf_counter() - start)
+    latencies.extend(local)
+
+
+def run(factory, threads):
+    tmp = tempfile.mkdtemp(prefix="jarvis_bench_")
+    db = factory(os.path.join(tmp, "bench.db"))
+    questions = [f"savol raqam {i}" for i in range(SEED_ROWS)]
+    for question in questions:
+        db.save_qa(question, "javob")
+
+    latencies, errors = [], []
+    pool = [
+        threading.Thread(target=worker, args=(db, questions, random.Random(i), latencies, errors))
+        for i in range(threads)
+    ]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+    db.close()
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    return len(latencies) / elapsed, p50, p99, len(errors)
+
+
+def bench_front_cache(rounds=20000):
+    """get_answer: keshsiz (to'g'ridan-to'g'ri so'rov) va kesh orqali, topilgan va topilmagan savollar"""
+    tmp = tempfile.mkdtemp(prefix="jarvis_bench_")
+    db = DatabaseManager(os.path.join(tmp, "cache.db"))
+    db.save_qa("salom", "Assalomu alaykum!")
+    db.await_flush()
+
+    def timed(fn):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            fn()
+        return (time.perf_counter() - start) / rounds * 1e6
+
+    for name, question in (("topilgan", "salom"), ("topilmagan", "bu savol bazada yo'q")):
+        def uncached():
+            db.clear_cache()
+            db.get_answer(question)
+        direct = timed(uncached)
+        cached = timed(lambda: db.get_answer(question))
+        print(f"get_answer ({name:<10}) | keshsiz: {direct:7.2f} us | kesh: {cached:5.2f} us")
+    print(f"Kesh: {db.cache_info()}")
+    db.close()
+
+
+def legacy_save_apps(db_path, apps_dict):
+    """Eski save_apps: har bir dastur uchun alohida execute va datetime.now()"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    for name, path in apps_dict.items():
+        cursor.execute("INSERT OR REPLACE INTO apps (name, path, last_scanned) VALUES (?, ?, ?)",
+                       (name.lower(), path, datetime.now()))
+    conn.commit()
+    conn.close()
+
+
+def bench_save_apps(count=5000, rounds=5):
+    """save_apps: 5k dasturli skan natijasini yozish"""
+    rng = random.Random(7)
+    apps = {f"Dastur {i}": rf"C:\Program Files\Vendor{rng.randint(0, 99)}\app{i}.exe" for i in range(count)}
+    changed = dict(apps)
+    for name in rng.sample(sorted(apps), count // 100):
+        changed[name] = changed[name].replace(".exe", "_v2.exe")
+
+    tmp = tempfile.mkdtemp(prefix="jarvis_bench_")
+    db = DatabaseManager(os.path.join(tmp, "apps.db"))
+
+    def timed(fn):
+        best = float("inf")
+        for _ in range(rounds):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        return best * 1000
+
+    # Har chaqiruvda apps <-> changed almashadi, ya'ni har safar 1% qator yoziladi
+    flip = [False]
+
+    def diff_changed():
+        flip[0] = not flip[0]
+        return db.save_apps(changed if flip[0] else apps, only_changed=True)
+
+    cases = (
+        ("eski (tsikl + now())", lambda: legacy_save_apps(db.db_path, apps)),
+        ("executemany", lambda: db.save_apps(apps)),
+        ("diff (o'zgarishsiz)", lambda: db.save_apps(apps, only_changed=True)),
+        ("diff (1% o'zgargan)", diff_changed),
+    )
+    for name, fn in cases:
+        print(f"save_apps {count} ta | {name:<22} | {timed(fn):7.1f} ms")
+    db.close()
+
+
+def main():
+    # Benchmark vaqtida DB loglari chiqmasin
+    import builtins
+    real_print = builtins.print
+    builtins.print = lambda *a, **k: None if a and str(a[0]).startswith("[DB]") else real_print(*a, **k)
+
+    print(f"{OPS_PER_THREAD} amal/oqim, yozish ulushi {WRITE_RATIO:.0%}")
+    for threads in THREADS:
+        for name, factory in (("eski (connect/call)", LegacyDatabase),
+                              ("hovuz + WAL", lambda path: DatabaseManager(path))):
+            ops, p50, p99, errs = run(factory, threads)
+            print(f"{threads} oqim | {name:<20} | {ops:8.0f} amal/s | p50 {p50:6.2f} ms | "
+                  f"p99 {p99:7.2f} ms | xatolar: {errs}")
+    print()
+    bench_front_cache()
+    print()
+    bench_save_apps()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Buyruq dispetcheri benchmarki
+Ro'yxatdan o'tgan barcha (CommandType, action) juftliklari uchun handler topish
+vaqtini o'lchaydi va uni eski if/elif zanjiriga teng chiziqli qidiruv bilan solishtiradi.
+Handlerlar chaqirilmaydi (ular kompyuterni boshqaradi) - faqat dispetcherlash narxi o'lchanadi.
+
+Ishga tushirish (to'liq muhit kerak: pygame, edge-tts, psutil, ...):
+    python benchmarks/bench_dispatch.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "jarvis"))
+
+from core.jarvis import jarvis
+
+ROUNDS = 20000
+
+
+def linear_resolve(routes, command_type, action):
+    """if/elif zanjiri kabi: juftliklarni ketma-ket solishtirish"""
+    for route_type, route_action in routes:
+        if route_type == command_type and route_action == action:
+            return route_type, route_action
+    return None
+
+
+def main():
+    registry = jarvis._registry
+    routes = registry.routes()
+    print(f"Ro'yxatdan o'tgan handlerlar: {len(routes)}")
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for command_type, action in routes:
+            registry.resolve(command_type, action)
+    table_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for command_type, action in routes:
+            linear_resolve(routes, command_type, action)
+    linear_time = time.perf_counter() - start
+
+    lookups = ROUNDS * len(routes)
+    print(f"Jadval (dict):      {table_time / lookups * 1e9:8.0f} ns/buyruq")
+    print(f"Chiziqli (if/elif): {linear_time / lookups * 1e9:8.0f} ns/buyruq")
+
+    print("\nHar bir tur bo'yicha (ns/buyruq):")
+    by_type = {}
+    for command_type, action in routes:
+        by_type.setdefault(command_type, []).append(action)
+    for command_type, actions in sorted(by_type.items(), key=lambda item: item[0].name):
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            for action in actions:
+                registry.resolve(command_type, action)
+        elapsed = time.perf_counter() - start
+        print(f"  {command_type.name:<13} {len(actions):>3} action  {elapsed / (ROUNDS * len(actions)) * 1e9:6.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Fuzzy normalizatsiya benchmarki
+Eski chiziqli Levenshtein qidiruvi va SymSpell indeksini solishtiradi:
+1. Regressiya korpusida natijalar bir xil ekanligini tekshiradi
+2. 100, 1k va 10k kalit so'zda tezlikni o'lchaydi
+"""
+
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "jarvis"))
+
+from core.commands import CommandParser
+from core.fuzzy import DeletionIndex
+
+ALPHABET = string.ascii_lowercase + "'"
+
+
+def linear_lookup(word, keywords):
+    """Eski `_fuzzy_normalize` dagi chiziqli qidiruv (etalon)"""
+    best_match = None
+    best_distance = float('inf')
+    for keyword in keywords:
+        if abs(len(word) - len(keyword)) > 2:
+            continue
+        dist = CommandParser._levenshtein(word, keyword)
+        if dist < best_distance:
+            best_distance = dist
+            best_match = keyword
+    max_dist = 1 if len(word) <= 4 else 2
+    if best_match and 0 < best_distance <= max_dist:
+        return best_match
+    return None
+
+
+def index_lookup(word, index):
+    max_dist = 1 if len(word) <= 4 else 2
+    match = index.lookup(word, max_dist)
+    if match and match[1] > 0:
+        return match[0]
+    return None
+
+
+def mutate(word, rng):
+    """So'zga 1-3 ta tasodifiy tahrir kiritish"""
+    chars = list(word)
+    for _ in range(rng.randint(1, 3)):
+        op = rng.choice("isd")
+        pos = rng.randint(0, len(chars))
+        if op == "i":
+            chars.insert(pos, rng.choice(ALPHABET))
+        elif chars and op == "s":
+            chars[min(pos, len(chars) - 1)] = rng.choice(ALPHABET)
+        elif chars:
+            del chars[min(pos, len(chars) - 1)]
+    return "".join(chars)
+
+
+def random_word(rng):
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(3, 11)))
+
+
+def build_corpus(keywords, rng, size):
+    corpus = [mutate(rng.choice(keywords), rng) for _ in range(size)]
+    corpus += [random_word(rng) for _ in range(size // 4)]
+    return [w for w in corpus if len(w) >= 3 and w not in keywords]
+
+
+def check_regression(parser, rng):
+    """Haqiqiy kalit so'zlar lug'atida natijalar aynan bir xilligini tekshirish"""
+    keywords = parser._keywords
+    corpus = list(parser._known_corrections) + build_corpus(keywords, rng, 5000)
+    mismatches = [
+        w for w in corpus
+        if len(w) >= 3 and w not in keywords
+        and linear_lookup(w, keywords) != index_lookup(w, parser._keyword_index)
+    ]
+    print(f"Regressiya: {len(corpus)} so'z, farqlar: {len(mismatches)}")
+    if mismatches:
+        print(f"  Namuna: {mismatches[:10]}")
+    return not mismatches
+
+
+def bench(size, rng, queries=300):
+    base = CommandParser()._keywords
+    keywords = list(dict.fromkeys(base))
+    while len(keywords) < size:
+        keywords.append(random_word(rng))
+    keywords = keywords[:size]
+    corpus = build_corpus(keywords, rng, queries)
+
+    start = time.perf_counter()
+    index = DeletionIndex(keywords, CommandParser._levenshtein, max_distance=2)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = [linear_lookup(w, keywords) for w in corpus]
+    linear_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [index_lookup(w, index) for w in corpus]
+    index_time = time.perf_counter() - start
+
+    assert expected == actual, f"{size} kalit so'zda natijalar farq qildi"
+    per_linear = linear_time / len(corpus) * 1e6
+    per_index = index_time / len(corpus) * 1e6
+    print(f"{size:>6} kalit so'z | chiziqli: {per_linear:9.1f} us/so'z | "
+          f"indeks: {per_index:7.1f} us/so'z | tezlanish: {per_linear / per_index:6.1f}x | "
+          f"qurish: {build_time * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    rng = random.Random(42)
+    ok = check_regression(CommandParser(), rng)
+    for size in (100, 1000, 10000):
+        bench(size, rng)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,100 @@
+"""
+Ko'p tilli STT benchmarki
+Google STT o'rnida kechikishi sozlanadigan soxta recognizer ishlatiladi (tarmoq kerak emas).
+Eski ketma-ket usul (uz -> en -> ru) va MultiLanguageRecognizer (parallel) ni solishtiradi:
+1. Har bir stsenariyda natija bir xilligini tekshiradi
+2. O'rtacha va p95 kechikishni o'lchaydi
+
+Ishga tushirish:
+    python benchmarks/bench_stt.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "jarvis"))
+
+from core.stt import MultiLanguageRecognizer
+
+LANGUAGES = ["uz-UZ", "en-US", "ru-RU"]
+MIN_CONFIDENCE = 0.6
+ROUNDS = 20
+
+# Bitta so'rovning taxminiy kechikishi (soniya): o'rtacha va tarqalish
+LATENCY = {"uz-UZ": (0.45, 0.10), "en-US": (0.35, 0.08), "ru-RU": (0.40, 0.08)}
+
+# Stsenariy: til -> (matn, ishonch); yo'q til - nutq topilmadi
+SCENARIOS = {
+    "o'zbekcha": {"uz-UZ": ("soat necha bo'ldi", 0.92), "en-US": ("so at nature", 0.41)},
+    "inglizcha": {"en-US": ("open youtube", 0.95), "uz-UZ": ("o'pen yutub", 0.35), "ru-RU": ("опен ютуб", 0.52)},
+    "ruscha": {"ru-RU": ("открой телеграм", 0.90)},
+    "nutq yo'q": {},
+}
+
+
+class StandInRecognizer:
+    """recognize_google o'rnini bosuvchi: kechikish + oldindan berilgan natija"""
+
+    def __init__(self, answers, rng):
+        self.answers = answers
+        self.rng = rng
+
+    def __call__(self, lang):
+        mean, spread = LATENCY[lang]
+        time.sleep(max(0.05, self.rng.gauss(mean, spread)))
+        return self.answers.get(lang)
+
+
+def sequential(recognize):
+    """Eski speech_to_text: tillarni ketma-ket so'rash, birinchi bo'sh bo'lmagan natija"""
+    for lang in LANGUAGES:
+        result = recognize(lang)
+        if result and result[0]:
+            return result[0]
+    return None
+
+
+def expected(answers):
+    """Ustuvorlik bo'yicha birinchi ishonchli natija (bo'lmasa - birinchi bo'sh bo'lmagani)"""
+    for lang in LANGUAGES:
+        result = answers.get(lang)
+        if result and result[1] >= MIN_CONFIDENCE:
+            return result[0]
+    for lang in LANGUAGES:
+        if answers.get(lang):
+            return answers[lang][0]
+    return None
+
+
+def measure(fn):
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return result, sum(timings) / len(timings) * 1000, timings[int(len(timings) * 0.95) - 1] * 1000
+
+
+def main():
+    rng = random.Random(3)
+    stt = MultiLanguageRecognizer(LANGUAGES, MIN_CONFIDENCE)
+    ok = True
+    print(f"{'stsenariy':<11} | {'ketma-ket':>18} | {'parallel':>18} | natija")
+    for name, answers in SCENARIOS.items():
+        recognize = StandInRecognizer(answers, rng)
+        seq_result, seq_mean, seq_p95 = measure(lambda: sequential(recognize))
+        par, par_mean, par_p95 = measure(lambda: stt.recognize(recognize))
+        par_result = par[1] if par else None
+        match = par_result == expected(answers)
+        ok &= match
+        print(f"{name:<11} | {seq_mean:6.0f} / p95 {seq_p95:5.0f} ms | {par_mean:6.0f} / p95 {par_p95:5.0f} ms | "
+              f"{par_result!r} {'OK' if match else 'FARQ'}"
+              + ("" if seq_result == par_result else f" (ketma-ket: {seq_result!r})"))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+TTS worker connector benchmarki
+Edge TTS servisi o'rnida lokal websocket server (edge_tts protokoli, tarmoq kerak emas) ishlatiladi.
+TTSWorker ning umumiy connector i va har so'rovda yangi connector (edge_tts uni yopib qo'yadigan
+oddiy aiohttp.TCPConnector - oldingi holat) solishtiriladi:
+1. Yaratilgan connectorlar soni
+2. DNS so'rovlari soni (connector resolveri orqali)
+3. Bitta sintez vaqti
+
+Eslatma: websocket ulanishi har so'rovda yangidan ochiladi (aiohttp ularni pool ga qaytarmaydi),
+shuning uchun TLS handshake ikkala holatda ham bor - qayta ishlatiladigani DNS va connector.
+
+Ishga tushirish (edge-tts va aiohttp kerak):
+    python benchmarks/bench_tts_worker.py
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "jarvis"))
+
+import aiohttp
+import aiohttp.connector
+import edge_tts.communicate
+from aiohttp import web
+
+from core import tts_worker as tts_worker_module
+from core.tts_worker import TTSWorker
+
+SENTENCES = 30
+VOICE = "uz-UZ-SardorNeural"
+AUDIO = b"\xff\xf3" * 2048
+
+
+class CountingResolver(aiohttp.connector.DefaultResolver):
+    """Har bir DNS so'rovini sanaydi"""
+    lookups = 0
+
+    async def resolve(self, host, port=0, family=0):
+        CountingResolver.lookups += 1
+        return await super().resolve(host, port, family)
+
+
+async def fake_edge(request):
+    """SSML so'roviga bitta audio blok va turn.end bilan javob"""
+    ws = web.WebSocketResponse()
+    await ws.prepare(request)
+    async for message in ws:
+        if message.type == aiohttp.WSMsgType.TEXT and "Path:ssml" in message.data:
+            headers = b"X-RequestId:1\r\nContent-Type:audio/mpeg\r\nPath:audio\r\n"
+            await ws.send_bytes(len(headers).to_bytes(2, "big") + headers + AUDIO)
+            await ws.send_str("X-RequestId:1\r\nPath:turn.end\r\n\r\n{}")
+            break
+    await ws.close()
+    return ws
+
+
+def start_server():
+    """Lokal servis alohida oqimda; port qaytariladi"""
+    ready = threading.Event()
+    port = []
+
+    def run():
+        loop = asyncio.new_event_loop()
+        app = web.Application()
+        app.router.add_get("/edge/v1", fake_edge)
+        runner = web.AppRunner(app)
+        loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, "localhost", 0)
+        loop.run_until_complete(site.start())
+        port.append(site._server.sockets[0].getsockname()[1])
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return port[0]
+
+
+def run_worker(label, make_connector):
+    """SENTENCES ta gapni sintez qilish -> (connectorlar, DNS so'rovlari, o'rtacha ms)"""
+    created = [0]
+
+    def counting_factory():
+        created[0] += 1
+        return make_connector()
+
+    tts_worker_module._make_shared_connector = counting_factory
+    CountingResolver.lookups = 0
+    worker = TTSWorker(cache=None)
+    worker.synthesize("qizdirish", VOICE)
+    created[0], CountingResolver.lookups = 0, 0
+    start = time.perf_counter()
+    for index in range(SENTENCES):
+        assert worker.synthesize(f"Gap raqami {index}.", VOICE) == AUDIO
+    elapsed = (time.perf_counter() - start) / SENTENCES * 1000
+    worker.stop()
+    print(f"{label:<22} | {created[0]:11d} | {CountingResolver.lookups:11d} | {elapsed:8.2f} ms")
+    return created[0], CountingResolver.lookups
+
+
+def main():
+    port = start_server()
+    edge_tts.communicate.WSS_URL = f"ws://localhost:{port}/edge/v1?TrustedClientToken=local"
+    aiohttp.connector.DefaultResolver = CountingResolver
+
+    shared_factory = tts_worker_module._make_shared_connector
+    print(f"{SENTENCES} ta gap, lokal edge servis (birinchi - qizdirish - so'rovdan keyin)")
+    print(f"{'':<22} | {'connectorlar':>11} | {'DNS so`rov':>11} | {'sintez':>11}")
+    old = run_worker("har so'rovda yangi", lambda: aiohttp.TCPConnector(limit=4))
+    new = run_worker("umumiy connector", shared_factory)
+    sys.exit(0 if new[0] <= 1 and new[1] < old[1] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Wake word matcher benchmarki
+Eski substring tekshiruvi (any(word.lower() in text ...)) va WakeWordMatcher solishtiriladi:
+1. Noto'g'ri ishga tushishlar - wake word bo'lmagan gaplar korpusida (o'zbek, ingliz, rus)
+2. Aniqlash - wake word bor gaplar (lotin va kirill, turli shakllar)
+3. Bitta tekshiruv vaqti
+
+Ishga tushirish:
+    python benchmarks/bench_wake_matcher.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "jarvis"))
+
+import config
+from core.wake_matcher import WakeWordMatcher
+
+ROUNDS = 200
+
+# Google STT odatdagi nutqdan qaytaradigan gaplar - ishga tushirmasligi kerak
+# ("alisa" sozlamada to'liq og'irlikdagi shakl - ism sifatida aytilsa ham topiladi)
+NON_WAKE = [
+    # o'zbekcha
+    "jadvalni ochib ber", "javob bermadi", "jarayon tugadi", "janubga qarab yur", "jahon yangiliklari",
+    "joriy vaqt necha bo'ldi", "ishni bajar", "vazifani bajarib qo'y", "bugun juma", "jamoa yig'ilishi soat uchda",
+    "jarima to'ladingmi", "yangi joy topdim", "jasur qayerda", "jamshid qo'ng'iroq qildi", "jang filmini qo'y",
+    "jonli efirni och", "jo'jalar uchun ovqat", "ajoyib kun", "hajmi qancha", "mijozga javob yoz",
+    "alisher navoiy haqida gapir", "jarlik yonida", "jarvisning narxi qancha emas", "jadal ishla",
+    "ob-havo qanday", "musiqani baland qil", "telegramni och", "kompyuterni o'chir", "eslatma qo'sh",
+    "jon do'stim keldi", "joriy oy hisoboti", "ja ja tushundim hammasini", "jar yoqasida uy",
+    # inglizcha
+    "open the jar of jam", "java is installed", "javascript tutorial", "january schedule", "japan travel guide",
+    "jazz music please", "a major project", "just do it", "jordan is here", "jargon free explanation",
+    "the majority voted", "pajamas are on the bed", "play some jams", "jar jar binks", "injured player list",
+    "what is the weather", "set an alarm for seven", "alison called me", "ninja warrior", "rajasthan tour",
+    # ruscha (kirill)
+    "открой таблицу", "я не знаю", "жара на улице", "жаркий день", "джаз включи", "журнал открой",
+    "жарить картошку", "алиса в стране чудес книга", "важный звонок", "уважаемый коллега", "жалко",
+    "я пришёл домой", "включи музыку", "сколько время", "джинсы купить",
+]
+
+# Wake word bor gaplar - barchasi aniqlanishi kerak
+WAKE = [
+    "jarvis", "jarvis musiqa qo'y", "hey jarvis", "Jarvis, what time is it", "jarvis ob-havo qanday",
+    "hello jarvis", "жарвис", "джарвис открой браузер", "Джарвис, привет", "жарвис включи музыку",
+    "alisa", "алиса", "alisa telegramni och", "jarvisuz", "ok jarvisuz", "jarvi", "jarvi ochib ber",
+    "jar", "ja", "jori",
+]
+
+
+def old_match(text, wake_words):
+    """Eski tekshiruv (wake_word.py): har safar lower(), substring"""
+    return any(word.lower() in text for word in wake_words)
+
+
+def measure(fn, texts):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - start) / (ROUNDS * len(texts)) * 1e6
+
+
+def main():
+    wake_words = config.JARVIS_WAKE_WORDS
+    build = time.perf_counter()
+    matcher = WakeWordMatcher(wake_words, config.WAKE_WORD_WEIGHTS, config.WAKE_MATCH_MIN_SCORE)
+    build_ms = (time.perf_counter() - build) * 1000
+
+    old_false = [t for t in NON_WAKE if old_match(t.lower(), wake_words)]
+    new_false = [t for t in NON_WAKE if matcher.match(t)]
+    old_hits = sum(old_match(t.lower(), wake_words) for t in WAKE)
+    new_hits = sum(matcher.match(t) for t in WAKE)
+    texts = [t.lower() for t in NON_WAKE + WAKE]
+
+    print(f"Korpus: {len(NON_WAKE)} oddiy gap, {len(WAKE)} wake word li gap")
+    print(f"{'':<10} | {'noto`g`ri':>12} | {'aniqlandi':>9} | {'tekshiruv':>9}")
+    print(f"{'substring':<10} | {len(old_false):4d} ({len(old_false) / len(NON_WAKE):5.1%}) | "
+          f"{old_hits:4d}/{len(WAKE):<4d} | {measure(lambda t: old_match(t, wake_words), texts):6.2f} us")
+    print(f"{'matcher':<10} | {len(new_false):4d} ({len(new_false) / len(NON_WAKE):5.1%}) | "
+          f"{new_hits:4d}/{len(WAKE):<4d} | {measure(matcher.match, texts):6.2f} us  (qurish {build_ms:.2f} ms)")
+    # Qolganlari - to'liq og'irlikdagi shakl alohida so'z sifatida aytilgan (masalan "alisa" ismi)
+    for text in new_false:
+        print(f"  noto'g'ri: {text!r} -> {matcher.find(text)}")
+    for text in WAKE:
+        if not matcher.match(text):
+            print(f"  topilmadi: {text!r} ({matcher.score(text):.2f})")
+    sys.exit(0 if len(new_false) < len(old_false) and new_hits >= old_hits else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Lokal wake word aniqlagich benchmarki
+Sintetik "so'zlar" (formant sintezi: unlilar, shovqinli undoshlar) turli ovoz balandligi,
+tezlik, formant siljishi va fon shovqini bilan yaratiladi. KeywordSpotter "jarvis"
+namunalari bilan o'rgatiladi va quyidagilar o'lchanadi:
+1. Aniqlash darajasi (wake word o'tkazib yuborilmasligi kerak) va rad etilgan boshqa iboralar
+2. CPU yuklamasi (audio soniyasiga CPU vaqti) va bitta yozuvni tekshirish kechikishi
+3. Bulutli STT so'rovlari: eski usul (har yozuv uchun 2 tilgacha) va lokal filtrdan keyin
+
+Ishga tushirish:
+    python benchmarks/bench_wake_word.py
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "jarvis"))
+
+from core.keyword_spotter import KeywordSpotter, SAMPLE_RATE
+
+RATE = SAMPLE_RATE
+ENROLL = 4
+CLIPS_PER_WORD = 40
+CLOUD_LANGS = 2
+MIN_DETECTION = 0.95
+
+# Tovush: (F1, F2, F3) Hz, davomiylik (s), "v" - jarangli / "n" - shovqinli
+PHONES = {
+    "a": ((750, 1250, 2600), 0.12, "v"), "i": ((300, 2300, 3000), 0.10, "v"),
+    "o": ((500, 900, 2500), 0.12, "v"), "u": ((350, 800, 2300), 0.10, "v"),
+    "e": ((500, 1900, 2600), 0.10, "v"), "r": ((450, 1200, 1600), 0.06, "v"),
+    "l": ((400, 1000, 2700), 0.06, "v"), "m": ((300, 1000, 2300), 0.07, "v"),
+    "n": ((300, 1500, 2500), 0.06, "v"), "v": ((300, 1400, 2300), 0.05, "v"),
+    "s": ((5000, 6500, 7500), 0.10, "n"), "sh": ((2500, 3500, 4500), 0.10, "n"),
+    "j": ((1800, 2800, 3800), 0.07, "n"), "t": ((3500, 4500, 6000), 0.03, "n"),
+    "k": ((1500, 2500, 3500), 0.04, "n"), "q": ((1000, 2000, 3000), 0.04, "n"),
+}
+WAKE = ["j", "a", "r", "v", "i", "s"]
+OTHERS = {
+    "salom": ["s", "a", "l", "o", "m"],
+    "musiqa": ["m", "u", "s", "i", "q", "a"],
+    "telegram": ["t", "e", "l", "e", "r", "a", "m"],
+    "ochir": ["o", "sh", "i", "r"],
+    "marvarid": ["m", "a", "r", "v", "a", "r", "i", "t"],
+    "jasur": ["j", "a", "s", "u", "r"],
+}
+
+
+def synthesize(phones, rng):
+    """Bitta yozuv: tasodifiy ovoz, tezlik, formant, shovqin va atrofdagi sukunat"""
+    pitch = rng.uniform(95, 220)
+    speed = rng.uniform(0.85, 1.15)
+    shift = rng.uniform(0.92, 1.08)
+    parts = [np.zeros(int(RATE * rng.uniform(0.1, 0.4)))]
+    phase = 0.0
+    for name in phones:
+        formants, duration, kind = PHONES[name]
+        n = int(RATE * duration * speed * rng.uniform(0.9, 1.1))
+        if kind == "v":
+            t = np.arange(n) / RATE
+            phase_track = phase + 2 * np.pi * np.cumsum(np.full(n, pitch)) / RATE
+            phase = phase_track[-1]
+            segment = np.zeros(n)
+            for k in range(1, int(4000 / pitch)):
+                freq = k * pitch
+                gain = sum(np.exp(-((freq - f * shift) / 90.0) ** 2) for f in formants)
+                segment += gain * np.sin(k * phase_track) / k ** 0.5
+            segment *= 0.5 + 0.5 * np.sin(np.pi * np.clip(t / (duration * speed), 0, 1)) ** 0.5
+        else:
+            spectrum = np.fft.rfft(rng.normal(0, 1, n))
+            freqs = np.fft.rfftfreq(n, 1 / RATE)
+            shape = sum(np.exp(-((freqs - f * shift) / 600.0) ** 2) for f in formants)
+            segment = np.fft.irfft(spectrum * shape, n) * 4
+        parts.append(segment)
+    parts.append(np.zeros(int(RATE * rng.uniform(0.1, 0.4))))
+    signal = np.concatenate(parts)
+    signal = signal / (np.abs(signal).max() + 1e-9) * rng.uniform(4000, 16000)
+    signal += rng.normal(0, rng.uniform(80, 300), len(signal))
+    return np.clip(signal, -32768, 32767).astype(np.int16).tobytes()
+
+
+def main():
+    rng = np.random.default_rng(11)
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        spotter = KeywordSpotter(directory, calls_per_clip=CLOUD_LANGS)
+        for _ in range(ENROLL):
+            spotter.enroll(synthesize(WAKE, rng))
+
+        wake_hits = sum(spotter.check(synthesize(WAKE, rng)) for _ in range(CLIPS_PER_WORD))
+        passed = {name: sum(spotter.check(synthesize(phones, rng)) for _ in range(CLIPS_PER_WORD))
+                  for name, phones in OTHERS.items()}
+        stats = spotter.stats()
+
+    detection = wake_hits / CLIPS_PER_WORD
+    print(f"Shablonlar: {stats['templates']}, chegara: {stats['threshold']:.2f}")
+    print(f"jarvis      : {wake_hits}/{CLIPS_PER_WORD} aniqlandi ({detection:.0%})")
+    for name, count in passed.items():
+        print(f"{name:<12}: {count}/{CLIPS_PER_WORD} bulutga o'tdi")
+
+    other_clips = CLIPS_PER_WORD * len(OTHERS)
+    total = CLIPS_PER_WORD + other_clips
+    cloud_before = total * CLOUD_LANGS
+    cloud_after = (wake_hits + sum(passed.values())) * CLOUD_LANGS
+    print(f"CPU: {stats['cpu_percent']:.2f}% (audio soniyasiga), kechikish: "
+          f"o'rtacha {stats['latency_ms_avg']:.1f} ms, eng ko'pi {stats['latency_ms_max']:.1f} ms")
+    print(f"Bulutli so'rovlar ({total} yozuv): {cloud_before} -> {cloud_after} "
+          f"(tejaldi {stats['calls_avoided']}, {stats['calls_avoided'] / cloud_before:.0%})")
+    sys.exit(0 if detection >= MIN_DETECTION else 1)
+
+
+if __name__ == "__main__":
+    main()
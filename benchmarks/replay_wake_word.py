@@ -0,0 +1,203 @@
+"""
+Wake word detektorini offline qayta ijro bilan baholash
+Belgilangan WAV korpus WakeWordDetector orqali o'tkaziladi (mikrofon va tarmoq shart emas):
+1. Soatiga noto'g'ri ishga tushishlar (false trigger / soat)
+2. O'tkazib yuborilgan wake word lar ulushi (miss rate)
+3. Ishga tushish kechikishi: wake word tugashidan qaror qabul qilinguncha
+   (ibora oxirini kutish + lokal tekshiruv + bulutli so'rovlar)
+
+Korpus - WAV fayllar (16-bit) va labels.json papkasi:
+    {"kun1.wav": [{"start": 3.2, "end": 3.8, "text": "jarvis", "wake": true},
+                  {"start": 10.0, "end": 11.4, "text": "salom qalaysan"}]}
+
+Tanib olish o'rnida standart holatda "oracle" ishlatiladi: ibora bilan ustma-ust tushgan
+belgilar matnini qaytaradi va bulutli so'rov kechikishini (--latency) hisobga qo'shadi.
+--recognizer google - haqiqiy Google STT (tarmoq kerak).
+
+Ishga tushirish:
+    python benchmarks/replay_wake_word.py --synthetic 30
+    python benchmarks/replay_wake_word.py --corpus data/wake_corpus --templates jarvis/data/wake_templates
+    python benchmarks/replay_wake_word.py --corpus ... --max-miss-rate 0.05 --max-false-per-hour 2
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "jarvis"))
+
+from core.audio_source import WavFileSource
+from core.keyword_spotter import KeywordSpotter
+from core.wake_word import WakeWordDetector
+
+# Wake word shu oraliqda (tugaganidan keyin, soniya) aniqlansa - to'g'ri ishga tushish
+MATCH_TOLERANCE = 2.0
+# Ibora belgining kamida shuncha qismini qoplasa - oracle uning matnini "eshitadi"
+ORACLE_OVERLAP = 0.5
+
+
+class OracleRecognizer:
+    """Bulutli STT o'rnini bosuvchi: korpus belgilaridan matn, kechikish - virtual"""
+
+    def __init__(self, latency: float = 0.35):
+        self.latency = latency
+        self.events = []
+
+    def __call__(self, phrase, language):
+        heard = []
+        for event in self.events:
+            overlap = min(phrase.end, event["end"]) - max(phrase.start, event["start"])
+            if overlap >= ORACLE_OVERLAP * (event["end"] - event["start"]):
+                heard.append(event["text"])
+        return " ".join(heard) or None
+
+
+def replay_file(detector, path, events, oracle_latency):
+    """Bitta faylni qayta ijro etish -> (davomiylik, to'g'ri, o'tkazilgan, noto'g'ri, kechikishlar)"""
+    source = WavFileSource(path)
+    with source:
+        triggers = list(detector.detect(source))
+        duration = source.duration
+
+    pending = sorted((e for e in events if e.get("wake")), key=lambda e: e["start"])
+    hits, false, latencies = 0, 0, []
+    for trigger in triggers:
+        match = next((e for e in pending if e["start"] <= trigger.time <= e["end"] + MATCH_TOLERANCE), None)
+        if match is None:
+            false += 1
+            continue
+        pending.remove(match)
+        hits += 1
+        # Tillar parallel so'raladi - virtual kechikish bir marta qo'shiladi
+        cloud = oracle_latency if trigger.calls else 0.0
+        latencies.append(trigger.time - match["end"] + trigger.processing + cloud)
+    return duration, hits, len(pending), false, latencies
+
+
+def make_synthetic_corpus(directory, minutes, rng):
+    """Fon shovqini ustiga tasodifiy oraliqlarda so'zlar ("jarvis" ~15%) + shablonlar"""
+    from bench_wake_word import synthesize, WAKE, OTHERS
+
+    rate = 16000
+    labels = {}
+    for index in range(max(1, int(round(minutes / 10.0)))):
+        length = min(10.0, minutes - index * 10.0) * 60
+        signal = rng.normal(0, 120, int(rate * length)).astype(np.float32)
+        events = []
+        position = rng.uniform(1, 4)
+        while position < length - 3:
+            if rng.random() < 0.15:
+                text, phones, wake = "jarvis", WAKE, True
+            else:
+                text = str(rng.choice(list(OTHERS)))
+                phones, wake = OTHERS[text], False
+            clip = np.frombuffer(synthesize(phones, rng), dtype=np.int16).astype(np.float32)
+            start = int(position * rate)
+            signal[start:start + len(clip)] += clip
+            # Belgi - faqat ovozli qism (synthesize atrofiga 0.1-0.4 s sukunat qo'shadi)
+            loud = np.flatnonzero(np.abs(clip) > 1500)
+            events.append({"start": round(position + loud[0] / rate, 3),
+                           "end": round(position + loud[-1] / rate, 3), "text": text, "wake": wake})
+            position += len(clip) / rate + rng.uniform(2, 8)
+        name = f"synthetic_{index}.wav"
+        with wave.open(os.path.join(directory, name), "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(rate)
+            wf.writeframes(np.clip(signal, -32768, 32767).astype(np.int16).tobytes())
+        labels[name] = events
+    with open(os.path.join(directory, "labels.json"), "w", encoding="utf-8") as f:
+        json.dump(labels, f, ensure_ascii=False, indent=1)
+
+    templates = os.path.join(directory, "templates")
+    spotter = KeywordSpotter(templates)
+    for _ in range(4):
+        spotter.enroll(synthesize(WAKE, rng))
+    return templates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WakeWordDetector offline baholash")
+    parser.add_argument("--corpus", help="WAV fayllar va labels.json papkasi")
+    parser.add_argument("--synthetic", type=float, metavar="DAQIQA",
+                        help="Korpus o'rniga shuncha daqiqalik sintetik yozuv yaratish")
+    parser.add_argument("--templates", help="Lokal filtr shablonlari (nusxasi ishlatiladi)")
+    parser.add_argument("--no-spotter", action="store_true", help="Lokal filtrsiz (hamma ibora bulutga)")
+    parser.add_argument("--recognizer", choices=["oracle", "google"], default="oracle")
+    parser.add_argument("--latency", type=float, default=0.35, help="Oracle: bitta bulutli so'rov kechikishi (s)")
+    parser.add_argument("--max-miss-rate", type=float, help="Oshsa - chiqish kodi 1")
+    parser.add_argument("--max-false-per-hour", type=float, help="Oshsa - chiqish kodi 1")
+    parser.add_argument("--verbose", action="store_true", help="Detektor loglarini ko'rsatish")
+    args = parser.parse_args()
+    if not args.corpus and not args.synthetic:
+        parser.error("--corpus yoki --synthetic kerak")
+
+    workdir = tempfile.mkdtemp(prefix="wake_replay_")
+    try:
+        corpus = args.corpus
+        templates = args.templates
+        quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+        with quiet:
+            if args.synthetic:
+                corpus = workdir
+                templates = make_synthetic_corpus(workdir, args.synthetic, np.random.default_rng(23))
+        with open(os.path.join(corpus, "labels.json"), encoding="utf-8") as f:
+            labels = json.load(f)
+
+        # Shablonlar nusxasi: qayta ijro paytidagi avtomatik qo'shish asl papkaga tegmasin
+        spotter_dir = os.path.join(workdir, "spotter")
+        if templates:
+            shutil.copytree(templates, spotter_dir)
+        with quiet:
+            spotter = KeywordSpotter(spotter_dir)
+        if args.no_spotter:
+            spotter.min_templates = 10 ** 9
+
+        oracle = OracleRecognizer(args.latency)
+        detector = WakeWordDetector(recognizer=oracle if args.recognizer == "oracle" else None, spotter=spotter)
+        oracle_latency = args.latency if args.recognizer == "oracle" else 0.0
+        detector.resume()
+
+        total_seconds, hits, misses, false, latencies = 0.0, 0, 0, 0, []
+        print(f"{'fayl':<22} | {'audio':>7} | {'wake':>4} | {'topildi':>7} | {'noto`g`ri':>9}")
+        for name, events in sorted(labels.items()):
+            oracle.events = events
+            with quiet:
+                result = replay_file(detector, os.path.join(corpus, name), events, oracle_latency)
+            duration, file_hits, file_misses, file_false, file_latencies = result
+            print(f"{name:<22} | {duration / 60:5.1f} m | {file_hits + file_misses:4d} | {file_hits:7d} | {file_false:9d}")
+            total_seconds += duration
+            hits, misses, false = hits + file_hits, misses + file_misses, false + file_false
+            latencies += file_latencies
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    hours = total_seconds / 3600.0
+    wake_total = hits + misses
+    miss_rate = misses / wake_total if wake_total else 0.0
+    false_per_hour = false / hours if hours else 0.0
+    stats = spotter.stats()
+    print(f"\nAudio: {hours * 60:.1f} daqiqa, wake word: {wake_total}")
+    print(f"O'tkazib yuborildi: {misses} ({miss_rate:.1%})")
+    print(f"Noto'g'ri ishga tushish: {false} ({false_per_hour:.1f} / soat)")
+    if latencies:
+        print(f"Kechikish: o'rtacha {np.mean(latencies) * 1000:.0f} ms, p50 {np.percentile(latencies, 50) * 1000:.0f} ms, "
+              f"p95 {np.percentile(latencies, 95) * 1000:.0f} ms")
+    print(f"Bulutli so'rovlar: {detector.cloud_calls} ({detector.cloud_calls / hours if hours else 0:.0f} / soat), "
+          f"lokal rad etildi: {stats['rejected']} ibora, CPU {stats['cpu_percent']:.2f}%")
+
+    failed = (args.max_miss_rate is not None and miss_rate > args.max_miss_rate) or \
+             (args.max_false_per_hour is not None and false_per_hour > args.max_false_per_hour)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
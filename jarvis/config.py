@@ -20,6 +20,13 @@ AIVOOV_VOICE_ID = "456d8b4b-9071-4b02-a99a-1eddd22b2880"  # Sardor - erkak
 # Jarvis Sozlamalari
 JARVIS_NAME = "Jarvis"
 JARVIS_WAKE_WORDS = ["jarvis", "жарвис", "jarvi", "alisa", "алиса", "alica", "джарвис", "jarvisuz", "hello jarvis", "jar", "jori", 'ja']
+# Wake word ishonchi (berilmaganlari 1.0): qisqa shakllar gap ichida yolg'iz ishga tushirmaydi
+WAKE_WORD_WEIGHTS = {"jarvi": 0.8, "alica": 0.8, "jori": 0.4, "jar": 0.4, "ja": 0.3}
+WAKE_MATCH_MIN_SCORE = 0.5
+WAKE_SPOTTER_THRESHOLD = 10.0  # Lokal MFCC+DTW masofa chegarasining pastki qiymati (kichik - qattiqroq)
+WAKE_SPOTTER_MARGIN = 1.3  # Chegara = shablonlar o'zaro masofasi x margin (threshold dan past emas)
+WAKE_TEMPLATES_MIN = 3  # Shundan kam namuna bo'lsa lokal filtr ishlamaydi (hamma yozuv bulutga)
+WAKE_TEMPLATES_MAX = 8  # data/wake_templates dagi namunalar soni
 LANGUAGE = "uz"
 APP_VERSION = "1.0.3"
 UPDATE_URL = "https://raw.githubusercontent.com/SayfullayevBekzod/jarvispro/main/version.json"
@@ -28,6 +35,15 @@ REPO_URL = "https://github.com/SayfullayevBekzod/jarvispro"
 # Ovoz Sozlamalari
 VOICE_SPEED = 1.0
 VOICE_VOLUME = 0.8
+TTS_CACHE_MAX_MB = 100  # data/tts_cache/ hajm chegarasi
+STT_LANGUAGES = ["uz-UZ", "en-US", "ru-RU"]  # Ustuvorlik tartibida (parallel so'raladi)
+STT_MIN_CONFIDENCE = 0.6  # Bundan past ishonchli natija boshqa til natijasiga yutqazadi
+CAPTURE_HISTORY_SECONDS = 5  # Umumiy mikrofon oqimi: o'tmishdan davom etish uchun saqlanadigan audio
+CAPTURE_LINGER_SECONDS = 3  # Oxirgi tinglovchi ketgach mikrofon shuncha vaqt ochiq turadi
+MIC_RECALIBRATE_INTERVAL = 300  # Uzluksiz tinglashda shovqin darajasini qayta o'lchash oralig'i (soniya)
+MIC_DRIFT_DB = 6  # Sukunat darajasi shovqin chegarasidan shuncha dB oshib qolsa - darhol qayta o'lchash
+RECORD_MAX_SECONDS = 30  # Tugma bilan yozishning maksimal davomiyligi (halqa bufer hajmi)
+RECORD_PRE_ROLL_MS = 500  # Yozish boshlanishidan oldingi saqlanadigan audio (birinchi bo'g'in yo'qolmasligi uchun)
 
 # UI Sozlamalari
 WINDOW_WIDTH = 900
@@ -42,6 +58,19 @@ NEON_GOLD = "#FFD700"
 NEON_GREEN = "#00FF7F"     # Spring Green
 GLASS_ALPHA = "0.7"        # UI element opacity hint
 
+# Savol-javob keshi (qa jadvali)
+# Buyruq turi (CommandType qiymati) -> javob yashash muddati, soniya (None - muddatsiz)
+QA_CACHE_TTLS = {
+    "ai_chat": 7 * 24 * 3600,     # internetdan topilgan javoblar eskiradi
+    "web_search": 7 * 24 * 3600,
+    "smart": 3600,                # hazil, fakt - tez-tez yangilansin
+    "greeting": 30 * 24 * 3600,
+    "math": None,
+}
+QA_CACHE_DEFAULT_TTL = 30 * 24 * 3600
+QA_CACHE_MAX_ROWS = 5000
+QA_MAINTENANCE_INTERVAL = 6 * 3600  # Fon tozalash/siqish oralig'i (0 - o'chirilgan)
+
 # Ob-havo API (OpenWeatherMap - bepul)
 WEATHER_API_KEY = ""
 DEFAULT_CITY = "Toshkent"
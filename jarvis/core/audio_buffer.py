@@ -0,0 +1,78 @@
+"""
+Audio halqa buferi (ring buffer)
+Oldindan ajratilgan bytearray: yozish xotira ajratmaydi, o'qish memoryview orqali nusxasiz.
+Pozitsiyalar mutlaq (boshidan beri yozilgan baytlar) - eski ma'lumot ustidan yozilganini bilish oson.
+"""
+
+import threading
+from typing import List, Optional
+
+
+class AudioRingBuffer:
+    """Belgilangan hajmli halqa bufer; eng eski ma'lumot ustidan yoziladi"""
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity musbat bo'lishi kerak")
+        self.capacity = capacity
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        self._written = 0
+        self._lock = threading.Lock()
+
+    @property
+    def position(self) -> int:
+        """Shu paytgacha yozilgan baytlar (keyingi yozish pozitsiyasi)"""
+        return self._written
+
+    @property
+    def oldest(self) -> int:
+        """Buferda hali saqlanib turgan eng eski pozitsiya"""
+        return max(0, self._written - self.capacity)
+
+    def write(self, data: bytes) -> int:
+        """
+        Ma'lumot qo'shish (sig'imdan katta bo'lsa - faqat oxirgi qismi saqlanadi)
+
+        Returns:
+            Yozishdan keyingi pozitsiya
+        """
+        data = memoryview(data).cast("B")
+        size = len(data)
+        with self._lock:
+            if size >= self.capacity:
+                data = data[size - self.capacity:]
+                self._written += size - self.capacity
+                size = self.capacity
+            offset = self._written % self.capacity
+            first = min(size, self.capacity - offset)
+            self._view[offset:offset + first] = data[:first]
+            if first < size:
+                self._view[:size - first] = data[first:]
+            self._written += size
+            return self._written
+
+    def views(self, start: int, end: Optional[int] = None) -> List[memoryview]:
+        """
+        [start, end) oralig'i uchun nusxasiz ko'rinishlar (halqa chegarasida - ikkita)
+
+        Ko'rinishlar bufer xotirasiga ishora qiladi: keyingi yozishlar ularni o'zgartirishi
+        mumkin, shuning uchun uzoq saqlash kerak bo'lsa bytes() ga nusxalang.
+        start ustidan yozilib ketgan bo'lsa - saqlanib qolgan eng eski joydan boshlanadi.
+        """
+        with self._lock:
+            end = self._written if end is None else min(end, self._written)
+            start = max(start, self._written - self.capacity, 0)
+            if start >= end:
+                return []
+            offset = start % self.capacity
+            size = end - start
+            first = min(size, self.capacity - offset)
+            parts = [self._view[offset:offset + first]]
+            if first < size:
+                parts.append(self._view[:size - first])
+            return parts
+
+    def read(self, start: int, end: Optional[int] = None) -> bytes:
+        """[start, end) oralig'ining nusxasi"""
+        return b"".join(self.views(start, end))
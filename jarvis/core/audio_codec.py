@@ -0,0 +1,92 @@
+"""
+STT uchun audio kodlash
+WAV (16-bit PCM) xotirada FLAC ga siqiladi - yuklash hajmi ~40% kichik, sifat yo'qolmaydi.
+Google STT ham, Whisper ham FLAC ni qabul qiladi; vaqtinchalik fayl yozilmaydi.
+"""
+
+import io
+import threading
+import time
+import wave
+from typing import Callable, Dict, Optional
+
+try:
+    import soundfile as sf
+except (ImportError, OSError):
+    # soundfile yo'q (yoki libsndfile topilmadi) - speech_recognition ning flac dasturiga tayanamiz
+    sf = None
+
+
+class AudioEncoder:
+    """WAV -> FLAC kodlash va hajm/vaqt statistikasi"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clips = 0
+        self.audio_seconds = 0.0
+        self.encode_seconds = 0.0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def to_flac(self, wav_bytes: bytes, fallback: Optional[Callable[[], bytes]] = None) -> Optional[bytes]:
+        """
+        WAV ni FLAC ga aylantirish
+
+        Args:
+            wav_bytes: 16-bit PCM WAV
+            fallback: soundfile bo'lmasa yoki xato bersa chaqiriladi (masalan AudioData.get_flac_data)
+        Returns:
+            FLAC baytlari yoki None - kodlab bo'lmadi
+        """
+        start = time.perf_counter()
+        try:
+            with wave.open(io.BytesIO(wav_bytes), "rb") as wf:
+                duration = wf.getnframes() / float(wf.getframerate())
+        except (wave.Error, EOFError) as e:
+            print(f"[Codec] WAV o'qilmadi: {e}")
+            return None
+
+        flac = None
+        if sf is not None:
+            try:
+                data, rate = sf.read(io.BytesIO(wav_bytes), dtype="int16")
+                buffer = io.BytesIO()
+                sf.write(buffer, data, rate, format="FLAC", subtype="PCM_16")
+                flac = buffer.getvalue()
+            except Exception as e:
+                print(f"[Codec] FLAC kodlashda xato: {e}")
+        if flac is None and fallback is not None:
+            try:
+                flac = fallback()
+            except Exception as e:
+                print(f"[Codec] FLAC kodlashda xato: {e}")
+        if not flac:
+            return None
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.clips += 1
+            self.audio_seconds += duration
+            self.encode_seconds += elapsed
+            self.bytes_in += len(wav_bytes)
+            self.bytes_out += len(flac)
+        print(f"[Codec] FLAC: {len(wav_bytes) // 1024} KB -> {len(flac) // 1024} KB ({elapsed * 1000:.1f} ms)")
+        return flac
+
+    def stats(self) -> Dict[str, float]:
+        """Siqish darajasi va audio soniyasiga to'g'ri keladigan hajm/vaqt"""
+        with self._lock:
+            seconds = self.audio_seconds or 1.0
+            return {
+                "clips": self.clips,
+                "audio_seconds": self.audio_seconds,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "ratio": self.bytes_out / self.bytes_in if self.bytes_in else 0.0,
+                "kb_per_second": self.bytes_out / 1024 / seconds,
+                "encode_ms_per_second": self.encode_seconds * 1000 / seconds,
+            }
+
+
+# Global instance
+audio_encoder = AudioEncoder()
@@ -0,0 +1,151 @@
+"""
+Audio manbalari
+Tinglovchi qismlar (wake word, yozish) mikrofonga emas, shu interfeysga bog'lanadi:
+jonli mikrofon va WAV fayl (offline qayta ijro, testlar) bir xil ishlatiladi.
+"""
+
+import time
+import wave
+from typing import Optional
+
+import numpy as np
+
+
+class AudioSource:
+    """16-bit mono PCM bloklar manbasi; time - shu paytgacha berilgan audio davomiyligi"""
+
+    sample_rate = 16000
+    sample_width = 2
+    chunk = 1024
+
+    def __init__(self):
+        self.frames_read = 0
+
+    @property
+    def time(self) -> float:
+        """Manba soati (soniya): oxirgi o'qilgan blok oxiri"""
+        return self.frames_read / float(self.sample_rate)
+
+    def open(self):
+        """Manbani ochish"""
+
+    def close(self):
+        """Manbani yopish"""
+
+    def _read(self) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def read(self) -> Optional[bytes]:
+        """Keyingi blok (chunk kadr); manba tugagan bo'lsa None"""
+        data = self._read()
+        if data:
+            self.frames_read += len(data) // self.sample_width
+        return data
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class MicrophoneSource(AudioSource):
+    """Jonli mikrofon (PyAudio)"""
+
+    def __init__(self, sample_rate: int = 16000, chunk: int = 1024, device_index: Optional[int] = None):
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.chunk = chunk
+        self.device_index = device_index
+        self._audio = None
+        self._stream = None
+
+    def open(self):
+        import pyaudio
+
+        self._audio = pyaudio.PyAudio()
+        try:
+            self._stream = self._audio.open(
+                format=pyaudio.paInt16,
+                channels=1,
+                rate=self.sample_rate,
+                input=True,
+                input_device_index=self.device_index,
+                frames_per_buffer=self.chunk
+            )
+        except Exception:
+            self._audio.terminate()
+            self._audio = None
+            raise
+
+    def close(self):
+        stream, audio = self._stream, self._audio
+        self._stream = None
+        self._audio = None
+        if stream:
+            try:
+                stream.stop_stream()
+                stream.close()
+            except Exception:
+                pass
+        if audio:
+            try:
+                audio.terminate()
+            except Exception:
+                pass
+
+    def _read(self) -> Optional[bytes]:
+        if self._stream is None:
+            return None
+        return self._stream.read(self.chunk, exception_on_overflow=False)
+
+
+class WavFileSource(AudioSource):
+    """
+    WAV fayldan o'qish (offline qayta ijro)
+
+    Ko'p kanalli yozuvlar monoga aylantiriladi; realtime=True bo'lsa bloklar
+    mikrofondagidek real vaqt tezligida beriladi, aks holda - imkon qadar tez.
+    """
+
+    def __init__(self, path: str, chunk: int = 1024, realtime: bool = False):
+        super().__init__()
+        self.path = path
+        self.chunk = chunk
+        self.realtime = realtime
+        self._pcm = b""
+        self._offset = 0
+        self._started = 0.0
+
+    def open(self):
+        with wave.open(self.path, "rb") as wf:
+            if wf.getsampwidth() != 2:
+                raise ValueError(f"{self.path}: faqat 16-bit PCM qo'llab-quvvatlanadi")
+            channels = wf.getnchannels()
+            self.sample_rate = wf.getframerate()
+            pcm = wf.readframes(wf.getnframes())
+        if channels > 1:
+            samples = np.frombuffer(pcm, dtype=np.int16).reshape(-1, channels)
+            pcm = samples.mean(axis=1).astype(np.int16).tobytes()
+        self._pcm = pcm
+        self._offset = 0
+        self.frames_read = 0
+        self._started = time.monotonic()
+
+    @property
+    def duration(self) -> float:
+        """Butun yozuv davomiyligi (soniya)"""
+        return len(self._pcm) / self.sample_width / float(self.sample_rate)
+
+    def _read(self) -> Optional[bytes]:
+        if self._offset >= len(self._pcm):
+            return None
+        if self.realtime:
+            delay = self._started + self.time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        end = self._offset + self.chunk * self.sample_width
+        data = self._pcm[self._offset:end]
+        self._offset = end
+        return data
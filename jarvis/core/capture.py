@@ -0,0 +1,242 @@
+"""
+Umumiy mikrofon oqimi (capture service)
+Mikrofon bitta joyda ochiladi va bloklar barcha obunachilarga (wake word, buyruq yozuvi,
+tugma bilan yozish) tarqatiladi. Oxirgi bir necha soniya halqa buferda saqlanadi: yangi
+obunachi o'tmishdagi nuqtadan boshlashi mumkin - wake word dan keyingi buyruq uzilishsiz davom etadi.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, List, Optional
+
+import config
+from core.audio_buffer import AudioRingBuffer
+from core.audio_source import AudioSource, MicrophoneSource
+
+
+class Subscription(AudioSource):
+    """
+    Umumiy oqimga obuna - oddiy AudioSource kabi o'qiladi
+
+    time - umumiy oqim soati (mikrofon ochilgandan beri), shuning uchun turli
+    obunachilar vaqtlari bir-biri bilan solishtiriladi.
+    """
+
+    def __init__(self, service: "CaptureService", start_frame: int, max_queue_seconds: float):
+        super().__init__()
+        self.service = service
+        self.sample_rate = service.sample_rate
+        self.chunk = service.chunk
+        self.frames_read = start_frame
+        self.dropped = 0
+        self._queue: "deque[bytes]" = deque()
+        self._max_queue = max(1, int(max_queue_seconds * self.sample_rate / self.chunk))
+        self._closed = False
+
+    def _push(self, block: Optional[bytes]):
+        """Yangi blok (None - oqim tugadi); service._cond ichida chaqiriladi"""
+        if block is None:
+            self._closed = True
+            return
+        self._queue.append(block)
+        if len(self._queue) > self._max_queue:
+            # Sekin o'quvchi: eng eski bloklar tashlanadi (soat ham siljiydi)
+            old = self._queue.popleft()
+            self.frames_read += len(old) // self.sample_width
+            self.dropped += 1
+
+    def _read(self) -> Optional[bytes]:
+        cond = self.service._cond
+        with cond:
+            while not self._queue and not self._closed:
+                cond.wait(0.5)
+            if self._queue:
+                return self._queue.popleft()
+            return None
+
+    def close(self):
+        """Obunani bekor qilish"""
+        self.service._unsubscribe(self)
+
+
+class CaptureService:
+    """Bitta mikrofon oqimi va uning obunachilari"""
+
+    def __init__(self, source_factory: Callable[[], AudioSource] = MicrophoneSource,
+                 history_seconds: float = config.CAPTURE_HISTORY_SECONDS,
+                 linger_seconds: float = config.CAPTURE_LINGER_SECONDS):
+        """
+        Args:
+            source_factory: Haqiqiy audio manba (mikrofon)
+            history_seconds: O'tmishdan boshlash uchun saqlanadigan audio
+            linger_seconds: Oxirgi foydalanuvchi ketgach mikrofon shuncha vaqt ochiq turadi
+                (wake word -> buyruq o'tishida qurilma yopilib-ochilmasligi uchun)
+        """
+        self.source_factory = source_factory
+        self.history_seconds = history_seconds
+        self.linger_seconds = linger_seconds
+        self.sample_rate = AudioSource.sample_rate
+        self.sample_width = AudioSource.sample_width
+        self.chunk = AudioSource.chunk
+
+        self._cond = threading.Condition()
+        self._subscribers: List[Subscription] = []
+        self._holds = 0
+        self._idle_since: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        # Oxirgi o'qish oqimi (yopilayotgan bo'lsa ham) - qayta ochishdan oldin kutiladi
+        self._reader: Optional[threading.Thread] = None
+        self._history: Optional[AudioRingBuffer] = None
+        self._history_start = 0
+        self._frames = 0
+        self._mark: Optional[tuple] = None
+        self.opens = 0
+
+    @property
+    def is_running(self) -> bool:
+        """Mikrofon hozir ochiqmi"""
+        return self._thread is not None
+
+    def now(self) -> float:
+        """Umumiy oqim soati (soniya)"""
+        return self._frames / float(self.sample_rate)
+
+    def _start(self):
+        """Mikrofonni ochish va o'qish oqimini ishga tushirish (_cond ichida)"""
+        if self._thread is not None:
+            return
+        # Qurilma _cond ichida yopiladi; eski oqim faqat tugashi kerak. Eksklyuziv qurilmalarda
+        # (WASAPI exclusive, ba'zi ALSA) yopilmagan oqim ustiga ochish xato beradi
+        previous = self._reader
+        if previous is not None and previous is not threading.current_thread():
+            previous.join(timeout=2.0)
+        source = self.source_factory()
+        source.open()
+        self.opens += 1
+        self.sample_rate, self.sample_width, self.chunk = source.sample_rate, source.sample_width, source.chunk
+        # Soat qayta ochilganda davom etadi; tarix esa yangi qurilma oqimi bilan boshlanadi
+        self._history = AudioRingBuffer(int(self.history_seconds * self.sample_rate) * self.sample_width)
+        self._history_start = self._frames
+        self._idle_since = None
+        self._thread = threading.Thread(target=self._run, args=(source,), name="JarvisCapture", daemon=True)
+        self._reader = self._thread
+        self._thread.start()
+        print(f"[Capture] Mikrofon ochildi ({self.sample_rate} Hz)")
+
+    @staticmethod
+    def _close_source(source: AudioSource):
+        try:
+            source.close()
+        except Exception as e:
+            print(f"[Capture] Yopishda xato: {e}")
+
+    def _run(self, source: AudioSource):
+        """Bloklarni o'qib obunachilarga tarqatish; hech kim qolmasa linger dan keyin yopiladi"""
+        error = None
+        lingered = False
+        try:
+            while True:
+                with self._cond:
+                    if not self._subscribers and not self._holds:
+                        if self._idle_since is None:
+                            self._idle_since = time.monotonic()
+                        elif time.monotonic() - self._idle_since >= self.linger_seconds:
+                            # Ochish va yopish bitta lock ostida: keyingi subscribe() yangi oqimni
+                            # faqat qurilma yopilgandan keyin ochadi
+                            self._close_source(source)
+                            self._thread = None
+                            lingered = True
+                            break
+                    else:
+                        self._idle_since = None
+                block = source.read()
+                if not block:
+                    error = "oqim tugadi"
+                    break
+                with self._cond:
+                    self._history.write(block)
+                    self._frames += len(block) // self.sample_width
+                    for subscriber in self._subscribers:
+                        subscriber._push(block)
+                    self._cond.notify_all()
+        except Exception as e:
+            error = e
+        finally:
+            if not lingered:
+                with self._cond:
+                    self._close_source(source)
+                    self._thread = None
+                    # Xato: obunachilar o'qishni tugatadi (masalan wake word qaytadan obuna bo'ladi)
+                    for subscriber in self._subscribers:
+                        subscriber._push(None)
+                    self._subscribers.clear()
+                    self._cond.notify_all()
+            print(f"[Capture] Mikrofon yopildi" + (f": {error}" if error else ""))
+
+    def subscribe(self, start: Optional[float] = None, max_queue_seconds: float = 10.0) -> Subscription:
+        """
+        Oqimga obuna bo'lish (mikrofon yopiq bo'lsa ochiladi)
+
+        Args:
+            start: Umumiy soat bo'yicha boshlanish nuqtasi - tarixda bo'lsa shu joydan
+                boshlab beriladi; None - hozirdan
+        """
+        with self._cond:
+            self._start()
+            subscriber = Subscription(self, self._frames, max_queue_seconds)
+            if start is not None and self._history is not None:
+                frame = max(int(start * self.sample_rate), self._history_start,
+                            self._history.oldest // self.sample_width + self._history_start)
+                if frame < self._frames:
+                    position = (frame - self._history_start) * self.sample_width
+                    subscriber.frames_read = frame
+                    # Tarix ham odatdagi bloklar kabi chunk bo'yicha beriladi (segmentatsiya uchun)
+                    step = self.chunk * self.sample_width
+                    past = self._history.read(position)
+                    for offset in range(0, len(past), step):
+                        subscriber._queue.append(past[offset:offset + step])
+            self._subscribers.append(subscriber)
+            return subscriber
+
+    def recent(self, seconds: float) -> bytes:
+        """Tarixdagi oxirgi shuncha soniyalik audio"""
+        with self._cond:
+            if self._history is None:
+                return b""
+            size = int(seconds * self.sample_rate) * self.sample_width
+            return self._history.read(max(self._history.oldest, self._history.position - size))
+
+    def _unsubscribe(self, subscriber: Subscription):
+        with self._cond:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+            subscriber._closed = True
+            self._cond.notify_all()
+
+    def acquire(self):
+        """Mikrofonni obunasiz ochiq ushlab turish (masalan yozishga tayyor turish)"""
+        with self._cond:
+            self._start()
+            self._holds += 1
+
+    def release(self):
+        with self._cond:
+            self._holds = max(0, self._holds - 1)
+
+    def mark(self, at: float):
+        """Keyingi tinglovchi shu nuqtadan davom etsin (wake word iborasi oxiri)"""
+        with self._cond:
+            self._mark = (at, time.monotonic())
+
+    def take_mark(self, max_age: float = config.CAPTURE_HISTORY_SECONDS) -> Optional[float]:
+        """Belgilangan nuqtani olish (bir marta; eskirgan bo'lsa None)"""
+        with self._cond:
+            mark, self._mark = self._mark, None
+        if mark is None or time.monotonic() - mark[1] > max_age:
+            return None
+        return mark[0]
+
+
+# Global instance
+capture = CaptureService()
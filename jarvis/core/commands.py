@@ -4,10 +4,16 @@ O'zbekcha buyruqlarni tushunish va qayta ishlash
 """
 
 import re
-from typing import Optional, Tuple, Callable, Dict, Any
-from dataclasses import dataclass
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Optional, Tuple, Callable, Dict, Any, Iterator, List, Iterable, Mapping
+from dataclasses import dataclass, replace
 from enum import Enum
 
+from core.fuzzy import DeletionIndex
+from core.keyword_scanner import KeywordScanner
+
 
 class CommandType(Enum):
     """Buyruq turlari"""
@@ -31,19 +37,71 @@ class CommandType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(frozen=True)
 class Command:
-    """Aniqlangan buyruq"""
+    """Aniqlangan buyruq (o'zgarmas - parser keshi uni qayta ishlatadi)"""
     type: CommandType
     action: str
-    params: Dict[str, Any]
+    params: Mapping[str, Any]
     original_text: str
+    
+    def __post_init__(self):
+        if not isinstance(self.params, MappingProxyType):
+            object.__setattr__(self, "params", MappingProxyType(dict(self.params)))
+
+
+# parse() ichida ishlatiladigan yordamchi regexlar (bir marta kompilyatsiya qilinadi)
+_DIGITS_RE = re.compile(r"(\d+)")
+_CITY_RE = re.compile(r"(toshkent|samarqand|buxoro|andijon|farg'ona|namangan|qashqadaryo|surxondaryo|xorazm|navoiy|jizzax|sirdaryo|qoraqalpog'iston).*da")
+_OPEN_SKIP_RE = re.compile(r"\b(och|ochib|ber|ishga|tushir|run|start|ich|ish|da)\b")
+_CLOSE_SKIP_RE = re.compile(r"\b(yop|yopib|ber|o'chir)\b")
+_MEDIA_SKIP_RE = re.compile(r"(qo'y|ijro|och|qo'shig'ini|musiqasini)")
+_TYPE_IN_APP_RE = re.compile(r"(.*)\s+da\s+(.*)\s+deb\s+yoz")
+_TYPE_IN_APP_EN_RE = re.compile(r"type\s+(.*)\s+in\s+(.*)")
+
+
+class IntentPatterns:
+    """
+    Bitta intent patternlari - oldindan kompilyatsiya qilingan
+    Barcha patternlar nomlangan guruhli bitta alternatsiyaga birlashtiriladi,
+    shuning uchun "mos keladimi?" savoliga matndan bir marta o'tib javob beriladi.
+    Tartib muhim bo'lgan joylarda (guruhlar kerak) patternlar ro'yxat tartibida tekshiriladi.
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = list(patterns)
+        self.compiled = [re.compile(p) for p in self.patterns]
+        self.combined = re.compile("|".join(f"(?P<p{i}>{p})" for i, p in enumerate(self.patterns)))
+
+    def search(self, text: str) -> bool:
+        """Kamida bitta pattern mos keladimi (bitta o'tish)"""
+        return self.combined.search(text) is not None
+
+    def matches(self, text: str) -> Iterator[re.Match]:
+        """Mos kelgan patternlar natijalari - ro'yxat tartibida"""
+        if not self.combined.search(text):
+            return
+        for pattern in self.compiled:
+            match = pattern.search(text)
+            if match:
+                yield match
+
+    def first(self, text: str) -> Optional[re.Match]:
+        """Ro'yxat tartibida birinchi mos kelgan natija"""
+        return next(self.matches(text), None)
 
 
 class CommandParser:
     """O'zbekcha buyruqlar analizatori"""
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 256):
+        self._cache_size = cache_size
+        self._cache: "OrderedDict[str, Command]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # clear_cache() da oshadi: undan oldin boshlangan parse natijasi keshga yozilmaydi
+        self._cache_generation = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
         self._init_patterns()
     
     def _init_patterns(self):
@@ -137,6 +195,9 @@ class CommandParser:
             "screnshoot": "screenshot",
         }
         
+        # Fuzzy indeks: kalit so'zlar bir marta indekslanadi, keyin har bir so'z hash orqali tuzatiladi
+        self._build_fuzzy_index()
+        
         # ===== Regex patternlar =====
         
         # Salomlashish
@@ -243,6 +304,38 @@ class CommandParser:
             r"(.*)\s*(oldinda|oldinga|fokus|focus|aktivlashtir|olga)"
         ]
         
+        # Sistema sub-action kalit so'z guruhlari (substring ma'nosida tekshiriladi)
+        self.system_keywords = {
+            "battery": ["batareya", "akkumulyator"],
+            "volume": ["ovoz"],
+            "mute": ["o'chir", "mute", "yo'qot"],
+            "unmute": ["yoq", "unmute", "eshitilsin"],
+            "volume_max": ["to'liq", "maksimum", "max", "100"],
+            "volume_up": ["ko'tar", "baland", "oshir", "qo'sh", "kuchaytir"],
+            "brightness": ["yorqinlik", "yorug'lik", "brightness"],
+            "increase": ["oshir", "ko'tar", "baland", "ko'p"],
+            "decrease": ["pasayt", "past", "kamayt", "oz"],
+            "window": ["oyna", "minimize", "kichraytir", "yop", "close"],
+            "window_close": ["yop", "o'chir", "close", "yopish"],
+            "trash": ["chiqindi", "savatcha", "recycle", "trash"],
+            "trash_clean": ["tozala", "bo'shat", "clear", "empty"],
+            "cleaning_pro": ["pro", "tozalash"],
+            "lock": ["qulfla", "lock", "blokla"],
+            "hibernate": ["gibrid", "hibernate"],
+            "shutdown": ["o'chir", "shutdown", "power off"],
+            "cancel": ["bekor", "cancel"],
+            "restart": ["qayta", "restart", "reboot"],
+            "sleep": ["uxla", "sleep"],
+            "processes": ["dasturlar", "process", "apps"],
+            "processes_heavy": ["ko'p", "yeyapti", "ishlat", "list", "hungry"],
+            "kill": ["yop", "kill", "stop", "tugat"],
+            "kill_target": ["dastur", "process", "chrome", "notepad", "telegram", "word", "excel"],
+            "network": ["internet", "tarmoq", "network", "ping", "wifi"],
+            "study": ["dars", "o'qish", "study"],
+            "mode": ["rejim", "mode"],
+            "focus": ["oldinda", "oldinga", "fokus", "focus", "aktivlashtir", "olga"],
+        }
+        
         # Eslatma
         self.reminder_patterns = [
             r"(\d+)\s*(daqiqa|minut|soat|sekund|minute|hour|second).*eslatib",
@@ -344,6 +437,76 @@ class CommandParser:
             r"start.*dictation",
             r"text.*input.*mode"
         ]
+        
+        self._compile_patterns()
+
+    def _compile_patterns(self):
+        """Pattern ro'yxatlarini intent bo'yicha kompilyatsiya qilish"""
+        self._greetings_re = IntentPatterns(self.greetings)
+        self._goodbyes_re = IntentPatterns(self.goodbyes)
+        self._how_are_you_re = IntentPatterns(self.how_are_you)
+        self._exit_re = IntentPatterns(self.exit_patterns)
+        self._system_re = IntentPatterns(self.system_patterns)
+        self._system_scanner = KeywordScanner(w for words in self.system_keywords.values() for w in words)
+        self._time_re = IntentPatterns(self.time_patterns)
+        self._date_re = IntentPatterns(self.date_patterns)
+        self._weather_re = IntentPatterns(self.weather_patterns)
+        self._folder_re = IntentPatterns(self.folder_patterns)
+        self._open_app_re = IntentPatterns(self.open_app_patterns)
+        self._close_app_re = IntentPatterns(self.close_app_patterns)
+        self._web_search_re = IntentPatterns(self.web_search_patterns)
+        self._math_re = IntentPatterns(self.math_patterns)
+        self._reminder_re = IntentPatterns(self.reminder_patterns)
+        self._media_re = IntentPatterns(self.media_patterns)
+        self._dictation_re = IntentPatterns(self.dictation_patterns)
+        self._screenshot_re = IntentPatterns(self.screenshot_patterns)
+        self._keyboard_re = IntentPatterns(self.keyboard_patterns)
+        self._smart_re = {action: IntentPatterns(patterns) for action, patterns in self.smart_patterns.items()}
+        self._social_re = IntentPatterns(self.social_patterns)
+        
+        # Hech bir intentga mos kelmaydigan matn (AI_CHAT) bitta o'tishda aniqlanadi
+        all_patterns = [p for group in (
+            self.greetings, self.goodbyes, self.how_are_you, self.exit_patterns, self.system_patterns,
+            self.time_patterns, self.date_patterns, self.weather_patterns, self.folder_patterns,
+            self.open_app_patterns, self.close_app_patterns, self.web_search_patterns, self.math_patterns,
+            self.reminder_patterns, self.media_patterns, self.dictation_patterns, self.screenshot_patterns,
+            self.keyboard_patterns, self.social_patterns, *self.smart_patterns.values()
+        ) for p in group]
+        self._any_intent_re = IntentPatterns(all_patterns)
+
+    def add_keywords(self, keywords: Iterable[str]):
+        """Fuzzy lug'atga kalit so'zlar qo'shish (ish vaqtida) - kesh tozalanadi"""
+        for keyword in keywords:
+            keyword = keyword.lower().strip()
+            if keyword and keyword not in self._keyword_index:
+                self._keywords.append(keyword)
+                self._keyword_index.add(keyword)
+        self.clear_cache()
+
+    def add_corrections(self, corrections: Dict[str, str]):
+        """Ma'lum STT xatolari lug'atini to'ldirish (ish vaqtida) - kesh tozalanadi"""
+        self._known_corrections.update({k.lower().strip(): v for k, v in corrections.items()})
+        self.clear_cache()
+
+    def clear_cache(self):
+        """Parse keshini tozalash"""
+        with self._cache_lock:
+            self._cache_generation += 1
+            self._cache.clear()
+
+    def cache_info(self) -> Dict[str, int]:
+        """Kesh statistikasi"""
+        with self._cache_lock:
+            return {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "size": len(self._cache),
+                "max_size": self._cache_size,
+            }
+
+    def _build_fuzzy_index(self):
+        """Kalit so'zlar uchun SymSpell indeksini (qayta) qurish"""
+        self._keyword_index = DeletionIndex(self._keywords, self._levenshtein, max_distance=2)
 
     @staticmethod
     def _levenshtein(s1: str, s2: str) -> int:
@@ -369,7 +532,7 @@ class CommandParser:
         """
         Matnni fuzzy normalizatsiya qilish:
         1. Ma'lum xatolarni to'g'rilash (lug'at)
-        2. Noma'lum so'zlarni eng yaqin kalit so'zga moslashtirish (Levenshtein)
+        2. Noma'lum so'zlarni eng yaqin kalit so'zga moslashtirish (SymSpell indeks + Levenshtein)
         """
         words = text.split()
         corrected = []
@@ -383,29 +546,19 @@ class CommandParser:
                 continue
             
             # 2. Agar so'z kalit so'zlar ichida bo'lsa — to'g'ri
-            if word_lower in self._keywords:
+            if word_lower in self._keyword_index:
                 corrected.append(word_lower)
                 continue
             
-            # 3. Levenshtein bilan eng yaqin kalit so'zni topish
+            # 3. Indeks orqali eng yaqin kalit so'zni topish (Levenshtein bilan tasdiqlanadi)
             #    Faqat 3+ harfli so'zlar uchun (qisqa so'zlar juda ko'p noto'g'ri mos kelishi mumkin)
             if len(word_lower) >= 3:
-                best_match = None
-                best_distance = float('inf')
-                
-                for keyword in self._keywords:
-                    # Uzunlik farqi juda katta bo'lsa, o'tkazib yuborish
-                    if abs(len(word_lower) - len(keyword)) > 2:
-                        continue
-                    
-                    dist = self._levenshtein(word_lower, keyword)
-                    if dist < best_distance:
-                        best_distance = dist
-                        best_match = keyword
-                
                 # Faqat 1-2 harf farq bo'lsa tuzatish
                 max_dist = 1 if len(word_lower) <= 4 else 2
-                if best_match and best_distance <= max_dist and best_distance > 0:
+                match = self._keyword_index.lookup(word_lower, max_dist)
+                
+                if match and match[1] > 0:
+                    best_match, best_distance = match
                     print(f"[Fuzzy] '{word_lower}' → '{best_match}' (farq: {best_distance})")
                     corrected.append(best_match)
                     continue
@@ -418,9 +571,100 @@ class CommandParser:
             print(f"[Fuzzy] Asl: '{text}' → Tuzatilgan: '{result}'")
         return result
 
+    def _parse_system_action(self, text_lower: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Sistema buyrug'ining aniq amalini topish
+        Matn bir marta skanerlanadi, qaror topilgan kalit so'zlar to'plami asosida qabul qilinadi
+        """
+        hits = self._system_scanner.scan(text_lower)
+        
+        def has(group: str) -> bool:
+            return any(word in hits for word in self.system_keywords[group])
+        
+        action = "info"
+        params = {}
+        
+        if has("battery"):
+            action = "battery"
+        elif has("volume"):
+            if has("mute"):
+                action = "mute"
+            elif has("unmute"):
+                action = "unmute"
+            elif has("volume_max"):
+                action = "volume_max"
+            elif has("volume_up"):
+                action = "volume_up"
+            else:
+                action = "volume_down"
+        elif has("brightness"):
+            levels = _DIGITS_RE.findall(text_lower)
+            if levels:
+                action = "brightness_set"
+                params["level"] = int(levels[0])
+            elif has("increase"):
+                action = "brightness_up"
+            elif has("decrease"):
+                action = "brightness_down"
+            else:
+                action = "brightness_set" # default
+        elif has("window"):
+            if has("window_close"):
+                action = "close_window"
+            else:
+                action = "minimize_all"
+        elif has("trash"):
+            if has("trash_clean"):
+                action = "cleaning_mode" if has("cleaning_pro") else "empty_trash"
+            else:
+                action = "empty_trash"
+        elif has("lock"):
+            action = "lock"
+        elif has("hibernate"):
+            action = "hibernate"
+        elif has("shutdown"):
+            if has("cancel"):
+                action = "cancel_shutdown"
+            else:
+                action = "shutdown"
+        elif has("restart"):
+            action = "restart"
+        elif has("sleep"):
+            action = "sleep"
+        # PRO ACTIONS
+        elif has("processes") and has("processes_heavy"):
+            action = "list_processes"
+        elif has("kill") and has("kill_target"):
+            action = "kill_process"
+            words = text_lower.split()
+            if "yop" in words: 
+                idx = words.index("yop")
+                if idx > 0: params["app"] = words[idx-1]
+            elif "kill" in words:
+                idx = words.index("kill")
+                if idx < len(words) - 1: params["app"] = words[idx+1]
+        elif has("network"):
+            action = "network_status"
+        elif has("study") and has("mode"):
+            action = "study_mode"
+        elif has("focus"):
+            action = "focus_window"
+            # App name extraction
+            for term in self.system_keywords["focus"]:
+                if term in hits:
+                    params["app"] = text_lower.split(term)[0].strip()
+                    break
+        
+        return action, params
+
+    @staticmethod
+    def _cache_key(text: str) -> str:
+        """Kesh kaliti: kichik harflarga o'tkazilgan va bo'shliqlari normallashtirilgan matn"""
+        return " ".join(text.lower().split())
+
     def parse(self, text: str) -> Command:
         """
-        Matnni tahlil qilish va buyruqni aniqlash
+        Matnni tahlil qilish va buyruqni aniqlash (LRU kesh orqali)
         
         Args:
             text: Foydalanuvchi aytgan matn
@@ -428,523 +672,384 @@ class CommandParser:
         Returns:
             Aniqlangan buyruq
         """
+        key = self._cache_key(text)
+        with self._cache_lock:
+            generation = self._cache_generation
+            command = self._cache.get(key)
+            if command is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+        
+        if command is None:
+            command = self._parse(text)
+            if self._cache_size > 0:
+                with self._cache_lock:
+                    # Kalit so'zlar/tuzatishlar parse davomida o'zgargan bo'lsa - eski natija keshlanmaydi
+                    if generation == self._cache_generation:
+                        self._cache[key] = command
+                        self._cache.move_to_end(key)
+                        while len(self._cache) > self._cache_size:
+                            self._cache.popitem(last=False)
+        
+        if command.original_text == text:
+            return command
+        
+        # Bir xil kalitli, lekin boshqacha yozilgan matn - asl matnni almashtirish
+        params = command.params
+        if command.type == CommandType.AI_CHAT:
+            params = {**params, "message": text}
+        return replace(command, params=params, original_text=text)
+
+    def _parse(self, text: str) -> Command:
+        """Matnni tahlil qilish (keshsiz)"""
         # Fuzzy normalizatsiya — STT xatolarini tuzatish
         text_lower = self._fuzzy_normalize(text)
         
+        # Hech bir pattern mos kelmasa - to'g'ridan-to'g'ri AI ga (barcha ro'yxatlarni aylanib chiqmasdan)
+        if not self._any_intent_re.search(text_lower):
+            return Command(
+                type=CommandType.AI_CHAT,
+                action="chat",
+                params={"message": text},
+                original_text=text
+            )
+        
         # Salomlashish
-        for pattern in self.greetings:
-            if re.search(pattern, text_lower):
-                return Command(
-                    type=CommandType.GREETING,
-                    action="hello",
-                    params={},
-                    original_text=text
-                )
+        if self._greetings_re.search(text_lower):
+            return Command(
+                type=CommandType.GREETING,
+                action="hello",
+                params={},
+                original_text=text
+            )
         
         # Xayrlashish
-        for pattern in self.goodbyes:
-            if re.search(pattern, text_lower):
-                return Command(
-                    type=CommandType.GREETING,
-                    action="goodbye",
-                    params={},
-                    original_text=text
-                )
+        if self._goodbyes_re.search(text_lower):
+            return Command(
+                type=CommandType.GREETING,
+                action="goodbye",
+                params={},
+                original_text=text
+            )
         
         # Holat
-        for pattern in self.how_are_you:
-            if re.search(pattern, text_lower):
-                return Command(
-                    type=CommandType.GREETING,
-                    action="how_are_you",
-                    params={},
-                    original_text=text
-                )
+        if self._how_are_you_re.search(text_lower):
+            return Command(
+                type=CommandType.GREETING,
+                action="how_are_you",
+                params={},
+                original_text=text
+            )
         
         # Chiqish
-        for pattern in self.exit_patterns:
-            if re.search(pattern, text_lower):
-                return Command(
-                    type=CommandType.EXIT,
-                    action="exit",
-                    params={},
-                    original_text=text
-                )
+        if self._exit_re.search(text_lower):
+            return Command(
+                type=CommandType.EXIT,
+                action="exit",
+                params={},
+                original_text=text
+            )
 
         # 1. Sistema buyruqlari (Eng yuqori prioritet, chunki ular juda aniq)
-        for pattern in self.system_patterns:
-            if re.search(pattern, text_lower):
-                action = "info"
-                params = {}
-                
-                if "batareya" in text_lower or "akkumulyator" in text_lower:
-                    action = "battery"
-                elif "ovoz" in text_lower:
-                    if any(x in text_lower for x in ["o'chir", "mute", "yo'qot"]):
-                        action = "mute"
-                    elif any(x in text_lower for x in ["yoq", "unmute", "eshitilsin"]):
-                        action = "unmute"
-                    elif any(x in text_lower for x in ["to'liq", "maksimum", "max", "100"]):
-                        action = "volume_max"
-                    elif any(x in text_lower for x in ["ko'tar", "baland", "oshir", "qo'sh", "kuchaytir"]):
-                        action = "volume_up"
-                    else:
-                        action = "volume_down"
-                elif any(x in text_lower for x in ["yorqinlik", "yorug'lik", "brightness"]):
-                    levels = re.findall(r"(\d+)", text_lower)
-                    if levels:
-                        action = "brightness_set"
-                        params["level"] = int(levels[0])
-                    elif any(x in text_lower for x in ["oshir", "ko'tar", "baland", "ko'p"]):
-                        action = "brightness_up"
-                    elif any(x in text_lower for x in ["pasayt", "past", "kamayt", "oz"]):
-                        action = "brightness_down"
-                    else:
-                        action = "brightness_set" # default
-                elif "oyna" in text_lower or any(x in text_lower for x in ["minimize", "kichraytir", "yop", "close"]):
-                    if any(x in text_lower for x in ["yop", "o'chir", "close", "yopish"]):
-                        action = "close_window"
-                    else:
-                        action = "minimize_all"
-                elif any(x in text_lower for x in ["chiqindi", "savatcha", "recycle", "trash"]):
-                    if any(x in text_lower for x in ["tozala", "bo'shat", "clear", "empty"]):
-                        action = "cleaning_mode" if "pro" in text_lower or "tozalash" in text_lower else "empty_trash"
-                    else:
-                        action = "empty_trash"
-                elif any(x in text_lower for x in ["qulfla", "lock", "blokla"]):
-                    action = "lock"
-                elif "gibrid" in text_lower or "hibernate" in text_lower:
-                    action = "hibernate"
-                elif "o'chir" in text_lower or "shutdown" in text_lower or "power off" in text_lower:
-                    if "bekor" in text_lower or "cancel" in text_lower:
-                        action = "cancel_shutdown"
-                    else:
-                        action = "shutdown"
-                elif "qayta" in text_lower or "restart" in text_lower or "reboot" in text_lower:
-                    action = "restart"
-                elif "uxla" in text_lower or "sleep" in text_lower:
-                    action = "sleep"
-                # PRO ACTIONS
-                elif any(x in text_lower for x in ["dasturlar", "process", "apps"]) and any(x in text_lower for x in ["ko'p", "yeyapti", "ishlat", "list", "hungry"]):
-                    action = "list_processes"
-                elif any(x in text_lower for x in ["yop", "kill", "stop", "tugat"]) and ("dastur" in text_lower or "process" in text_lower or any(app in text_lower for app in ["chrome", "notepad", "telegram", "word", "excel"])):
-                    action = "kill_process"
-                    words = text_lower.split()
-                    if "yop" in words: 
-                        idx = words.index("yop")
-                        if idx > 0: params["app"] = words[idx-1]
-                    elif "kill" in words:
-                        idx = words.index("kill")
-                        if idx < len(words) - 1: params["app"] = words[idx+1]
-                elif any(x in text_lower for x in ["internet", "tarmoq", "network", "ping", "wifi"]):
-                    action = "network_status"
-                elif any(x in text_lower for x in ["dars", "o'qish", "study"]) and ("rejim" in text_lower or "mode" in text_lower):
-                    action = "study_mode"
-                elif any(x in text_lower for x in ["oldinda", "oldinga", "fokus", "focus", "aktivlashtir", "olga"]):
-                    action = "focus_window"
-                    # App name extraction
-                    for term in ["oldinda", "oldinga", "fokus", "focus", "aktivlashtir", "olga"]:
-                        if term in text_lower:
-                            params["app"] = text_lower.split(term)[0].strip()
-                            break
-                
-                return Command(type=CommandType.SYSTEM, action=action, params=params, original_text=text)
+        if self._system_re.search(text_lower):
+            action, params = self._parse_system_action(text_lower)
+            return Command(type=CommandType.SYSTEM, action=action, params=params, original_text=text)
 
         # 2. Vaqt va Sana
-        for pattern in self.time_patterns:
-            if re.search(pattern, text_lower):
-                return Command(type=CommandType.TIME_DATE, action="time", params={}, original_text=text)
+        if self._time_re.search(text_lower):
+            return Command(type=CommandType.TIME_DATE, action="time", params={}, original_text=text)
         
-        for pattern in self.date_patterns:
-            if re.search(pattern, text_lower):
-                return Command(type=CommandType.TIME_DATE, action="date", params={}, original_text=text)
+        if self._date_re.search(text_lower):
+            return Command(type=CommandType.TIME_DATE, action="date", params={}, original_text=text)
         
         # 3. Ob-havo
-        for pattern in self.weather_patterns:
-            if re.search(pattern, text_lower):
-                city = None
-                city_match = re.search(r"(toshkent|samarqand|buxoro|andijon|farg'ona|namangan|qashqadaryo|surxondaryo|xorazm|navoiy|jizzax|sirdaryo|qoraqalpog'iston).*da", text_lower)
-                if city_match: city = city_match.group(1)
-                return Command(type=CommandType.WEATHER, action="current", params={"city": city}, original_text=text)
+        if self._weather_re.search(text_lower):
+            city = None
+            city_match = _CITY_RE.search(text_lower)
+            if city_match: city = city_match.group(1)
+            return Command(type=CommandType.WEATHER, action="current", params={"city": city}, original_text=text)
         
         # 4. Papka ochish
-        for pattern in self.folder_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                folder = None
-                for folder_name in ["yuklamalar", "downloads", "hujjatlar", "documents", "rasmlar", "pictures", "musiqa", "music", "video", "videos", "ish stoli", "desktop"]:
-                    if folder_name in text_lower:
-                        folder = folder_name
-                        break
-                return Command(type=CommandType.FILE_MANAGER, action="open_folder", params={"folder": folder}, original_text=text)
+        match = self._folder_re.first(text_lower)
+        if match:
+            folder = None
+            for folder_name in ["yuklamalar", "downloads", "hujjatlar", "documents", "rasmlar", "pictures", "musiqa", "music", "video", "videos", "ish stoli", "desktop"]:
+                if folder_name in text_lower:
+                    folder = folder_name
+                    break
+            return Command(type=CommandType.FILE_MANAGER, action="open_folder", params={"folder": folder}, original_text=text)
         
         # 5. Dastur ochish
-        for pattern in self.open_app_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                groups = match.groups()
-                # Exception: "oyna" yoki "chiqindi" bo'lsa app control deb o'ylama (system check qilindi yuqorida)
-                if any(x in text_lower for x in ["oyna", "chiqindi", "savatcha"]): continue
+        for match in self._open_app_re.matches(text_lower):
+            groups = match.groups()
+            # Exception: "oyna" yoki "chiqindi" bo'lsa app control deb o'ylama (system check qilindi yuqorida)
+            if any(x in text_lower for x in ["oyna", "chiqindi", "savatcha"]): continue
 
-                if len(groups) >= 3 and groups[0] and groups[1]:
-                    app = groups[0].strip()
-                    target = groups[1].strip()
-                    return Command(type=CommandType.APP_CONTROL, action="open_context", params={"app": app, "target": target}, original_text=text)
+            if len(groups) >= 3 and groups[0] and groups[1]:
+                app = groups[0].strip()
+                target = groups[1].strip()
+                return Command(type=CommandType.APP_CONTROL, action="open_context", params={"app": app, "target": target}, original_text=text)
                 
-                app_name = None
-                skip_words = r"\b(och|ochib|ber|ishga|tushir|run|start|ich|ish|da)\b"
-                for g in groups:
-                    if g and not re.search(skip_words, g.strip()):
-                        app_name = g.strip()
+            app_name = None
+            for g in groups:
+                if g and not _OPEN_SKIP_RE.search(g.strip()):
+                    app_name = g.strip()
                 
-                if app_name:
-                    return Command(type=CommandType.APP_CONTROL, action="open", params={"app": app_name}, original_text=text)
+            if app_name:
+                return Command(type=CommandType.APP_CONTROL, action="open", params={"app": app_name}, original_text=text)
         
         # 6. Dastur yopish
-        for pattern in self.close_app_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                groups = match.groups()
-                # Exception checklist
-                if any(x in text_lower for x in ["oyna", "chiqindi", "savatcha"]): continue
-
-                app_name = None
-                skip_words = r"\b(yop|yopib|ber|o'chir)\b"
-                for g in groups:
-                    if g and not re.search(skip_words, g.strip()):
-                        app_name = g.strip()
+        for match in self._close_app_re.matches(text_lower):
+            groups = match.groups()
+            # Exception checklist
+            if any(x in text_lower for x in ["oyna", "chiqindi", "savatcha"]): continue
+
+            app_name = None
+            for g in groups:
+                if g and not _CLOSE_SKIP_RE.search(g.strip()):
+                    app_name = g.strip()
                 
-                if app_name:
-                    return Command(type=CommandType.APP_CONTROL, action="close", params={"app": app_name}, original_text=text)
+            if app_name:
+                return Command(type=CommandType.APP_CONTROL, action="close", params={"app": app_name}, original_text=text)
         
         # Web qidiruv (Special apps search)
-        for pattern in self.web_search_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                groups = match.groups()
-                # 1. App-specific search: (app) da (query) (action)
-                if " da " in text_lower and len(groups) >= 2:
-                    # Agar pattern (app) dan boshlansa (3 groups)
-                    if len(groups) >= 3:
-                        app = groups[0].strip()
-                        query = groups[1].strip()
-                    else:
-                        # Agar pattern youtube.*da bo'lsa (2 groups: query, action)
-                        if "youtube" in text_lower: app = "youtube"
-                        elif "google" in text_lower: app = "google"
-                        elif "wikipedia" in text_lower: app = "wikipedia"
-                        else: app = "google" # fallback
-                        query = groups[0].strip()
+        for match in self._web_search_re.matches(text_lower):
+            groups = match.groups()
+            # 1. App-specific search: (app) da (query) (action)
+            if " da " in text_lower and len(groups) >= 2:
+                # Agar pattern (app) dan boshlansa (3 groups)
+                if len(groups) >= 3:
+                    app = groups[0].strip()
+                    query = groups[1].strip()
+                else:
+                    # Agar pattern youtube.*da bo'lsa (2 groups: query, action)
+                    if "youtube" in text_lower: app = "youtube"
+                    elif "google" in text_lower: app = "google"
+                    elif "wikipedia" in text_lower: app = "wikipedia"
+                    else: app = "google" # fallback
+                    query = groups[0].strip()
                         
-                    return Command(
-                        type=CommandType.WEB_SEARCH,
-                        action="app_search",
-                        params={"app": app, "query": query},
-                        original_text=text
-                    )
+                return Command(
+                    type=CommandType.WEB_SEARCH,
+                    action="app_search",
+                    params={"app": app, "query": query},
+                    original_text=text
+                )
                 
-                # 2. General search
-                if groups:
-                    query = groups[0].strip()
-                    engine = "google"
-                    if "youtube" in text_lower: engine = "youtube"
-                    elif "wikipedia" in text_lower: engine = "wikipedia"
+            # 2. General search
+            if groups:
+                query = groups[0].strip()
+                engine = "google"
+                if "youtube" in text_lower: engine = "youtube"
+                elif "wikipedia" in text_lower: engine = "wikipedia"
                     
-                    return Command(
-                        type=CommandType.WEB_SEARCH,
-                        action="search",
-                        params={"query": query, "engine": engine},
-                        original_text=text
-                    )
+                return Command(
+                    type=CommandType.WEB_SEARCH,
+                    action="search",
+                    params={"query": query, "engine": engine},
+                    original_text=text
+                )
         
         # Matematika
-        for pattern in self.math_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
+        match = self._math_re.first(text_lower)
+        if match:
+            return Command(
+                type=CommandType.MATH,
+                action="calculate",
+                params={"expression": text_lower},
+                original_text=text
+            )
+        
+        # Eslatma
+        for match in self._reminder_re.matches(text_lower):
+            if "o'qi" in text_lower:
                 return Command(
-                    type=CommandType.MATH,
-                    action="calculate",
-                    params={"expression": text_lower},
+                    type=CommandType.REMINDER,
+                    action="list",
+                    params={},
                     original_text=text
                 )
-        
-        # Sistema buyruqlari
-        for pattern in self.system_patterns:
-            if re.search(pattern, text_lower):
-                action = "info"
-                params = {}
-                
-                if "batareya" in text_lower or "akkumulyator" in text_lower:
-                    action = "battery"
-                elif "ovoz" in text_lower:
-                    if any(x in text_lower for x in ["o'chir", "mute", "yo'qot"]):
-                        action = "mute"
-                    elif any(x in text_lower for x in ["yoq", "unmute", "eshitilsin"]):
-                        action = "unmute"
-                    elif any(x in text_lower for x in ["ko'tar", "baland", "oshir", "qo'sh"]):
-                        action = "volume_up"
-                    else:
-                        action = "volume_down"
-                elif any(x in text_lower for x in ["yorqinlik", "yorug'lik", "brightness"]):
-                    # Sonni aniqlash (Masalan: 50 foiz)
-                    levels = re.findall(r"(\d+)", text_lower)
-                    if levels:
-                        action = "brightness_set"
-                        params["level"] = int(levels[0])
-                    elif any(x in text_lower for x in ["oshir", "ko'tar", "baland", "ko'p"]):
-                        action = "brightness_up"
-                    elif any(x in text_lower for x in ["pasayt", "past", "kamayt", "oz"]):
-                        action = "brightness_down"
-                    else:
-                        action = "brightness_set" # default
-                elif "oyna" in text_lower or any(x in text_lower for x in ["minimize", "kichraytir", "yop", "close"]):
-                    if any(x in text_lower for x in ["yop", "o'chir", "close", "yopish"]):
-                        action = "close_window"
-                    else:
-                        action = "minimize_all"
-                elif any(x in text_lower for x in ["chiqindi", "savatcha", "recycle", "trash"]):
-                    if any(x in text_lower for x in ["tozala", "bo'shat", "clear", "empty"]):
-                        action = "cleaning_mode" if "pro" in text_lower or "tozalash" in text_lower else "empty_trash"
-                    else:
-                        action = "empty_trash"
-                elif any(x in text_lower for x in ["qulfla", "lock", "blokla"]):
-                    action = "lock"
-                elif "gibrid" in text_lower or "hibernate" in text_lower:
-                    action = "hibernate"
-                elif "o'chir" in text_lower or "shutdown" in text_lower or "power off" in text_lower:
-                    if "bekor" in text_lower or "cancel" in text_lower:
-                        action = "cancel_shutdown"
-                    else:
-                        action = "shutdown"
-                elif "qayta" in text_lower or "restart" in text_lower or "reboot" in text_lower:
-                    action = "restart"
-                elif "uxla" in text_lower or "sleep" in text_lower:
-                    action = "sleep"
-                # PRO ACTIONS
-                elif any(x in text_lower for x in ["dasturlar", "process", "apps"]) and any(x in text_lower for x in ["ko'p", "yeyapti", "ishlat", "list", "hungry"]):
-                    action = "list_processes"
-                elif any(x in text_lower for x in ["yop", "kill", "stop", "tugat"]) and ("dastur" in text_lower or "process" in text_lower or any(app in text_lower for app in ["chrome", "notepad", "telegram", "word", "excel"])):
-                    action = "kill_process"
-                    # App name extraction
-                    words = text_lower.split()
-                    if "yop" in words: 
-                        idx = words.index("yop")
-                        if idx > 0: params["app"] = words[idx-1]
-                    elif "kill" in words:
-                        idx = words.index("kill")
-                        if idx < len(words) - 1: params["app"] = words[idx+1]
-                elif any(x in text_lower for x in ["internet", "tarmoq", "network", "ping", "wifi"]):
-                    action = "network_status"
-                elif any(x in text_lower for x in ["dars", "o'qish", "study"]) and ("rejim" in text_lower or "mode" in text_lower):
-                    action = "study_mode"
-                elif any(x in text_lower for x in ["tozalash", "cleaning"]) and ("rejim" in text_lower or "mode" in text_lower):
-                    action = "cleaning_mode"
-                
+            elif match.groups():
+                time_value = int(match.group(1)) if match.group(1).isdigit() else 5
+                time_unit = "daqiqa"
+                for unit in ["sekund", "daqiqa", "minut", "soat"]:
+                    if unit in text_lower:
+                        time_unit = unit
+                        break
+                    
                 return Command(
-                    type=CommandType.SYSTEM,
-                    action=action,
-                    params=params,
+                    type=CommandType.REMINDER,
+                    action="set",
+                    params={"time": time_value, "unit": time_unit},
                     original_text=text
                 )
         
-        # Eslatma
-        for pattern in self.reminder_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                if "o'qi" in text_lower:
-                    return Command(
-                        type=CommandType.REMINDER,
-                        action="list",
-                        params={},
-                        original_text=text
-                    )
-                elif match.groups():
-                    time_value = int(match.group(1)) if match.group(1).isdigit() else 5
-                    time_unit = "daqiqa"
-                    for unit in ["sekund", "daqiqa", "minut", "soat"]:
-                        if unit in text_lower:
-                            time_unit = unit
+        # Media / YouTube musiqa
+        for match in self._media_re.matches(text_lower):
+            # YouTube'da musiqa qo'yish
+            if "youtube" in text_lower or "qo'shig'" in text_lower or "musiqa" in text_lower:
+                query = ""
+                if match.groups():
+                    for g in match.groups():
+                        if g and not _MEDIA_SKIP_RE.match(g.strip()):
+                            query = g.strip()
                             break
                     
+                if query:
                     return Command(
-                        type=CommandType.REMINDER,
-                        action="set",
-                        params={"time": time_value, "unit": time_unit},
+                        type=CommandType.MEDIA,
+                        action="youtube_music",
+                        params={"query": query},
                         original_text=text
                     )
-        
-        # Media / YouTube musiqa
-        for pattern in self.media_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                # YouTube'da musiqa qo'yish
-                if "youtube" in text_lower or "qo'shig'" in text_lower or "musiqa" in text_lower:
-                    query = ""
-                    if match.groups():
-                        for g in match.groups():
-                            if g and not re.match(r"(qo'y|ijro|och|qo'shig'ini|musiqasini)", g.strip()):
-                                query = g.strip()
-                                break
-                    
-                    if query:
-                        return Command(
-                            type=CommandType.MEDIA,
-                            action="youtube_music",
-                            params={"query": query},
-                            original_text=text
-                        )
                 
-                # Oddiy media buyruqlari
-                action = "play"
-                if any(x in text_lower for x in ["to'xtat", "pauza", "pause"]):
-                    action = "pause"
-                elif any(x in text_lower for x in ["davom", "play"]):
-                    action = "resume"
-                elif "keyingi" in text_lower:
-                    action = "next"
-                elif "oldingi" in text_lower:
-                    action = "previous"
+            # Oddiy media buyruqlari
+            action = "play"
+            if any(x in text_lower for x in ["to'xtat", "pauza", "pause"]):
+                action = "pause"
+            elif any(x in text_lower for x in ["davom", "play"]):
+                action = "resume"
+            elif "keyingi" in text_lower:
+                action = "next"
+            elif "oldingi" in text_lower:
+                action = "previous"
                 
-                return Command(
-                    type=CommandType.MEDIA,
-                    action=action,
-                    params={},
-                    original_text=text
-                )
+            return Command(
+                type=CommandType.MEDIA,
+                action=action,
+                params={},
+                original_text=text
+            )
 
         # Diktovka
-        for pattern in self.dictation_patterns:
-            if re.search(pattern, text_lower):
-                return Command(
-                    type=CommandType.DICTATION,
-                    action="enable",
-                    params={},
-                    original_text=text
-                )
+        if self._dictation_re.search(text_lower):
+            return Command(
+                type=CommandType.DICTATION,
+                action="enable",
+                params={},
+                original_text=text
+            )
         
         # Screenshot
-        for pattern in self.screenshot_patterns:
-            if re.search(pattern, text_lower):
-                return Command(
-                    type=CommandType.SCREENSHOT,
-                    action="capture",
-                    params={},
-                    original_text=text
-                )
+        if self._screenshot_re.search(text_lower):
+            return Command(
+                type=CommandType.SCREENSHOT,
+                action="capture",
+                params={},
+                original_text=text
+            )
         
         # Keyboard / Yozish buyruqlari
-        for pattern in self.keyboard_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                # ===== CLIPBOARD =====
-                if "nusxa" in text_lower or "copy" in text_lower:
-                    return Command(type=CommandType.KEYBOARD, action="copy", params={}, original_text=text)
-                elif "joylashtir" in text_lower or "paste" in text_lower:
-                    return Command(type=CommandType.KEYBOARD, action="paste", params={}, original_text=text)
-                elif "kesib" in text_lower or "cut" in text_lower:
-                    return Command(type=CommandType.KEYBOARD, action="cut", params={}, original_text=text)
-                elif "hammasini" in text_lower or "select all" in text_lower:
-                    return Command(type=CommandType.KEYBOARD, action="select_all", params={}, original_text=text)
-                elif "clipboard" in text_lower and any(w in text_lower for w in ["qidir", "search", "google"]):
-                    return Command(type=CommandType.KEYBOARD, action="clipboard_search", params={}, original_text=text)
-                elif "clipboard" in text_lower:
-                    return Command(type=CommandType.KEYBOARD, action="read_clipboard", params={}, original_text=text)
+        for match in self._keyboard_re.matches(text_lower):
+            # ===== CLIPBOARD =====
+            if "nusxa" in text_lower or "copy" in text_lower:
+                return Command(type=CommandType.KEYBOARD, action="copy", params={}, original_text=text)
+            elif "joylashtir" in text_lower or "paste" in text_lower:
+                return Command(type=CommandType.KEYBOARD, action="paste", params={}, original_text=text)
+            elif "kesib" in text_lower or "cut" in text_lower:
+                return Command(type=CommandType.KEYBOARD, action="cut", params={}, original_text=text)
+            elif "hammasini" in text_lower or "select all" in text_lower:
+                return Command(type=CommandType.KEYBOARD, action="select_all", params={}, original_text=text)
+            elif "clipboard" in text_lower and any(w in text_lower for w in ["qidir", "search", "google"]):
+                return Command(type=CommandType.KEYBOARD, action="clipboard_search", params={}, original_text=text)
+            elif "clipboard" in text_lower:
+                return Command(type=CommandType.KEYBOARD, action="read_clipboard", params={}, original_text=text)
                 
-                # ===== TAHRIRLASH =====
-                elif "bekor" in text_lower or "undo" in text_lower:
-                    return Command(type=CommandType.KEYBOARD, action="undo", params={}, original_text=text)
-                elif "qayta" in text_lower and "qil" in text_lower or "redo" in text_lower:
-                    return Command(type=CommandType.KEYBOARD, action="redo", params={}, original_text=text)
-                elif "saqlash" in text_lower or "save" in text_lower:
-                    return Command(type=CommandType.KEYBOARD, action="save", params={}, original_text=text)
-                elif "topish" in text_lower or "qidirish" in text_lower or "find" in text_lower:
-                    return Command(type=CommandType.KEYBOARD, action="find", params={}, original_text=text)
-                elif any(w in text_lower for w in ["yangi fayl", "yangi hujjat", "new file", "new document"]):
-                    return Command(type=CommandType.KEYBOARD, action="new", params={}, original_text=text)
-                elif "chop" in text_lower or "print" in text_lower:
-                    return Command(type=CommandType.KEYBOARD, action="print", params={}, original_text=text)
+            # ===== TAHRIRLASH =====
+            elif "bekor" in text_lower or "undo" in text_lower:
+                return Command(type=CommandType.KEYBOARD, action="undo", params={}, original_text=text)
+            elif "qayta" in text_lower and "qil" in text_lower or "redo" in text_lower:
+                return Command(type=CommandType.KEYBOARD, action="redo", params={}, original_text=text)
+            elif "saqlash" in text_lower or "save" in text_lower:
+                return Command(type=CommandType.KEYBOARD, action="save", params={}, original_text=text)
+            elif "topish" in text_lower or "qidirish" in text_lower or "find" in text_lower:
+                return Command(type=CommandType.KEYBOARD, action="find", params={}, original_text=text)
+            elif any(w in text_lower for w in ["yangi fayl", "yangi hujjat", "new file", "new document"]):
+                return Command(type=CommandType.KEYBOARD, action="new", params={}, original_text=text)
+            elif "chop" in text_lower or "print" in text_lower:
+                return Command(type=CommandType.KEYBOARD, action="print", params={}, original_text=text)
                 
-                # ===== BROWSER TAB =====
-                elif "yangi" in text_lower and "tab" in text_lower:
-                    return Command(type=CommandType.KEYBOARD, action="new_tab", params={}, original_text=text)
-                elif "tab" in text_lower and any(w in text_lower for w in ["yop", "berkit", "close"]):
-                    return Command(type=CommandType.KEYBOARD, action="close_tab", params={}, original_text=text)
-                elif "tab" in text_lower:
-                    direction = "previous" if any(w in text_lower for w in ["oldingi", "previous", "prev"]) else "next"
-                    return Command(type=CommandType.KEYBOARD, action="switch_tab", params={"direction": direction}, original_text=text)
-                elif any(w in text_lower for w in ["sahifa", "refresh", "reload"]):
-                    return Command(type=CommandType.KEYBOARD, action="refresh", params={}, original_text=text)
-                elif "manzil" in text_lower or "address" in text_lower:
-                    return Command(type=CommandType.KEYBOARD, action="address_bar", params={}, original_text=text)
+            # ===== BROWSER TAB =====
+            elif "yangi" in text_lower and "tab" in text_lower:
+                return Command(type=CommandType.KEYBOARD, action="new_tab", params={}, original_text=text)
+            elif "tab" in text_lower and any(w in text_lower for w in ["yop", "berkit", "close"]):
+                return Command(type=CommandType.KEYBOARD, action="close_tab", params={}, original_text=text)
+            elif "tab" in text_lower:
+                direction = "previous" if any(w in text_lower for w in ["oldingi", "previous", "prev"]) else "next"
+                return Command(type=CommandType.KEYBOARD, action="switch_tab", params={"direction": direction}, original_text=text)
+            elif any(w in text_lower for w in ["sahifa", "refresh", "reload"]):
+                return Command(type=CommandType.KEYBOARD, action="refresh", params={}, original_text=text)
+            elif "manzil" in text_lower or "address" in text_lower:
+                return Command(type=CommandType.KEYBOARD, action="address_bar", params={}, original_text=text)
                 
-                # ===== ZOOM / WINDOW =====
-                elif "kattalashtir" in text_lower or "zoom in" in text_lower or "yaqinlashtir" in text_lower:
-                    return Command(type=CommandType.KEYBOARD, action="zoom_in", params={}, original_text=text)
-                elif "kichraytir" in text_lower or "zoom out" in text_lower or "uzoqlashtir" in text_lower:
-                    return Command(type=CommandType.KEYBOARD, action="zoom_out", params={}, original_text=text)
-                elif "to'liq" in text_lower and "ekran" in text_lower or "full" in text_lower and "screen" in text_lower:
-                    return Command(type=CommandType.KEYBOARD, action="full_screen", params={}, original_text=text)
-                elif "boshqa" in text_lower and "dastur" in text_lower or "alt tab" in text_lower:
-                    return Command(type=CommandType.KEYBOARD, action="alt_tab", params={}, original_text=text)
-                elif "ekran" in text_lower and "qism" in text_lower:
-                    return Command(type=CommandType.KEYBOARD, action="screenshot_region", params={}, original_text=text)
+            # ===== ZOOM / WINDOW =====
+            elif "kattalashtir" in text_lower or "zoom in" in text_lower or "yaqinlashtir" in text_lower:
+                return Command(type=CommandType.KEYBOARD, action="zoom_in", params={}, original_text=text)
+            elif "kichraytir" in text_lower or "zoom out" in text_lower or "uzoqlashtir" in text_lower:
+                return Command(type=CommandType.KEYBOARD, action="zoom_out", params={}, original_text=text)
+            elif "to'liq" in text_lower and "ekran" in text_lower or "full" in text_lower and "screen" in text_lower:
+                return Command(type=CommandType.KEYBOARD, action="full_screen", params={}, original_text=text)
+            elif "boshqa" in text_lower and "dastur" in text_lower or "alt tab" in text_lower:
+                return Command(type=CommandType.KEYBOARD, action="alt_tab", params={}, original_text=text)
+            elif "ekran" in text_lower and "qism" in text_lower:
+                return Command(type=CommandType.KEYBOARD, action="screenshot_region", params={}, original_text=text)
                 
-                # ===== YOZISH =====
-                else:
-                    text_to_type = ""
-                    app_target = None
+            # ===== YOZISH =====
+            else:
+                text_to_type = ""
+                app_target = None
                     
-                    # 1. (app) da (text) deb yoz
-                    app_type_match = re.search(r"(.*)\s+da\s+(.*)\s+deb\s+yoz", text_lower)
-                    if app_type_match:
-                        app_target = app_type_match.group(1).strip()
-                        text_to_type = app_type_match.group(2).strip()
+                # 1. (app) da (text) deb yoz
+                app_type_match = _TYPE_IN_APP_RE.search(text_lower)
+                if app_type_match:
+                    app_target = app_type_match.group(1).strip()
+                    text_to_type = app_type_match.group(2).strip()
                     
-                    # 2. type (text) in (app)
-                    elif "type" in text_lower and "in" in text_lower:
-                        en_match = re.search(r"type\s+(.*)\s+in\s+(.*)", text_lower)
-                        if en_match:
-                            text_to_type = en_match.group(1).strip()
-                            app_target = en_match.group(2).strip()
-
-                    # 3. Oddiy yozish
-                    else:
-                        if match.groups():
-                            text_to_type = match.group(0).replace("yoz", "").replace("deb", "").strip()
-                            if match.group(1):
-                                text_to_type = match.group(1).strip()
+                # 2. type (text) in (app)
+                elif "type" in text_lower and "in" in text_lower:
+                    en_match = _TYPE_IN_APP_EN_RE.search(text_lower)
+                    if en_match:
+                        text_to_type = en_match.group(1).strip()
+                        app_target = en_match.group(2).strip()
+
+                # 3. Oddiy yozish
+                else:
+                    if match.groups():
+                        text_to_type = match.group(0).replace("yoz", "").replace("deb", "").strip()
+                        if match.group(1):
+                            text_to_type = match.group(1).strip()
                     
-                    if text_to_type:
-                        return Command(
-                            type=CommandType.KEYBOARD,
-                            action="type_in_app" if app_target else "type",
-                            params={"text": text_to_type, "app": app_target},
-                            original_text=text
-                        )
-        
-        # Smart buyruqlar
-        for action, patterns in self.smart_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text_lower):
+                if text_to_type:
                     return Command(
-                        type=CommandType.SMART,
-                        action=action,
-                        params={},
+                        type=CommandType.KEYBOARD,
+                        action="type_in_app" if app_target else "type",
+                        params={"text": text_to_type, "app": app_target},
                         original_text=text
                     )
         
-        # Ijtimoiy tarmoqlar
-        for pattern in self.social_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                platform = match.group(1)
+        # Smart buyruqlar
+        for action, patterns in self._smart_re.items():
+            if patterns.search(text_lower):
                 return Command(
-                    type=CommandType.SOCIAL,
-                    action="open",
-                    params={"platform": platform},
+                    type=CommandType.SMART,
+                    action=action,
+                    params={},
                     original_text=text
                 )
         
+        # Ijtimoiy tarmoqlar
+        match = self._social_re.first(text_lower)
+        if match:
+            platform = match.group(1)
+            return Command(
+                type=CommandType.SOCIAL,
+                action="open",
+                params={"platform": platform},
+                original_text=text
+            )
+        
         # Noma'lum buyruq - AI ga yuborish
         return Command(
             type=CommandType.AI_CHAT,
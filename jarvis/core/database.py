@@ -3,23 +3,214 @@ Database Manager - Savol-javoblarni saqlash va boshqarish
 SQLite ishlatiladi
 """
 
+import atexit
+import json
 import sqlite3
 import os
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional, List, Tuple
+from typing import Any, Dict, Iterator, Optional, List, Tuple
+
+import config
+
+# SQL so'rovlar bir xil satr sifatida qayta ishlatiladi -
+# sqlite3 ularni har bir ulanishning statement keshida tayyor (prepared) holda saqlaydi
+# UPSERT: qator id si saqlanadi va qa_fts triggerlari to'g'ri ishlaydi (REPLACE delete trigger ni chaqirmaydi)
+SQL_SAVE_QA = (
+    "INSERT INTO qa (question, answer, timestamp, command_type, last_hit, expires_at) VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(question) DO UPDATE SET answer = excluded.answer, timestamp = excluded.timestamp, "
+    "command_type = excluded.command_type, last_hit = excluded.last_hit, expires_at = excluded.expires_at"
+)
+SQL_GET_ANSWER = "SELECT answer, expires_at FROM qa WHERE question = ?"
+SQL_TOUCH_QA = "UPDATE qa SET last_hit = ? WHERE question = ?"
+SQL_EXPIRED_QA = "SELECT id, question FROM qa WHERE expires_at < ? LIMIT ?"
+SQL_LRU_QA = "SELECT id, question FROM qa ORDER BY last_hit LIMIT ?"
+SQL_COUNT_QA = "SELECT COUNT(*) FROM qa"
+SQL_DELETE_QA = "DELETE FROM qa WHERE id = ?"
+SQL_SAVE_APP = (
+    "INSERT INTO apps (name, path, last_scanned) VALUES (?, ?, ?) "
+    "ON CONFLICT(name) DO UPDATE SET path = excluded.path, last_scanned = excluded.last_scanned"
+)
+SQL_ALL_APPS = "SELECT name, path FROM apps"
+# O'zgarmagan dasturlar - faqat skan vaqti (nomlar JSON ro'yxat sifatida bitta parametrda)
+SQL_TOUCH_APPS = "UPDATE apps SET last_scanned = ? WHERE name IN (SELECT value FROM json_each(?))"
+SQL_ALL_QA = "SELECT question, answer FROM qa ORDER BY timestamp DESC"
+SQL_SIMILAR_QA = (
+    "SELECT qa.question, qa.answer FROM qa_fts JOIN qa ON qa.id = qa_fts.rowid "
+    "WHERE qa_fts MATCH ? AND qa.command_type IN ({types}) "
+    "AND (qa.expires_at IS NULL OR qa.expires_at >= ?) ORDER BY rank LIMIT ?"
+)
+# O'xshash savol faqat haqiqiy javoblardan qidiriladi. Ilova/sayt ochish ("... ochilmoqda") va
+# web_search ("Google'da '...' qidirilmoqda.") yozuvlari - bajarilgan amal tasdig'i, javob emas:
+# qaytarilsa brauzer ochilmaydi. Turi yo'q eski yozuvlar ham olinmaydi
+SIMILAR_COMMAND_TYPES = ("ai_chat",)
+
+# qa jadvalining FTS5 ko'zgusi (external content) va uni sinxron ushlab turuvchi triggerlar
+SQL_CREATE_FTS = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS qa_fts USING fts5("
+    "question, content='qa', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS qa_fts_ai AFTER INSERT ON qa BEGIN "
+    "INSERT INTO qa_fts (rowid, question) VALUES (new.id, new.question); END",
+    "CREATE TRIGGER IF NOT EXISTS qa_fts_ad AFTER DELETE ON qa BEGIN "
+    "INSERT INTO qa_fts (qa_fts, rowid, question) VALUES ('delete', old.id, old.question); END",
+    "CREATE TRIGGER IF NOT EXISTS qa_fts_au AFTER UPDATE OF question ON qa BEGIN "
+    "INSERT INTO qa_fts (qa_fts, rowid, question) VALUES ('delete', old.id, old.question); "
+    "INSERT INTO qa_fts (rowid, question) VALUES (new.id, new.question); END",
+]
+
+_FTS_TOKEN_RE = re.compile(r"\w+")
+_WORD_RE = re.compile(r"[\w'`ʻʼ’]+")
+_NUMBER_RE = re.compile(r"\d+")
+
+# Har bir yozuvda o'chiriladigan eskirgan/ortiqcha qatorlar chegarasi (yozuvlar sekinlashmasligi uchun)
+EVICT_BATCH = 64
 
 
 class DatabaseManager:
     """Jarvis uchun ma'lumotlar bazasi"""
     
-    def __init__(self):
-        self.db_path = os.path.join(os.path.dirname(__file__), "..", "data", "jarvis.db")
+    def __init__(self, db_path: Optional[str] = None, pool_size: int = 4,
+                 batch_size: int = 32, flush_interval: float = 0.5, cache_size: int = 1024,
+                 similar_min_score: float = 0.85, ttls: Optional[Dict[str, Optional[float]]] = None,
+                 default_ttl: Optional[float] = config.QA_CACHE_DEFAULT_TTL,
+                 max_rows: int = config.QA_CACHE_MAX_ROWS,
+                 maintenance_interval: float = config.QA_MAINTENANCE_INTERVAL):
+        self.db_path = db_path or os.path.join(os.path.dirname(__file__), "..", "data", "jarvis.db")
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        
+        # Uzoq yashaydigan ulanishlar hovuzi (har chaqiruvda connect/close qilmaslik uchun)
+        self._pool_size = max(1, pool_size)
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._connections: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        
+        # Write-behind navbati: save_qa javobni kutdirmasdan shu yerga yozadi,
+        # fon oqimi esa to'plamni bitta tranzaksiyada bazaga tushiradi
+        # (batch_size ta yozuv yig'ilganda yoki flush_interval soniya o'tganda)
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval
+        self._pending: "OrderedDict[str, Tuple[Any, ...]]" = OrderedDict()
+        self._inflight: Dict[str, Tuple[Any, ...]] = {}
+        self._hits: Dict[str, float] = {}
+        self._write_cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._flush_requested = False
+        self._enqueued = 0
+        self._flushed = 0
+        # Muvaffaqiyatsiz yozishlar: yozuvlar navbatga qaytariladi, await_flush() False qaytaradi
+        self._flush_failures = 0
+        self._flush_error: Optional[Exception] = None
+        self._writer: Optional[threading.Thread] = None
+        self._closed = False
+        
+        # get_answer oldidagi LRU kesh: topilgan javoblar ham, topilmaganlar (None) ham saqlanadi.
+        # save_qa yozuvni yangilaydi; generation esa eski o'qish natijasi keshni buzmasligi uchun
+        self._cache_size = max(1, cache_size)
+        self._answer_cache: "OrderedDict[str, Tuple[Optional[str], Optional[float]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_generation = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        # O'xshash savollar qidiruvi (FTS5 bo'lmasa o'chiriladi).
+        # 0.85: olti so'zgacha savolda bitta butunlay boshqa so'z (5/6 = 0.83) rad etiladi,
+        # har bir so'zda bitta-ikkita harf xatosi ("boldi" ~ "bo'ldi") esa o'tadi
+        self.similar_min_score = similar_min_score
+        self._fts_enabled = True
+        
+        # Eskirish siyosati: tur bo'yicha TTL, qatorlar soni chegarasi (LRU - last_hit bo'yicha)
+        self.ttls = dict(config.QA_CACHE_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.max_rows = max_rows
+        self._maintenance_stop = threading.Event()
+        self._maintenance: Optional[threading.Thread] = None
+        
         self._init_db()
+        atexit.register(self.close)
+        
+        if maintenance_interval and maintenance_interval > 0:
+            self._maintenance = threading.Thread(
+                target=self._maintenance_loop, args=(maintenance_interval,),
+                name="JarvisDBMaintenance", daemon=True,
+            )
+            self._maintenance.start()
+    
+    def _open_connection(self) -> sqlite3.Connection:
+        """Yangi ulanish: WAL jurnali va NORMAL sinxronlash"""
+        conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False, cached_statements=64)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+    
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Hovuzdan ulanish olish va qaytarish (hovuz to'lsa bo'shashini kutadi)"""
+        conn = None
+        while conn is None:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                with self._pool_lock:
+                    if len(self._connections) < self._pool_size:
+                        conn = self._open_connection()
+                        self._connections.append(conn)
+                if conn is None:
+                    # close() band ulanishlarni hovuzdan chiqaradi - ular qaytmaydi, shuning uchun
+                    # kutish davriy: bo'sh joy paydo bo'lsa yangi ulanish ochiladi
+                    try:
+                        conn = self._pool.get(timeout=0.1)
+                    except queue.Empty:
+                        pass
+        try:
+            yield conn
+        finally:
+            with self._pool_lock:
+                # close() dan keyin qaytgan (eski) ulanish hovuzga qo'yilmaydi, yopiladi
+                pooled = any(conn is c for c in self._connections)
+                if pooled:
+                    self._pool.put(conn)
+            if not pooled:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+    
+    def close(self):
+        """Navbatdagi yozuvlarni bazaga tushirish va barcha ulanishlarni yopish"""
+        self._maintenance_stop.set()
+        with self._write_cond:
+            self._closed = True
+            self._write_cond.notify_all()
+        if self._writer and self._writer is not threading.current_thread():
+            self._writer.join(timeout=5)
+        self._flush_pending()
+        
+        # Bo'sh ulanishlar darhol yopiladi; band ulanishlar (masalan shutdown paytida daemon
+        # oqimdagi get_answer) hovuzdan chiqariladi va egasi qaytarganda _connection yopadi
+        with self._pool_lock:
+            while True:
+                try:
+                    conn = self._pool.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._connections = []
     
     def _init_db(self):
         """Bazani yaratish"""
-        conn = sqlite3.connect(self.db_path)
+        with self._connection() as conn:
+            self._create_tables(conn)
+    
+    def _create_tables(self, conn: sqlite3.Connection):
+        """Jadvallarni yaratish"""
         cursor = conn.cursor()
         
         # Savol-javoblar jadvali
@@ -28,9 +219,13 @@ class DatabaseManager:
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 question TEXT UNIQUE,
                 answer TEXT,
-                timestamp DATETIME
+                timestamp DATETIME,
+                command_type TEXT,
+                last_hit REAL,
+                expires_at REAL
             )
         ''')
+        self._migrate_qa(cursor)
         
         # Dasturlar scan natijalari (kelajakda ishlatish uchun)
         cursor.execute('''
@@ -42,86 +237,471 @@ class DatabaseManager:
             )
         ''')
         
+        self._create_fts(cursor)
         conn.commit()
-        conn.close()
     
-    def save_qa(self, question: str, answer: str):
-        """Savol va javobni saqlash"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            question = question.lower().strip()
+    def _migrate_qa(self, cursor: sqlite3.Cursor):
+        """Eski qa jadvaliga eskirish ustunlarini qo'shish va indekslarni yaratish"""
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(qa)")}
+        if "last_hit" not in columns:
+            cursor.execute("ALTER TABLE qa ADD COLUMN command_type TEXT")
+            cursor.execute("ALTER TABLE qa ADD COLUMN last_hit REAL")
+            cursor.execute("ALTER TABLE qa ADD COLUMN expires_at REAL")
+            # Eski yozuvlar: oxirgi murojaat - saqlangan vaqt, muddat - hozirdan boshlab default TTL
+            # (aks holda eski kesh yangilanish bilan birdaniga o'chib ketadi)
+            now = time.time()
             cursor.execute(
-                "INSERT OR REPLACE INTO qa (question, answer, timestamp) VALUES (?, ?, ?)",
-                (question, answer, datetime.now())
+                "UPDATE qa SET last_hit = COALESCE(CAST(strftime('%s', timestamp) AS REAL), ?)", (now,)
             )
-            
-            conn.commit()
-            conn.close()
-            print(f"[DB] Savol saqlandi: {question[:30]}...")
-        except Exception as e:
-            print(f"[DB] Saqlashda xato: {e}")
+            if self.default_ttl is not None:
+                cursor.execute("UPDATE qa SET expires_at = ?", (now + self.default_ttl,))
+            print("[DB] qa jadvali yangilandi (TTL va LRU ustunlari qo'shildi)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS qa_last_hit ON qa (last_hit)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS qa_expires_at ON qa (expires_at)")
+    
+    def _create_fts(self, cursor: sqlite3.Cursor):
+        """qa_fts jadvali va triggerlarini yaratish (birinchi marta - mavjud yozuvlardan to'ldirish)"""
+        exists = cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'qa_fts'").fetchone()
+        try:
+            for sql in SQL_CREATE_FTS:
+                cursor.execute(sql)
+            if not exists:
+                cursor.execute("INSERT INTO qa_fts (qa_fts) VALUES ('rebuild')")
+        except sqlite3.OperationalError as e:
+            print(f"[DB] FTS5 mavjud emas, o'xshash savollar qidiruvi o'chirildi: {e}")
+            self._fts_enabled = False
+    
+    def save_qa(self, question: str, answer: str, command_type: Optional[str] = None):
+        """
+        Savol va javobni saqlash (navbatga qo'yiladi, fon oqimida yoziladi)
+        
+        Args:
+            command_type: Buyruq turi (CommandType qiymati) - javob yashash muddati shundan olinadi
+        """
+        question = question.lower().strip()
+        now = time.time()
+        ttl = self.ttls.get(command_type, self.default_ttl)
+        expires_at = now + ttl if ttl is not None else None
+        self._cache_store(question, answer, expires_at, invalidate=True)
+        with self._write_cond:
+            self._pending[question] = (answer, datetime.now(), command_type, now, expires_at)
+            self._pending.move_to_end(question)
+            self._enqueued += 1
+            closed = self._closed
+            if not closed:
+                self._ensure_writer()
+                # Birinchi yozuv taymerni boshlaydi, to'lgan to'plam darhol yoziladi
+                if len(self._pending) == 1 or len(self._pending) >= self._batch_size:
+                    self._write_cond.notify_all()
+        
+        # Yopilgandan keyin fon oqimi yo'q - darhol yozamiz
+        if closed:
+            self._flush_pending()
+        print(f"[DB] Savol saqlandi: {question[:30]}...")
     
     def get_answer(self, question: str) -> Optional[str]:
         """Savolga javobni bazadan qidirish"""
+        question = question.lower().strip()
+        
+        now = time.time()
+        
+        with self._cache_lock:
+            entry = self._answer_cache.get(question)
+            hit = entry is not None and (entry[1] is None or entry[1] >= now)
+            if hit:
+                self._answer_cache.move_to_end(question)
+                self.cache_hits += 1
+            else:
+                if entry is not None:
+                    del self._answer_cache[question]
+                self.cache_misses += 1
+                generation = self._cache_generation
+        if hit:
+            if entry[0] is not None:
+                self._touch(question, now)
+            return entry[0]
+        
+        # Hali bazaga tushmagan yozuvlar (o'z yozuvini o'qish kafolati)
+        with self._write_cond:
+            row = self._pending.get(question) or self._inflight.get(question)
+        if row:
+            return row[0] if row[4] is None or row[4] >= now else None
+        
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            question = question.lower().strip()
-            cursor.execute("SELECT answer FROM qa WHERE question = ?", (question,))
-            result = cursor.fetchone()
-            
-            conn.close()
-            if result:
-                return result[0]
+            with self._connection() as conn:
+                result = conn.execute(SQL_GET_ANSWER, (question,)).fetchone()
         except Exception as e:
             print(f"[DB] O'qishda xato: {e}")
-        return None
-
-    def save_apps(self, apps_dict: dict):
-        """Dasturlarni bazaga saqlash"""
+            return None
+        
+        # Muddati o'tgan yozuv topilmagan hisoblanadi (keyingi yozuvda o'chiriladi)
+        if result and (result[1] is None or result[1] >= now):
+            answer, expires_at = result
+            self._touch(question, now)
+        else:
+            answer, expires_at = None, None
+        self._cache_store(question, answer, expires_at, generation=generation)
+        return answer
+    
+    def _touch(self, question: str, now: float):
+        """Oxirgi murojaat vaqtini belgilash (LRU uchun, keyingi yozuv bilan birga saqlanadi)"""
+        with self._write_cond:
+            self._hits[question] = now
+    
+    def find_similar(self, question: str, min_score: Optional[float] = None, limit: int = 20,
+                     command_types: Tuple[str, ...] = SIMILAR_COMMAND_TYPES) -> Optional[Tuple[str, str, float]]:
+        """
+        Bazadagi eng o'xshash savolni topish ("soat necha bo'ldi" ~ "soat necha boldi")
+        
+        FTS5 so'z boshi (prefiks) bo'yicha faqat nomzodlarni tanlaydi; ball butun so'zlar
+        bo'yicha (tahrir masofasi) hisoblanadi - "python nimadir" "python nima" ga mos kelmaydi.
+        
+        Args:
+            question: Savol
+            min_score: Minimal o'xshashlik (0..1), default - similar_min_score
+            limit: FTS dan olinadigan nomzodlar soni
+            command_types: Qaysi turdagi saqlangan javoblar orasidan qidirish
+        
+        Returns:
+            (bazadagi savol, javob, ball) yoki None
+        """
+        if not self._fts_enabled:
+            return None
+        question = question.lower().strip()
+        min_score = self.similar_min_score if min_score is None else min_score
+        
+        stems = dict.fromkeys(token[:4] for token in _FTS_TOKEN_RE.findall(question) if len(token) >= 3)
+        if not stems or not command_types:
+            return None
+        match = " OR ".join(f'"{stem}"*' for stem in stems)
+        sql = SQL_SIMILAR_QA.format(types=", ".join("?" * len(command_types)))
+        
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self._connection() as conn:
+                candidates = conn.execute(sql, (match, *command_types, time.time(), limit)).fetchall()
+        except Exception as e:
+            print(f"[DB] O'xshash savol qidirishda xato: {e}")
+            return None
+        
+        best = None
+        for candidate, answer in candidates:
+            score = self._similarity(question, candidate)
+            if score >= min_score and (best is None or score > best[2]):
+                best = (candidate, answer, score)
+        if best:
+            self._touch(best[0], time.time())
+        return best
+    
+    @staticmethod
+    def _edit_distance(a: str, b: str) -> int:
+        """Ikki so'z orasidagi Levenshtein masofasi"""
+        if len(a) < len(b):
+            a, b = b, a
+        prev_row = list(range(len(b) + 1))
+        for i, ca in enumerate(a):
+            curr_row = [i + 1]
+            for j, cb in enumerate(b):
+                curr_row.append(min(curr_row[j] + 1, prev_row[j + 1] + 1, prev_row[j] + (ca != cb)))
+            prev_row = curr_row
+        return prev_row[-1]
+    
+    @classmethod
+    def _word_similarity(cls, a: str, b: str) -> float:
+        """Ikki butun so'z o'xshashligi: 1 - tahrir masofasi / uzunroq so'z uzunligi"""
+        if a == b:
+            return 1.0
+        return 1.0 - cls._edit_distance(a, b) / max(len(a), len(b))
+    
+    @classmethod
+    def _similarity(cls, a: str, b: str, word_threshold: float = 0.8) -> float:
+        """
+        Savollar o'xshashligi (0..1): ikkala tomondagi har bir so'z uchun eng yaqin juftining
+        o'xshashligi o'rtachasi; word_threshold dan past so'z (boshqa so'z) 0 hisoblanadi.
+        1.0 faqat so'zlar to'plami bir xil bo'lganda
+        """
+        words_a, words_b = _WORD_RE.findall(a), _WORD_RE.findall(b)
+        if not words_a or not words_b:
+            return 0.0
+        # Sonlar farq qilsa (masalan "5 plyus 5" va "5 plyus 6") javob ham boshqa
+        if sorted(_NUMBER_RE.findall(a)) != sorted(_NUMBER_RE.findall(b)):
+            return 0.0
+        
+        def side(words: List[str], others: List[str]) -> float:
+            total = 0.0
+            for word in words:
+                best = max(cls._word_similarity(word, other) for other in others)
+                if best >= word_threshold:
+                    total += best
+            return total
+        
+        return (side(words_a, words_b) + side(words_b, words_a)) / (len(words_a) + len(words_b))
+    
+    def _cache_store(self, question: str, answer: Optional[str], expires_at: Optional[float] = None,
+                     generation: Optional[int] = None, invalidate: bool = False):
+        """
+        Javobni (yoki topilmaganini) keshga yozish
+        
+        Args:
+            expires_at: Javob muddati (unix vaqt), None - muddatsiz
+            generation: O'qish boshlangandagi avlod; shundan beri yozuv bo'lgan bo'lsa natija tashlanadi
+            invalidate: Yozuv - oldin boshlangan o'qishlarning natijalarini bekor qiladi
+        """
+        with self._cache_lock:
+            if invalidate:
+                self._cache_generation += 1
+            elif generation != self._cache_generation:
+                return
+            self._answer_cache[question] = (answer, expires_at)
+            self._answer_cache.move_to_end(question)
+            while len(self._answer_cache) > self._cache_size:
+                self._answer_cache.popitem(last=False)
+    
+    def _cache_discard(self, questions: List[str]):
+        """O'chirilgan yozuvlarni keshdan olib tashlash"""
+        if not questions:
+            return
+        with self._cache_lock:
+            self._cache_generation += 1
+            for question in questions:
+                self._answer_cache.pop(question, None)
+    
+    def clear_cache(self):
+        """Javoblar keshini tozalash"""
+        with self._cache_lock:
+            self._answer_cache.clear()
+            self._cache_generation += 1
+    
+    def cache_info(self) -> Dict[str, int]:
+        """Kesh statistikasi"""
+        with self._cache_lock:
+            return {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "negative": sum(1 for answer, _ in self._answer_cache.values() if answer is None),
+                "size": len(self._answer_cache),
+                "max_size": self._cache_size,
+            }
+    
+    def _ensure_writer(self):
+        """Fon yozuvchi oqimini kerak bo'lganda ishga tushirish (_write_cond ichida chaqiriladi)"""
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._writer_loop, name="JarvisDBWriter", daemon=True)
+            self._writer.start()
+    
+    def _writer_loop(self):
+        """Navbatni soni yoki vaqti bo'yicha bazaga tushirish"""
+        while True:
+            with self._write_cond:
+                while not self._pending and not self._closed:
+                    self._write_cond.wait()
+                if self._closed:
+                    return
+                
+                # Birinchi yozuvdan keyin to'plam to'lishini yoki vaqt tugashini kutamiz
+                deadline = time.monotonic() + self._flush_interval
+                while (not self._closed and not self._flush_requested
+                       and len(self._pending) < self._batch_size):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._write_cond.wait(remaining)
             
-            for name, path in apps_dict.items():
-                cursor.execute(
-                    "INSERT OR REPLACE INTO apps (name, path, last_scanned) VALUES (?, ?, ?)",
-                    (name.lower(), path, datetime.now())
-                )
+            if not self._flush_pending():
+                # Baza band yoki xato - darhol qayta urinmaymiz
+                with self._write_cond:
+                    if not self._closed:
+                        self._write_cond.wait(self._flush_interval)
+    
+    def _flush_pending(self) -> bool:
+        """
+        Navbatdagi barcha yozuvlarni bitta tranzaksiyada yozish
+        
+        Returns:
+            False - yozish muvaffaqiyatsiz, yozuvlar navbatga qaytarildi
+        """
+        with self._flush_lock:
+            with self._write_cond:
+                self._flush_requested = False
+                hits = [(ts, question) for question, ts in self._hits.items() if question not in self._pending]
+                self._hits = {}
+                if not self._pending and not hits:
+                    self._flushed = self._enqueued
+                    self._write_cond.notify_all()
+                    return True
+                batch = [(question, *row) for question, row in self._pending.items()]
+                self._inflight = dict(self._pending)
+                self._pending.clear()
+                target = self._enqueued
+            
+            evicted: List[str] = []
+            try:
+                with self._connection() as conn, conn:
+                    if batch:
+                        conn.executemany(SQL_SAVE_QA, batch)
+                    if hits:
+                        conn.executemany(SQL_TOUCH_QA, hits)
+                    # Eskirgan va ortiqcha qatorlarni oz-ozdan, shu tranzaksiyaning o'zida tozalash
+                    if batch:
+                        evicted = self._evict(conn, EVICT_BATCH)
+            except Exception as e:
+                print(f"[DB] Saqlashda xato ({len(batch)} ta yozuv navbatga qaytarildi): {e}")
+                with self._write_cond:
+                    # Shu orada kelgan yangi qiymatlar eskisidan ustun
+                    pending = OrderedDict(self._inflight)
+                    pending.update(self._pending)
+                    self._pending = pending
+                    for ts, question in hits:
+                        self._hits[question] = max(ts, self._hits.get(question, ts))
+                    self._inflight = {}
+                    self._flush_failures += 1
+                    self._flush_error = e
+                    self._write_cond.notify_all()
+                return False
+            self._cache_discard(evicted)
             
-            conn.commit()
-            conn.close()
-            print(f"[DB] {len(apps_dict)} ta dastur saqlandi.")
+            with self._write_cond:
+                self._inflight = {}
+                self._flushed = target
+                self._flush_error = None
+                self._write_cond.notify_all()
+            return True
+    
+    def _evict(self, conn: sqlite3.Connection, limit: int) -> List[str]:
+        """
+        Muddati o'tgan, keyin eng uzoq ishlatilmagan (LRU) qatorlarni o'chirish
+        
+        Returns:
+            O'chirilgan savollar (keshdan ham olib tashlash uchun)
+        """
+        rows = conn.execute(SQL_EXPIRED_QA, (time.time(), limit)).fetchall()
+        if self.max_rows is not None:
+            excess = conn.execute(SQL_COUNT_QA).fetchone()[0] - len(rows) - self.max_rows
+            if excess > 0:
+                expired_ids = {row_id for row_id, _ in rows}
+                lru = conn.execute(SQL_LRU_QA, (min(excess, limit) + len(rows),)).fetchall()
+                rows += [row for row in lru if row[0] not in expired_ids][:min(excess, limit)]
+        if rows:
+            conn.executemany(SQL_DELETE_QA, [(row_id,) for row_id, _ in rows])
+        return [question for _, question in rows]
+    
+    def compact(self, vacuum_ratio: float = 0.2) -> Dict[str, Any]:
+        """
+        To'liq tozalash va siqish (fon oqimida vaqti-vaqti bilan ishlaydi)
+        
+        1. Navbatni yozish, eskirgan va chegaradan ortiq barcha qatorlarni o'chirish
+        2. FTS indeksini optimallashtirish, WAL faylini qisqartirish
+        3. Bo'sh sahifalar ulushi vacuum_ratio dan oshsa - VACUUM
+        """
+        self.flush()
+        stats = {"deleted": 0, "vacuumed": False}
+        try:
+            with self._connection() as conn:
+                while True:
+                    with conn:
+                        deleted = self._evict(conn, 1000)
+                    self._cache_discard(deleted)
+                    stats["deleted"] += len(deleted)
+                    if len(deleted) < 1000:
+                        break
+                
+                if self._fts_enabled:
+                    with conn:
+                        conn.execute("INSERT INTO qa_fts (qa_fts) VALUES ('optimize')")
+                
+                pages = conn.execute("PRAGMA page_count").fetchone()[0]
+                free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                if pages and free / pages > vacuum_ratio:
+                    conn.execute("VACUUM")
+                    stats["vacuumed"] = True
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                stats["rows"] = conn.execute(SQL_COUNT_QA).fetchone()[0]
+            print(f"[DB] Tozalash: {stats['deleted']} ta yozuv o'chirildi, qoldi: {stats['rows']}"
+                  f"{' (VACUUM)' if stats['vacuumed'] else ''}")
+        except Exception as e:
+            print(f"[DB] Tozalashda xato: {e}")
+        return stats
+    
+    def _maintenance_loop(self, interval: float):
+        """Fon tozalash: har interval soniyada compact()"""
+        while not self._maintenance_stop.wait(interval):
+            self.compact()
+    
+    def flush(self):
+        """Navbatni hozirning o'zida (chaqiruvchi oqimda) bazaga tushirish"""
+        self._flush_pending()
+    
+    def await_flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Shu paytgacha navbatga qo'yilgan barcha yozuvlar bazaga tushishini kutish
+        
+        Returns:
+            True - yozuvlar commit qilindi, False - timeout tugadi yoki yozish xato berdi
+            (yozuvlar navbatda qoladi va keyinroq qayta yoziladi)
+        """
+        with self._write_cond:
+            target = self._enqueued
+            if self._flushed >= target:
+                return True
+            failures = self._flush_failures
+            writer_alive = self._writer is not None and self._writer.is_alive()
+            if writer_alive:
+                self._flush_requested = True
+                self._write_cond.notify_all()
+                self._write_cond.wait_for(
+                    lambda: self._flushed >= target or self._flush_failures != failures, timeout)
+                return self._flushed >= target
+        
+        return self._flush_pending() and self._flushed >= target
+
+    def save_apps(self, apps_dict: dict, only_changed: bool = False) -> int:
+        """
+        Dasturlarni bazaga saqlash (bitta tranzaksiya, bitta vaqt belgisi)
+        
+        Args:
+            apps_dict: nom -> yo'l
+            only_changed: True bo'lsa faqat yangi yoki yo'li o'zgargan dasturlar to'liq yoziladi,
+                qolganlarining faqat last_scanned i bitta UPDATE bilan yangilanadi. Farqni o'qish
+                ham yozish bilan bir tranzaksiyada (BEGIN IMMEDIATE) - oraliqda boshqa yozuv kirmaydi
+        
+        Returns:
+            Yozilgan (yangi yoki o'zgargan) qatorlar soni
+        """
+        scanned_at = datetime.now()
+        rows = {name.lower(): path for name, path in apps_dict.items()}
+        try:
+            with self._connection() as conn, conn:
+                if only_changed:
+                    conn.execute("BEGIN IMMEDIATE")
+                    existing = dict(conn.execute(SQL_ALL_APPS).fetchall())
+                    unchanged = [name for name, path in rows.items() if existing.get(name) == path]
+                    rows = {name: path for name, path in rows.items() if existing.get(name) != path}
+                    if unchanged:
+                        conn.execute(SQL_TOUCH_APPS, (scanned_at, json.dumps(unchanged)))
+                conn.executemany(SQL_SAVE_APP, [(name, path, scanned_at) for name, path in rows.items()])
+            print(f"[DB] {len(rows)} ta dastur saqlandi.")
+            return len(rows)
         except Exception as e:
             print(f"[DB] Dasturlarni saqlashda xato: {e}")
+            return 0
 
     def get_all_apps(self) -> dict:
         """Barcha saqlangan dasturlarni olish"""
         apps = {}
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT name, path FROM apps")
-            results = cursor.fetchall()
+            with self._connection() as conn:
+                results = conn.execute(SQL_ALL_APPS).fetchall()
             for name, path in results:
                 apps[name] = path
-            conn.close()
         except Exception as e:
             print(f"[DB] Dasturlarni o'qishda xato: {e}")
         return apps
 
     def get_all_qa(self) -> List[Tuple[str, str]]:
         """Barcha savol-javoblarni olish"""
+        self.flush()
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT question, answer FROM qa ORDER BY timestamp DESC")
-            results = cursor.fetchall()
-            conn.close()
-            return results
+            with self._connection() as conn:
+                return conn.execute(SQL_ALL_QA).fetchall()
         except:
             return []
 
@@ -0,0 +1,113 @@
+"""
+Buyruqlar dispetcheri
+(CommandType, action) juftligini tayyor bog'langan handlerga moslaydi -
+buyruqni bajarish bitta dict qidiruviga aylanadi
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.commands import Command, CommandType
+
+# Tur uchun har qanday action (fallback) belgisi
+ANY_ACTION = "*"
+
+Handler = Callable[[Command], str]
+
+
+def command_handler(command_type: CommandType, *actions: str, pass_command: bool = False, **params: Any):
+    """
+    Metodni buyruq handleri sifatida belgilash (deklarativ ro'yxatdan o'tish)
+
+    Args:
+        command_type: Buyruq turi
+        actions: Shu metod bajaradigan action nomlari
+        pass_command: True bo'lsa metod butun `Command` obyektini oladi
+        params: Buyruq parametrlaridan olinadigan qiymatlar va ularning default qiymatlari.
+                Metodga e'lon qilingan tartibda pozitsion argument sifatida beriladi.
+
+    Misol:
+        @command_handler(CommandType.SYSTEM, "brightness_set", level=50)
+        def set_brightness(self, level: int) -> str: ...
+    """
+    def decorator(func):
+        routes = func.__dict__.setdefault("_command_routes", [])
+        for action in actions:
+            routes.append((command_type, action, pass_command, dict(params)))
+        return func
+    return decorator
+
+
+def _bind(method: Callable, params: Dict[str, Any]) -> Callable[[Dict[str, Any]], str]:
+    """Metodni `handler(params)` ko'rinishiga keltirish"""
+    if params:
+        defaults = list(params.items())
+        return lambda p: method(*[p.get(key, default) for key, default in defaults])
+    return lambda p: method()
+
+
+def collect_routes(obj: Any) -> List[Tuple[CommandType, str, bool, Callable]]:
+    """Obyektdagi belgilangan metodlardan (tur, action, pass_command, bog'langan handler) ro'yxati"""
+    routes = []
+    for name in dir(type(obj)):
+        func = getattr(type(obj), name, None)
+        for command_type, action, pass_command, params in getattr(func, "_command_routes", ()):
+            method = getattr(obj, name)
+            handler = method if pass_command else _bind(method, params)
+            routes.append((command_type, action, pass_command, handler))
+    return routes
+
+
+def action_table(obj: Any) -> Dict[str, Callable[[Dict[str, Any]], str]]:
+    """
+    Feature obyekti uchun action -> handler(params) jadvali
+    Birinchi chaqiruvda quriladi va obyektda saqlanadi (feature `execute` metodlari uchun)
+    """
+    table = obj.__dict__.get("_action_table")
+    if table is None:
+        table = {action: handler for _, action, pass_command, handler in collect_routes(obj) if not pass_command}
+        obj.__dict__["_action_table"] = table
+    return table
+
+
+class CommandRegistry:
+    """(CommandType, action) -> handler jadvali"""
+
+    def __init__(self, default: Optional[Handler] = None):
+        self._handlers: Dict[Tuple[CommandType, str], Handler] = {}
+        self._default = default
+
+    def __len__(self) -> int:
+        return len(self._handlers)
+
+    def register(self, command_type: CommandType, action: str, handler: Handler):
+        """Bitta handlerni ro'yxatdan o'tkazish (action=ANY_ACTION - tur uchun fallback)"""
+        key = (command_type, action)
+        if key in self._handlers:
+            raise ValueError(f"Handler allaqachon mavjud: {command_type.name}/{action}")
+        self._handlers[key] = handler
+
+    def register_object(self, obj: Any):
+        """Obyektning `@command_handler` bilan belgilangan barcha metodlarini ro'yxatdan o'tkazish"""
+        for command_type, action, pass_command, handler in collect_routes(obj):
+            if pass_command:
+                self.register(command_type, action, handler)
+            else:
+                self.register(command_type, action, lambda command, h=handler: h(command.params))
+
+    def routes(self) -> List[Tuple[CommandType, str]]:
+        """Ro'yxatdan o'tgan barcha (tur, action) juftliklari"""
+        return list(self._handlers)
+
+    def resolve(self, command_type: CommandType, action: str) -> Optional[Handler]:
+        """Handlerni topish: avval aniq action, keyin tur uchun fallback"""
+        handler = self._handlers.get((command_type, action))
+        if handler is None:
+            handler = self._handlers.get((command_type, ANY_ACTION), self._default)
+        return handler
+
+    def dispatch(self, command: Command) -> Optional[str]:
+        """Buyruqni bajarish"""
+        handler = self.resolve(command.type, command.action)
+        if handler is None:
+            return None
+        return handler(command)
@@ -0,0 +1,84 @@
+"""
+Fuzzy qidiruv indeksi (SymSpell uslubida)
+Kalit so'zlarning "o'chirish qo'shnichiligi" oldindan hisoblanadi,
+shuning uchun tuzatish lug'at hajmidan deyarli bog'liq bo'lmagan hash qidiruvga aylanadi
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+class DeletionIndex:
+    """Kalit so'zlar uchun SymSpell deletion-neighbourhood indeksi"""
+
+    def __init__(self, keywords: Iterable[str], distance: Callable[[str, str], int], max_distance: int = 2):
+        """
+        Args:
+            keywords: Kalit so'zlar (tartib muhim - teng masofada birinchisi tanlanadi)
+            distance: Haqiqiy masofani hisoblovchi funksiya (Levenshtein)
+            max_distance: Indeks qo'llab-quvvatlaydigan eng katta tahrir masofasi
+        """
+        self.max_distance = max_distance
+        self._distance = distance
+        self._words: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._deletes: Dict[str, Set[int]] = {}
+
+        for keyword in keywords:
+            self.add(keyword)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._positions
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def add(self, keyword: str):
+        """Kalit so'zni indeksga qo'shish (takroriy so'zlar e'tiborsiz qoldiriladi)"""
+        if keyword in self._positions:
+            return
+        position = len(self._words)
+        self._words.append(keyword)
+        self._positions[keyword] = position
+        for variant in self._variants(keyword, self.max_distance):
+            self._deletes.setdefault(variant, set()).add(position)
+
+    @staticmethod
+    def _variants(word: str, depth: int) -> Set[str]:
+        """So'zdan `depth` tagacha harf o'chirib hosil bo'ladigan barcha variantlar (so'zning o'zi bilan)"""
+        variants = {word}
+        frontier = {word}
+        for _ in range(depth):
+            next_frontier = set()
+            for item in frontier:
+                for i in range(len(item)):
+                    next_frontier.add(item[:i] + item[i + 1:])
+            next_frontier -= variants
+            variants |= next_frontier
+            frontier = next_frontier
+        return variants
+
+    def lookup(self, word: str, max_distance: int) -> Optional[Tuple[str, int]]:
+        """
+        Eng yaqin kalit so'zni topish
+
+        Returns:
+            (kalit so'z, masofa) yoki None. Teng masofada indeksga birinchi
+            qo'shilgan so'z qaytariladi (chiziqli qidiruv bilan bir xil natija).
+        """
+        max_distance = min(max_distance, self.max_distance)
+
+        candidates: Set[int] = set()
+        for variant in self._variants(word, max_distance):
+            positions = self._deletes.get(variant)
+            if positions:
+                candidates |= positions
+
+        best = None
+        for position in sorted(candidates):
+            keyword = self._words[position]
+            if abs(len(keyword) - len(word)) > max_distance:
+                continue
+            dist = self._distance(word, keyword)
+            if dist <= max_distance and (best is None or dist < best[1]):
+                best = (keyword, dist)
+        return best
@@ -20,6 +20,7 @@ from features.smart import smart
 from features.keyboard import keyboard
 from features.app_scanner import app_scanner
 from core.database import db
+from core.dispatch import CommandRegistry, command_handler, ANY_ACTION
 import config
 
 
@@ -47,6 +48,32 @@ class Jarvis:
         
         # Taymer callback
         productivity.reminder_callback = self._on_reminder
+        
+        # Buyruqlar jadvali: (CommandType, action) -> handler (bir marta quriladi)
+        self._registry = self._build_registry()
+    
+    def _build_registry(self) -> CommandRegistry:
+        """Feature va Jarvis handlerlaridan dispetcher jadvalini qurish"""
+        registry = CommandRegistry(default=lambda command: "Kechirasiz, tushunmadim. Iltimos, qayta ayting.")
+        
+        # Feature'lar o'zlarini @command_handler orqali e'lon qiladi
+        # (ai_chat ro'yxatdan o'tmaydi - AI o'chirilgan, AI_CHAT ni Jarvis o'zi javoblaydi)
+        for feature in (general, system, web, media, productivity, smart, keyboard):
+            registry.register_object(feature)
+        registry.register_object(self)
+        
+        # Noma'lum action bo'lsa - feature'ning o'z javobi
+        fallbacks = (
+            (CommandType.GREETING, general), (CommandType.TIME_DATE, general),
+            (CommandType.WEATHER, web), (CommandType.SYSTEM, system),
+            (CommandType.REMINDER, productivity), (CommandType.MEDIA, media),
+            (CommandType.KEYBOARD, keyboard),
+        )
+        for command_type, feature in fallbacks:
+            registry.register(command_type, ANY_ACTION, lambda command, f=feature: f.execute(command.action, command.params))
+        registry.register(CommandType.SOCIAL, ANY_ACTION, lambda command: web.execute("social", command.params))
+        
+        return registry
     
     def _load_scanned_apps(self):
         """Skanerlangan dasturlarni yuklash (Bazadan va keshdan)"""
@@ -77,8 +104,8 @@ class Jarvis:
         # Hammasini bir joyga yig'ish
         all_detected = {**scanned_apps, **scanned_urls}
         
-        # Bazaga saqlash (Persistent)
-        db.save_apps(all_detected)
+        # Bazaga saqlash (Persistent) - faqat yangi yoki yo'li o'zgarganlar
+        db.save_apps(all_detected, only_changed=True)
         
         # JSON keshga ham saqlash (Zaxira)
         app_scanner.save_cache(all_detected)
@@ -198,6 +225,10 @@ class Jarvis:
         # Muxlisa orqali gapirish
         muxlisa.text_to_speech(text, on_done)
     
+    def stop_speaking(self) -> bool:
+        """Gapirishni to'xtatish (foydalanuvchi javobni bo'ldi - barge-in)"""
+        return muxlisa.stop_speaking(barge_in=True)
+    
     # Keshlamaslik kerak bo'lgan buyruq turlari (har safar yangi natija beradi)
     DYNAMIC_COMMAND_TYPES = {
         CommandType.SYSTEM, CommandType.SCREENSHOT, CommandType.TIME_DATE,
@@ -221,6 +252,14 @@ class Jarvis:
                 print(f"[Jarvis] Bazadan javob topildi: {text}")
                 return cached_answer
 
+            # Tushunilmagan savollar uchun internet/AI dan oldin o'xshash savolni qidirish
+            if command.type == CommandType.AI_CHAT:
+                similar = db.find_similar(text)
+                if similar:
+                    question, answer, score = similar
+                    print(f"[Jarvis] O'xshash savol topildi ({score:.2f}): {question}")
+                    return answer
+
         # 3. Buyruqni bajarish
         response = self._execute_command(command)
         
@@ -238,7 +277,7 @@ class Jarvis:
         # 5. Faqat statik javoblarni saqlash
         if command.type not in self.DYNAMIC_COMMAND_TYPES:
             if response and "tushunmadim" not in response and "xatolik" not in response and "ishlamayapti" not in response:
-                db.save_qa(text, response)
+                db.save_qa(text, response, command.type.value)
             
         return response
 
@@ -263,79 +302,32 @@ class Jarvis:
     
     def _execute_command(self, command: Command) -> str:
         """Buyruqni bajarish"""
-        
-        if command.type == CommandType.GREETING:
-            return general.execute(command.action, command.params)
-        
-        elif command.type == CommandType.TIME_DATE:
-            return general.execute(command.action, command.params)
-        
-        elif command.type == CommandType.EXIT:
-            name = "Alisa" if config.ALICE_MODE else config.JARVIS_NAME
-            return f"Xayr! {name} o'chmoqda."
-        
-        elif command.type == CommandType.WEATHER:
-            return web.execute(command.action, command.params)
-        
-        elif command.type == CommandType.APP_CONTROL:
-            return self._handle_app_control(command)
-        
-        elif command.type == CommandType.FILE_MANAGER:
-            return self._handle_file_manager(command)
-        
-        elif command.type == CommandType.WEB_SEARCH:
-            if command.action == "app_search":
-                return self._handle_app_search(command)
-            query = command.params.get("query", "")
-            engine = command.params.get("engine", "google")
-            if engine == "youtube":
-                return web.search_youtube(query)
-            elif engine == "wikipedia":
-                return web.search_wikipedia(query)
-            return web.search_google(query)
-        
-        elif command.type == CommandType.MATH:
-            return productivity.calculate(command.params.get("expression", ""))
-        
-        elif command.type == CommandType.SYSTEM:
-            return system.execute(command.action, command.params)
-        
-        elif command.type == CommandType.REMINDER:
-            return productivity.execute(command.action, command.params)
-        
-        elif command.type == CommandType.MEDIA:
-            if command.action == "youtube_music":
-                return web.execute("youtube_music", command.params)
-            return media.execute(command.action, command.params)
-        
-        elif command.type == CommandType.SCREENSHOT:
-            return self._take_screenshot()
-        
-        elif command.type == CommandType.SMART:
-            return self._handle_smart(command)
-        
-        elif command.type == CommandType.SOCIAL:
-            return web.execute("social", command.params)
-        
-        elif command.type == CommandType.DICTATION:
-            if command.action == "enable":
-                self.in_dictation_mode = True
-                return "Yozish rejimi yoqildi. Gapirganingiz yoziladi. To'xtatish uchun 'Stop' yoki 'To'xtat' deng."
-            return "Diktovka rejimi tushunarsiz."
-        
-        elif command.type == CommandType.KEYBOARD:
-            if command.action == "type_in_app":
-                return self._handle_type_in_app(command)
-            return keyboard.execute(command.action, command.params)
-        
-        elif command.type == CommandType.AI_CHAT:
-            # AI o'chirilgan - buyruqlarni o'zi aniqlaydi
-            msg = command.params.get("message", "")
-            return f"Kechirasiz, '{msg[:50]}...' buyrug'ini tushunmadim. Mavjud buyruqlar: dastur ochish/yopish, ovoz boshqaruvi, vaqt/sana, ob-havo."
-        
-        else:
-            return "Kechirasiz, tushunmadim. Iltimos, qayta ayting."
+        return self._registry.dispatch(command)
+    
+    @command_handler(CommandType.EXIT, ANY_ACTION, pass_command=True)
+    def _handle_exit(self, command: Command) -> str:
+        """Chiqish"""
+        name = "Alisa" if config.ALICE_MODE else config.JARVIS_NAME
+        return f"Xayr! {name} o'chmoqda."
+    
+    @command_handler(CommandType.DICTATION, "enable", pass_command=True)
+    def _handle_dictation(self, command: Command) -> str:
+        """Diktovka rejimini yoqish"""
+        self.in_dictation_mode = True
+        return "Yozish rejimi yoqildi. Gapirganingiz yoziladi. To'xtatish uchun 'Stop' yoki 'To'xtat' deng."
+    
+    @command_handler(CommandType.DICTATION, ANY_ACTION, pass_command=True)
+    def _handle_dictation_unknown(self, command: Command) -> str:
+        """Noma'lum diktovka buyrug'i"""
+        return "Diktovka rejimi tushunarsiz."
     
+    @command_handler(CommandType.AI_CHAT, ANY_ACTION, pass_command=True)
+    def _handle_ai_chat(self, command: Command) -> str:
+        """AI o'chirilgan - buyruqlarni o'zi aniqlaydi"""
+        msg = command.params.get("message", "")
+        return f"Kechirasiz, '{msg[:50]}...' buyrug'ini tushunmadim. Mavjud buyruqlar: dastur ochish/yopish, ovoz boshqaruvi, vaqt/sana, ob-havo."
+    
+    @command_handler(CommandType.KEYBOARD, "type_in_app", pass_command=True)
     def _handle_type_in_app(self, command: Command) -> str:
         """Dastur ichida yozish"""
         app = command.params.get("app", "")
@@ -355,66 +347,47 @@ class Jarvis:
             res = keyboard.execute("type", {"text": text})
             return f"Kechirasiz, '{app}' oynasini topa olmadim, lekin yozishga harakat qildim."
 
-    def _handle_smart(self, command: Command) -> str:
-        """Smart buyruqlarni bajarish"""
-        action = command.action
+    @command_handler(CommandType.SMART, "translate", pass_command=True)
+    def _handle_translate(self, command: Command) -> str:
+        """Tarjima (matnni buyruqdan ajratib olish)"""
+        import re
         text = command.original_text
-        
-        if action == "joke":
-            return smart.tell_joke()
-        elif action == "motivation":
-            return smart.motivate()
-        elif action == "fact":
-            return smart.tell_fact()
-        elif action == "coin":
-            return smart.flip_coin()
-        elif action == "dice":
-            return smart.roll_dice()
-        elif action == "random":
-            return smart.get_random_number()
-        elif action == "day_info":
-            return smart.get_day_info()
-        elif action == "ip":
-            return smart.get_ip_info()
-        elif action == "password":
-            return smart.generate_password()
-        elif action == "translate":
-            # Matnni ajratib olish
-            import re
-            translate_text = text
+        translate_text = text
+        target_lang = "en"
+        if "ruscha" in text.lower() or "rus" in text.lower():
+            target_lang = "ru"
+        elif "inglizcha" in text.lower() or "english" in text.lower():
             target_lang = "en"
-            if "ruscha" in text.lower() or "rus" in text.lower():
-                target_lang = "ru"
-            elif "inglizcha" in text.lower() or "english" in text.lower():
-                target_lang = "en"
-            elif "uzbek" in text.lower() or "o'zbek" in text.lower():
-                target_lang = "uz"
-            # "tarjima qil: matn" yoki "matn tarjima qil" formatini aniqlash
-            clean = re.sub(r'(tarjima\s*(qil|etib|et)|translate|inglizcha|ruscha|o\'zbekcha)', '', text, flags=re.IGNORECASE).strip()
-            clean = clean.strip(':').strip()
-            if clean:
-                return smart.translate_simple(clean, target_lang)
-            return "Nima tarjima qilishni ayting. Masalan: 'Salom tarjima qil'"
-        elif action == "disk":
-            return smart.get_disk_space()
-        elif action == "uptime":
-            return smart.system_uptime()
-        elif action == "running_apps":
-            return smart.list_running_apps()
-        elif action == "timer":
-            import re
-            nums = re.findall(r'(\d+)', text)
-            seconds = 60  # default 1 daqiqa
-            if nums:
-                val = int(nums[0])
-                if "daqiqa" in text.lower() or "minut" in text.lower():
-                    seconds = val * 60
-                else:
-                    seconds = val
-            return smart.start_timer(seconds)
-        else:
-            return "Bu buyruqni tushunmadim. Mavjud: hazil, fakt, tarjima, parol, disk, dasturlar ro'yxati."
+        elif "uzbek" in text.lower() or "o'zbek" in text.lower():
+            target_lang = "uz"
+        # "tarjima qil: matn" yoki "matn tarjima qil" formatini aniqlash
+        clean = re.sub(r'(tarjima\s*(qil|etib|et)|translate|inglizcha|ruscha|o\'zbekcha)', '', text, flags=re.IGNORECASE).strip()
+        clean = clean.strip(':').strip()
+        if clean:
+            return smart.translate_simple(clean, target_lang)
+        return "Nima tarjima qilishni ayting. Masalan: 'Salom tarjima qil'"
+    
+    @command_handler(CommandType.SMART, "timer", pass_command=True)
+    def _handle_timer(self, command: Command) -> str:
+        """Taymer (soniya yoki daqiqa)"""
+        import re
+        text = command.original_text
+        nums = re.findall(r'(\d+)', text)
+        seconds = 60  # default 1 daqiqa
+        if nums:
+            val = int(nums[0])
+            if "daqiqa" in text.lower() or "minut" in text.lower():
+                seconds = val * 60
+            else:
+                seconds = val
+        return smart.start_timer(seconds)
+    
+    @command_handler(CommandType.SMART, ANY_ACTION, pass_command=True)
+    def _handle_smart_unknown(self, command: Command) -> str:
+        """Noma'lum smart buyruq"""
+        return "Bu buyruqni tushunmadim. Mavjud: hazil, fakt, tarjima, parol, disk, dasturlar ro'yxati."
     
+    @command_handler(CommandType.WEB_SEARCH, "app_search", pass_command=True)
     def _handle_app_search(self, command: Command) -> str:
         """Dastur ichidan qidirish"""
         app = command.params.get("app", "").lower().strip()
@@ -462,6 +435,7 @@ class Jarvis:
                 
         return cleaned.strip()
 
+    @command_handler(CommandType.APP_CONTROL, ANY_ACTION, pass_command=True)
     def _handle_app_control(self, command: Command) -> str:
         """Dasturlarni boshqarish"""
         import difflib
@@ -651,6 +625,7 @@ class Jarvis:
         
         return "Kechirasiz, bu buyruqni bajara olmadim."
     
+    @command_handler(CommandType.FILE_MANAGER, ANY_ACTION, pass_command=True)
     def _handle_file_manager(self, command: Command) -> str:
         """Fayl va papkalarni boshqarish"""
         folder = command.params.get("folder")
@@ -669,6 +644,7 @@ class Jarvis:
             os.startfile(os.path.expanduser("~"))
             return "Fayl menejeri ochilmoqda."
     
+    @command_handler(CommandType.SCREENSHOT, ANY_ACTION)
     def _take_screenshot(self) -> str:
         """Ekran suratini olish"""
         try:
@@ -0,0 +1,65 @@
+"""
+Kalit so'zlar skaneri (Aho-Corasick)
+Matndan bir marta o'tib, unda uchragan barcha kalit so'zlarni topadi
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Set
+
+
+class KeywordScanner:
+    """Ko'p kalit so'zli substring qidiruv avtomati (Aho-Corasick)"""
+
+    def __init__(self, keywords: Iterable[str]):
+        # Har bir holat: o'tishlar, failure link va shu holatda tugaydigan kalit so'zlar
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Set[str]] = [set()]
+        self.keywords: Set[str] = set()
+
+        for keyword in keywords:
+            self._add(keyword)
+        self._build_links()
+
+    def _add(self, keyword: str):
+        """Kalit so'zni trie ga qo'shish"""
+        if not keyword or keyword in self.keywords:
+            return
+        self.keywords.add(keyword)
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(set())
+            state = next_state
+        self._output[state].add(keyword)
+
+    def _build_links(self):
+        """Failure linklarni BFS orqali hisoblash"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] |= self._output[self._fail[next_state]]
+
+    def scan(self, text: str) -> Set[str]:
+        """Matnda uchragan barcha kalit so'zlar to'plami (substring ma'nosida)"""
+        hits: Set[str] = set()
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                hits |= output[state]
+        return hits
@@ -0,0 +1,285 @@
+"""
+Offline kalit so'z aniqlagich (wake word spotter)
+MFCC belgilari + DTW: yozuv foydalanuvchi namunalari (shablonlar) bilan solishtiriladi.
+Faqat "Jarvis" ga o'xshagan yozuvlar bulutli STT ga yuboriladi - qolganlari lokal rad etiladi.
+"""
+
+import os
+import threading
+import time
+import wave
+from typing import Dict, List, Optional
+
+import numpy as np
+
+import config
+
+SAMPLE_RATE = 16000
+FRAME_LEN = 400  # 25 ms
+HOP_LEN = 160  # 10 ms
+N_FFT = 512
+N_MELS = 26
+N_CEPS = 12  # c0 (umumiy energiya) tashlanadi - ovoz balandligiga bog'liq bo'lmasligi uchun
+TRIM_DB = 30.0  # Shablon: eng baland kadrdan shuncha pastdagi chekka kadrlar kesiladi
+
+
+def _mel_filterbank(rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Uchburchak mel filtrlar (N_MELS x N_FFT//2+1)"""
+    def to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def to_hz(mel):
+        return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+    points = to_hz(np.linspace(to_mel(20.0), to_mel(rate / 2), N_MELS + 2))
+    bins = np.floor((N_FFT + 1) * points / rate).astype(int)
+    bank = np.zeros((N_MELS, N_FFT // 2 + 1), dtype=np.float32)
+    for i in range(N_MELS):
+        left, center, right = bins[i], bins[i + 1], bins[i + 2]
+        if center > left:
+            bank[i, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            bank[i, center:right] = (right - np.arange(center, right)) / (right - center)
+    return bank
+
+
+_MEL_BANK = _mel_filterbank()
+_WINDOW = np.hamming(FRAME_LEN).astype(np.float32)
+# DCT-II matritsasi (faqat c1..c12)
+_DCT = np.cos(np.pi / N_MELS * (np.arange(N_MELS) + 0.5)[None, :] * np.arange(1, N_CEPS + 1)[:, None]).astype(np.float32)
+
+
+def mfcc(samples: np.ndarray, trim: bool = False) -> np.ndarray:
+    """
+    16 kHz int16 signal -> MFCC kadrlari (kadrlar x N_CEPS), o'rtachasi ayirilgan (CMN)
+
+    Args:
+        trim: Boshidagi va oxiridagi jim kadrlarni kesish (shablonlar uchun)
+    """
+    signal = samples.astype(np.float32) / 32768.0
+    if len(signal) < FRAME_LEN:
+        return np.zeros((0, N_CEPS), dtype=np.float32)
+    signal = np.append(signal[0], signal[1:] - 0.97 * signal[:-1])
+
+    count = 1 + (len(signal) - FRAME_LEN) // HOP_LEN
+    index = np.arange(FRAME_LEN)[None, :] + HOP_LEN * np.arange(count)[:, None]
+    frames = signal[index] * _WINDOW
+    power = np.abs(np.fft.rfft(frames, N_FFT)) ** 2 / N_FFT
+    mel = np.log(np.maximum(power @ _MEL_BANK.T, 1e-10))
+
+    if trim:
+        energy = 10.0 * np.log10(np.maximum(power.sum(axis=1), 1e-12))
+        loud = np.flatnonzero(energy > energy.max() - TRIM_DB)
+        mel = mel[loud[0]:loud[-1] + 1]
+
+    ceps = mel @ _DCT.T
+    return ceps - ceps.mean(axis=0)
+
+
+def subsequence_dtw(template: np.ndarray, clip: np.ndarray) -> float:
+    """
+    Shablonning yozuv ichidagi eng yaxshi mosligi (boshi va oxiri erkin)
+
+    Qadamlar: (1,0), (1,1), (1,2) - har qatorda shablon bir kadrga siljiydi, shuning uchun
+    yo'l uzunligi doim shablon uzunligiga teng va qator bo'yicha vektorlashtiriladi.
+    Yozuv qismi shablondan 2 martagacha uzun bo'lishi mumkin.
+
+    Returns:
+        Kadr boshiga o'rtacha masofa (kichikroq - o'xshashroq)
+    """
+    if len(template) == 0 or len(clip) == 0:
+        return float("inf")
+    cost = np.sqrt(((template[:, None, :] - clip[None, :, :]) ** 2).sum(axis=2))
+    row = cost[0].copy()
+    for i in range(1, len(template)):
+        best = row.copy()
+        best[1:] = np.minimum(best[1:], row[:-1])
+        best[2:] = np.minimum(best[2:], row[:-2])
+        row = cost[i] + best
+    return float(row.min() / len(template))
+
+
+class KeywordSpotter:
+    """Shablonlar bo'yicha lokal kalit so'z tekshiruvi va tejalgan so'rovlar statistikasi"""
+
+    def __init__(self, directory: Optional[str] = None,
+                 threshold: float = config.WAKE_SPOTTER_THRESHOLD,
+                 margin: float = config.WAKE_SPOTTER_MARGIN,
+                 min_templates: int = config.WAKE_TEMPLATES_MIN,
+                 max_templates: int = config.WAKE_TEMPLATES_MAX,
+                 calls_per_clip: int = 1):
+        """
+        Args:
+            directory: Shablon WAV fayllari papkasi (data/wake_templates)
+            threshold: Masofa chegarasining pastki qiymati
+            margin: Shablonlar o'zaro eng yaqin masofalarining medianasiga ko'paytiriladi - chegara
+                foydalanuvchi ovoziga moslashadi (threshold dan past tushmaydi)
+            min_templates: Shundan kam shablon bo'lsa filtr hamma yozuvni o'tkazadi
+                (bitta namunadan chegarani baholab bo'lmaydi)
+            max_templates: Saqlanadigan shablonlar soni (eng eskisi almashtiriladi)
+            calls_per_clip: Rad etilgan bitta yozuv tejaydigan bulutli so'rovlar (eng ko'pi)
+        """
+        self.directory = directory or os.path.join(os.path.dirname(__file__), "..", "data", "wake_templates")
+        self.base_threshold = threshold
+        self.margin = margin
+        self.min_templates = min_templates
+        self.max_templates = max_templates
+        self.calls_per_clip = calls_per_clip
+        self.threshold = threshold
+
+        self._lock = threading.Lock()
+        self._templates: List[np.ndarray] = []
+        self._paths: List[str] = []
+        self.clips = 0
+        self.rejected = 0
+        self.cpu_seconds = 0.0
+        self.audio_seconds = 0.0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+        self._load()
+
+    @property
+    def ready(self) -> bool:
+        """Shablonlar yetarlimi (yo'q bo'lsa hamma yozuv bulutga o'tkaziladi)"""
+        return len(self._templates) >= self.min_templates
+
+    @property
+    def needs_templates(self) -> bool:
+        """Yangi namunalarga joy bormi (tasdiqlangan wake word lar avtomatik qo'shiladi)"""
+        return len(self._templates) < self.max_templates
+
+    def _load(self):
+        """Saqlangan shablonlarni yuklash"""
+        if not os.path.isdir(self.directory):
+            return
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(".wav"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                with wave.open(path, "rb") as wf:
+                    samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+            except (OSError, wave.Error, EOFError) as e:
+                print(f"[Spotter] Shablon o'qilmadi ({name}): {e}")
+                continue
+            features = mfcc(samples, trim=True)
+            if len(features):
+                self._templates.append(features)
+                self._paths.append(path)
+        self._templates = self._templates[-self.max_templates:]
+        self._paths = self._paths[-self.max_templates:]
+        self._calibrate()
+        if self._templates:
+            print(f"[Spotter] {len(self._templates)} ta shablon yuklandi (chegara {self.threshold:.2f})")
+
+    def _calibrate(self):
+        """Chegarani shablonlarning o'zaro eng yaqin masofalari bo'yicha moslash (_lock ichida)"""
+        if len(self._templates) < 2:
+            self.threshold = self.base_threshold
+            return
+        nearest = []
+        for i, template in enumerate(self._templates):
+            nearest.append(min(subsequence_dtw(template, other)
+                               for j, other in enumerate(self._templates) if j != i))
+        # Median: bitta noodatiy shablon chegarani haddan tashqari bo'shatib yubormasligi uchun
+        self.threshold = max(self.base_threshold, self.margin * float(np.median(nearest)))
+
+    @staticmethod
+    def _samples(pcm: bytes, sample_rate: int) -> np.ndarray:
+        """PCM baytlari (16-bit mono) -> 16 kHz namunalar"""
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        if sample_rate != SAMPLE_RATE and len(samples):
+            positions = np.arange(0, len(samples), sample_rate / SAMPLE_RATE)
+            samples = np.interp(positions, np.arange(len(samples)), samples).astype(np.int16)
+        return samples
+
+    def score(self, pcm: bytes, sample_rate: int = SAMPLE_RATE) -> float:
+        """Eng yaqin shablongacha masofa (shablon bo'lmasa - 0)"""
+        samples = self._samples(pcm, sample_rate)
+        with self._lock:
+            templates = list(self._templates)
+        if not templates:
+            return 0.0
+        features = mfcc(samples)
+        return min(subsequence_dtw(template, features) for template in templates)
+
+    def check(self, pcm: bytes, sample_rate: int = SAMPLE_RATE) -> bool:
+        """
+        Yozuv wake word bo'lishi mumkinmi (True - bulutli STT da tekshirish kerak)
+
+        Shablonlar hali yetarli bo'lmasa doim True - avvalgi xatti-harakat saqlanadi.
+        """
+        if not self.ready:
+            return True
+        start, cpu_start = time.perf_counter(), time.process_time()
+        distance = self.score(pcm, sample_rate)
+        elapsed, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+        likely = distance <= self.threshold
+
+        with self._lock:
+            self.clips += 1
+            self.rejected += 0 if likely else 1
+            self.cpu_seconds += cpu
+            self.audio_seconds += len(pcm) / 2 / sample_rate
+            self.latency_total += elapsed
+            self.latency_max = max(self.latency_max, elapsed)
+        if likely:
+            print(f"[Spotter] Ehtimoliy wake word (masofa {distance:.2f} <= {self.threshold:.2f}, {elapsed * 1000:.0f} ms)")
+        return likely
+
+    def enroll(self, pcm: bytes, sample_rate: int = SAMPLE_RATE, save: bool = True) -> bool:
+        """
+        Yangi shablon qo'shish (foydalanuvchi "Jarvis" deb aytgan yozuv)
+
+        Returns:
+            False - yozuvda ovoz topilmadi
+        """
+        samples = self._samples(pcm, sample_rate)
+        features = mfcc(samples, trim=True)
+        if len(features) < 10:
+            return False
+
+        path = None
+        if save:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                path = os.path.join(self.directory, f"{time.time_ns()}.wav")
+                with wave.open(path, "wb") as wf:
+                    wf.setnchannels(1)
+                    wf.setsampwidth(2)
+                    wf.setframerate(SAMPLE_RATE)
+                    wf.writeframes(samples.tobytes())
+            except (OSError, wave.Error) as e:
+                print(f"[Spotter] Shablon saqlanmadi: {e}")
+                path = None
+
+        with self._lock:
+            self._templates.append(features)
+            self._paths.append(path)
+            while len(self._templates) > self.max_templates:
+                self._templates.pop(0)
+                old_path = self._paths.pop(0)
+                if old_path:
+                    try:
+                        os.unlink(old_path)
+                    except OSError:
+                        pass
+            self._calibrate()
+            count, threshold = len(self._templates), self.threshold
+        print(f"[Spotter] Shablon qo'shildi ({count} ta, chegara {threshold:.2f})")
+        return True
+
+    def stats(self) -> Dict[str, float]:
+        """CPU yuklamasi, kechikish va tejalgan so'rovlar"""
+        with self._lock:
+            return {
+                "templates": len(self._templates),
+                "threshold": self.threshold,
+                "clips": self.clips,
+                "rejected": self.rejected,
+                "calls_avoided": self.rejected * self.calls_per_clip,
+                "cpu_percent": 100.0 * self.cpu_seconds / self.audio_seconds if self.audio_seconds else 0.0,
+                "latency_ms_avg": 1000.0 * self.latency_total / self.clips if self.clips else 0.0,
+                "latency_ms_max": 1000.0 * self.latency_max,
+            }
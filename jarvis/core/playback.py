@@ -0,0 +1,285 @@
+"""
+Ovoz ijrosi menejeri
+Barcha TTS audiolari bitta navbat va bitta oqim orqali ijro etiladi:
+gaplar bir-biriga aralashmaydi, stop() va barge_in() ijroni darhol to'xtatadi
+"""
+
+import io
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Sequence, Union
+
+import pygame
+
+import config
+
+# Mixer hodisalari: bo'lak tugadi (set_endevent) va stop() ijro oqimini uyg'otishi
+MUSIC_END_EVENT = pygame.USEREVENT + 1
+WAKE_EVENT = pygame.USEREVENT + 2
+# To'xtatilganda fadeout tugashini kutishning yuqori chegarasi (soniya)
+MAX_FADE_WAIT = 0.5
+# Hodisalar tizimi ishlamasa (video qism tizimi yo'q) - get_busy() tekshirish oralig'i
+POLL_INTERVAL = 0.05
+
+AudioPart = Union[bytes, "Future[bytes]"]
+
+
+class Utterance:
+    """Navbatdagi bitta javob: tartib bilan ijro etiladigan audio bo'laklari"""
+
+    def __init__(self, parts: Sequence[AudioPart], generation: int,
+                 callback: Optional[Callable] = None,
+                 on_start: Optional[Callable] = None,
+                 on_error: Optional[Callable[[int, Exception], None]] = None):
+        self.parts: List[AudioPart] = list(parts)
+        self.generation = generation
+        self.callback = callback
+        self.on_start = on_start
+        self.on_error = on_error
+        self.interrupted = False
+
+    def cancel_pending(self):
+        """Hali sintez qilinmagan bo'laklarni bekor qilish (TTS worker ularni o'tkazib yuboradi)"""
+        for part in self.parts:
+            if isinstance(part, Future):
+                part.cancel()
+
+
+class PlaybackManager:
+    """Navbatli ijro: bitta oqim, to'xtatish va foydalanuvchi gapirganda uzish (barge-in)"""
+
+    def __init__(self):
+        self._queue: "queue.Queue[Utterance]" = queue.Queue()
+        self._generation = 0
+        self._lock = threading.Lock()
+        # stop() va sintez tugashi (Future callback) ijro oqimini shu signal bilan uyg'otadi
+        self._signal = threading.Event()
+        self._end_events = False
+        self._thread: Optional[threading.Thread] = None
+        self._current: Optional[Utterance] = None
+        self.barge_ins = 0
+
+    @property
+    def is_playing(self) -> bool:
+        """Hozir ijro etilayotgan yoki navbatda kutayotgan javob bormi"""
+        return self._current is not None or not self._queue.empty()
+
+    def play(self, parts: Sequence[AudioPart], callback: Optional[Callable] = None,
+             on_start: Optional[Callable] = None,
+             on_error: Optional[Callable[[int, Exception], None]] = None) -> Utterance:
+        """
+        Javobni navbatga qo'yish
+
+        Args:
+            parts: Audio bo'laklari - tayyor baytlar yoki TTS worker Future lari
+            callback: Javob tugaganda yoki to'xtatilganda chaqiriladi
+            on_start: Birinchi bo'lak ijro boshlanganda
+            on_error: Bo'lak sintezi xato bo'lsa (indeks, xato); berilsa callback ni o'zi chaqirishi kerak
+        """
+        with self._lock:
+            utterance = Utterance(parts, self._generation, callback, on_start, on_error)
+            self._ensure_thread()
+            self._queue.put(utterance)
+        return utterance
+
+    def stop(self, fade_ms: int = 0) -> bool:
+        """
+        Joriy va navbatdagi barcha ijroni to'xtatish
+
+        Returns:
+            True - nimadir ijro etilayotgan yoki kutayotgan edi
+        """
+        with self._lock:
+            was_playing = self.is_playing
+            self._generation += 1
+            dropped = []
+            while True:
+                try:
+                    dropped.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._signal.set()
+        self._post(WAKE_EVENT)
+        try:
+            if fade_ms:
+                pygame.mixer.music.fadeout(fade_ms)
+            else:
+                pygame.mixer.music.stop()
+        except Exception as e:
+            print(f"[Playback] To'xtatishda xato: {e}")
+
+        for utterance in dropped:
+            self._finish(utterance, interrupted=True)
+        return was_playing
+
+    def barge_in(self, fade_ms: int = 150) -> bool:
+        """Foydalanuvchi gapira boshladi - ovozni tez so'ndirib, qolgan javoblarni bekor qilish"""
+        interrupted = self.stop(fade_ms)
+        if interrupted:
+            self.barge_ins += 1
+            print("[Playback] Barge-in: javob to'xtatildi")
+        return interrupted
+
+    def _ensure_thread(self):
+        """Ijro oqimini kerak bo'lganda ishga tushirish (_lock ichida)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="JarvisPlayback", daemon=True)
+            self._thread.start()
+
+    def _init_end_events(self):
+        """
+        Bo'lak tugashini mixer hodisasi orqali bilish (ijro oqimida, bir marta)
+
+        pygame hodisalar navbati display moduli bilan ishlaydi (oyna ochilmaydi). U ishga
+        tushmasa (masalan video qurilmasiz server) - get_busy() tekshiruviga qaytiladi.
+        """
+        try:
+            if not pygame.display.get_init():
+                pygame.display.init()
+            pygame.event.set_blocked(None)
+            pygame.event.set_allowed([MUSIC_END_EVENT, WAKE_EVENT])
+            pygame.mixer.music.set_endevent(MUSIC_END_EVENT)
+            self._end_events = True
+        except Exception as e:
+            self._end_events = False
+            print(f"[Playback] Mixer hodisalari yo'q, holat tekshiruvi ishlatiladi: {e}")
+
+    def _post(self, event_type: int):
+        """Ijro oqimi kutayotgan hodisalar navbatiga signal"""
+        if self._end_events:
+            try:
+                pygame.event.post(pygame.event.Event(event_type))
+            except Exception:
+                pass
+
+    def _run(self):
+        """Navbatdagi javoblarni ketma-ket ijro etish (bo'sh navbatda bloklanib kutadi)"""
+        self._init_end_events()
+        while True:
+            utterance = self._queue.get()
+            self._current = utterance
+            try:
+                self._play_utterance(utterance)
+            except Exception as e:
+                print(f"[Playback] Xato: {e}")
+                self._finish(utterance, interrupted=True)
+            finally:
+                self._current = None
+
+    def _stale(self, utterance: Utterance) -> bool:
+        """Javob stop() dan oldin navbatga qo'yilganmi"""
+        return utterance.generation != self._generation
+
+    def _wait(self, utterance: Utterance, part: "Future[bytes]") -> bool:
+        """
+        Bo'lak sintezi tugashini kutish (Future callback yoki stop() uyg'otadi)
+
+        Returns:
+            False - kutish davomida javob to'xtatildi
+        """
+        part.add_done_callback(lambda _: self._signal.set())
+        while True:
+            if self._stale(utterance):
+                return False
+            if part.done():
+                return True
+            self._signal.wait()
+            self._signal.clear()
+
+    def _wait_music_end(self, utterance: Utterance) -> bool:
+        """
+        Joriy bo'lak tugashini kutish
+
+        Returns:
+            False - ijro to'xtatildi (fadeout tugaguncha yoki MAX_FADE_WAIT kutiladi)
+        """
+        deadline = None
+        while True:
+            if deadline is None and self._stale(utterance):
+                # barge_in fadeout qilgan bo'lsa - so'nishini kutamiz (unload ovozni keskin uzadi)
+                deadline = time.monotonic() + MAX_FADE_WAIT
+            if self._end_events:
+                if deadline is None:
+                    event = pygame.event.wait()
+                else:
+                    event = pygame.event.wait(max(1, int((deadline - time.monotonic()) * 1000)))
+                ended = event.type == MUSIC_END_EVENT
+            else:
+                time.sleep(POLL_INTERVAL)
+                ended = not pygame.mixer.music.get_busy()
+            if ended:
+                return deadline is None and not self._stale(utterance)
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+    def _play_utterance(self, utterance: Utterance):
+        """Bitta javob bo'laklarini tartib bilan ijro etish"""
+        for index, part in enumerate(utterance.parts):
+            if isinstance(part, Future):
+                if not self._wait(utterance, part):
+                    self._finish(utterance, interrupted=True)
+                    return
+                try:
+                    audio_bytes = part.result()
+                except Exception as e:
+                    utterance.cancel_pending()
+                    if utterance.on_error:
+                        utterance.on_error(index, e)
+                    else:
+                        print(f"[Playback] Audio olinmadi: {e}")
+                        self._finish(utterance, interrupted=True)
+                    return
+            else:
+                audio_bytes = part
+
+            if self._stale(utterance):
+                self._finish(utterance, interrupted=True)
+                return
+            if index == 0 and utterance.on_start:
+                utterance.on_start()
+            if not self._play_part(utterance, audio_bytes):
+                self._finish(utterance, interrupted=True)
+                return
+
+        self._finish(utterance, interrupted=False)
+
+    def _play_part(self, utterance: Utterance, audio_bytes: bytes, namehint: str = "mp3") -> bool:
+        """Xotiradagi audioni ijro etish (diskka yozilmaydi)"""
+        stream = io.BytesIO(audio_bytes)
+        try:
+            pygame.mixer.music.load(stream, namehint)
+            pygame.mixer.music.set_volume(config.VOICE_VOLUME)
+            if self._end_events:
+                # Oldingi bo'lak yoki bo'sh stop() dan qolgan tugash hodisalari
+                pygame.event.clear([MUSIC_END_EVENT, WAKE_EVENT])
+            if self._stale(utterance):
+                return False
+            pygame.mixer.music.play()
+            return self._wait_music_end(utterance)
+        except Exception as e:
+            print(f"[Audio] Xato: {e}")
+            return not self._stale(utterance)
+        finally:
+            try:
+                # Mixer oqimga havolani ushlab turmasligi uchun
+                pygame.mixer.music.unload()
+            except Exception:
+                pass
+            stream.close()
+
+    def _finish(self, utterance: Utterance, interrupted: bool):
+        """Javobni yakunlash: bekor qilingan sintezlar va callback"""
+        utterance.interrupted = interrupted
+        if interrupted:
+            utterance.cancel_pending()
+        if utterance.callback:
+            try:
+                utterance.callback()
+            except Exception as e:
+                print(f"[Playback] Callback xatosi: {e}")
+
+
+# Global instance
+playback = PlaybackManager()
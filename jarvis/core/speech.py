@@ -4,28 +4,42 @@ O'zbekcha Speech Engine
 - TTS: AiVOOV (Sardor - O'zbek erkak ovozi)
 """
 
-import os
 import re
 import io
 import wave
 import base64
-import tempfile
 import threading
-from typing import Optional, Callable
+import time
+from typing import Optional, Callable, List
 import requests
 import pygame
 from openai import OpenAI
 import google.generativeai as genai
-import asyncio
-import edge_tts
-import threading
 
 import config
+from core.tts_worker import tts_worker, PRIORITY_NORMAL
+from core.playback import playback
+from core.stt import MultiLanguageRecognizer
+from core.vad import vad, PhraseSegmenter
+from core.audio_codec import audio_encoder
+from core.audio_buffer import AudioRingBuffer
+from core.capture import capture
+
+# Gap chegaralari (tinish belgisidan keyingi bo'shliq yoki yangi qator)
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?…])\s+|\n+')
+# Bundan qisqa bo'laklar keyingisiga qo'shiladi (har bir bo'lak - alohida TTS so'rovi)
+MIN_SENTENCE_CHARS = 25
 
 
 class SpeechEngine:
     """O'zbekcha ovoz aniqlash va gapirish (Gemini/OpenAI + gTTS)"""
     
+    # listen_auto: bitta gapning maksimal davomiyligi, gap tugadi deb hisoblanadigan pauza
+    # va nutq boshlanishini kutish (soniya)
+    PHRASE_TIME_LIMIT = 12
+    PAUSE_THRESHOLD = 0.8
+    LISTEN_TIMEOUT = 5
+    
     def __init__(self):
         # Gemini Client
         if config.AI_PROVIDER == "gemini":
@@ -40,6 +54,16 @@ class SpeechEngine:
         self.aivoov_tts_url = config.AIVOOV_TTS_URL
         self.aivoov_voice_id = config.AIVOOV_VOICE_ID
         
+        # Google STT: tillar parallel so'raladi (ustuvorlik - ro'yxat tartibi)
+        self.stt = MultiLanguageRecognizer(config.STT_LANGUAGES, config.STT_MIN_CONFIDENCE)
+        
+        # listen_auto: umumiy mikrofon oqimi; shovqin darajasi iboralar orasida saqlanadi
+        self._segmenter = PhraseSegmenter(pause_seconds=self.PAUSE_THRESHOLD, max_seconds=self.PHRASE_TIME_LIMIT,
+                                          pre_seconds=0.3)
+        
+        # TTS o'lchovlari: birinchi audio paydo bo'lguncha va butun matn tugaguncha (ms)
+        self.tts_metrics = {}
+        
         # Pygame mixer
         pygame.mixer.init()
         print("[Speech Engine] OpenAI stack tayyor")
@@ -47,32 +71,33 @@ class SpeechEngine:
     def listen_auto(self) -> Optional[bytes]:
         """
         Silence aniqlanguncha tinglash va audio ma'lumotni qaytarish
-        Pro hearing: Dynamic threshold va noise filtration
+        Umumiy mikrofon oqimidan o'qiladi: qurilma qayta ochilmaydi va kalibrovka kerak emas
+        (shovqin darajasi oqim davomida kuzatiladi). Wake word dan keyin chaqirilsa -
+        yozuv wake word iborasi tugagan joydan, bufer orqali uzilishsiz davom etadi.
         """
+        segmenter = self._segmenter
+        segmenter.reset()
+        # Shovqin darajasi oxirgi soniyalardan (wake word bilan birga) - buyruq darhol boshlansa ham
+        segmenter.calibrate(capture.recent(capture.history_seconds))
         try:
-            import speech_recognition as sr
-            recognizer = sr.Recognizer()
-            
-            # Pro Parameters
-            recognizer.energy_threshold = 300
-            recognizer.dynamic_energy_threshold = True
-            recognizer.dynamic_energy_adjustment_damping = 0.15
-            recognizer.dynamic_energy_ratio = 1.5
-            recognizer.pause_threshold = 0.8  # Gapni tugatganini kutish
-            recognizer.non_speaking_duration = 0.5
-            
-            with sr.Microphone() as source:
-                print(f"[Speech Engine] Pro Hearing faol. Mik: {source.device_index}")
-                # Shovqinni agressivroq o'lchash
-                recognizer.adjust_for_ambient_noise(source, duration=0.8)
-                print(f"[Speech Engine] Shovqin darajasi: {int(recognizer.energy_threshold)}")
-                
-                try:
-                    # Timeouts
-                    audio = recognizer.listen(source, timeout=5, phrase_time_limit=12)
-                    return audio.get_wav_data()
-                except sr.WaitTimeoutError:
-                    return None
+            with capture.subscribe(capture.take_mark()) as source:
+                deadline = source.time + self.LISTEN_TIMEOUT
+                while True:
+                    block = source.read()
+                    if not block:
+                        return None
+                    phrase = segmenter.feed(block, source.time)
+                    if phrase:
+                        buffer = io.BytesIO()
+                        with wave.open(buffer, 'wb') as wf:
+                            wf.setnchannels(1)
+                            wf.setsampwidth(source.sample_width)
+                            wf.setframerate(phrase.sample_rate)
+                            wf.writeframes(phrase.pcm)
+                        return buffer.getvalue()
+                    if not segmenter.in_phrase and source.time > deadline:
+                        # Timeout: nutq boshlanmadi
+                        return None
         except Exception as e:
             print(f"[Speech Engine] Pro-listen xato: {e}")
             return None
@@ -84,40 +109,59 @@ class SpeechEngine:
         if not audio_data:
             return None
         
+        # 0. Sukunatni kesish; nutq bo'lmasa STT ga umuman yuborilmaydi
+        audio_data = vad.process(audio_data, noise_floor=self._segmenter.noise_floor)
+        if not audio_data:
+            return None
+        
+        flac_data = None
+        
         # 1. Google Speech Recognition (Asosiy - bepul va ishonchli)
         try:
             import speech_recognition as sr
             recognizer = sr.Recognizer()
+            # Kerak bo'lmay qolgan til so'rovlari ishchini uzoq band qilmasligi uchun
+            recognizer.operation_timeout = self.stt.timeout
             audio_file = io.BytesIO(audio_data)
             
             with sr.AudioFile(audio_file) as source:
                 audio = recognizer.record(source)
             
-            # Ketma-ket tekshirish: Uz -> En -> Ru
-            for lang in ["uz-UZ", "en-US", "ru-RU"]:
-                try:
-                    text = recognizer.recognize_google(audio, language=lang)
-                    print(f"[Google STT] {lang}: {text}")
-                    return text
-                except sr.UnknownValueError:
-                    continue
+            # recognize_google har bir til uchun FLAC ni qaytadan kodlaydi (flac jarayoni) -
+            # bir marta xotirada kodlab, barcha so'rovlarga tayyorini beramiz
+            flac_data = audio_encoder.to_flac(audio_data, fallback=audio.get_flac_data)
+            if flac_data and audio.sample_width == 2 and audio.sample_rate >= 8000:
+                audio.get_flac_data = lambda convert_rate=None, convert_width=None: flac_data
+            
+            def recognize(lang):
+                # show_all: nutq topilmasa [] qaytadi, aks holda muqobillar va ishonch
+                result = recognizer.recognize_google(audio, language=lang, show_all=True)
+                if not result or not result.get("alternative"):
+                    return None
+                best = result["alternative"][0]
+                return best.get("transcript"), best.get("confidence")
+            
+            # Parallel tekshirish: Uz, En, Ru - ishonchli natijalar orasida Uz > En > Ru
+            recognition = self.stt.recognize(recognize)
+            if recognition:
+                lang, text, confidence = recognition
+                print(f"[Google STT] {lang}: {text}" + (f" ({confidence:.2f})" if confidence is not None else ""))
+                return text
         except Exception as e:
             print(f"[Google STT] Xato: {e}")
             
         # 2. OpenAI Whisper (Fallback - agar Google ishlamasa)
         if not getattr(self, '_whisper_disabled', False) and "YOUR_OPENAI_API_KEY_HERE" not in config.OPENAI_API_KEY:
             try:
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as f:
-                    f.write(audio_data)
-                    temp_path = f.name
-
-                with open(temp_path, "rb") as audio_file:
-                    transcription = self.openai_client.audio.transcriptions.create(
-                        model="whisper-1", 
-                        file=audio_file
-                    )
+                # Audio xotiradan yuboriladi (vaqtinchalik fayl yo'q); FLAC bo'lsa - yarim hajm
+                if flac_data is None:
+                    flac_data = audio_encoder.to_flac(audio_data)
+                upload = ("speech.flac", flac_data, "audio/flac") if flac_data else ("speech.wav", audio_data, "audio/wav")
+                transcription = self.openai_client.audio.transcriptions.create(
+                    model="whisper-1", 
+                    file=upload
+                )
                 
-                os.unlink(temp_path)
                 text = transcription.text
                 print(f"[Whisper STT] {text}")
                 return text
@@ -160,9 +204,42 @@ class SpeechEngine:
         # Default to uz if unsure or more Uzbek hits
         return "uz"
 
-    def text_to_speech(self, text: str, callback: Optional[Callable] = None) -> bool:
+    def _select_voice(self, lang: str) -> str:
+        """Tilga qarab ovoz tanlash"""
+        if lang == "en":
+            return "en-US-AndrewMultilingualNeural"
+        if config.ALICE_MODE:
+            # Alisa rejimi uchun ruscha ayol ovozi (Alice-ga yaqin)
+            return "ru-RU-SvetlanaNeural"
+        return "uz-UZ-SardorNeural"
+
+    @staticmethod
+    def _split_sentences(text: str) -> List[str]:
+        """Matnni gaplarga bo'lish (juda qisqa bo'laklar qo'shib yuboriladi)"""
+        sentences = []
+        buffer = ""
+        for part in _SENTENCE_SPLIT_RE.split(text.strip()):
+            part = part.strip()
+            if not part:
+                continue
+            buffer = f"{buffer} {part}" if buffer else part
+            if len(buffer) >= MIN_SENTENCE_CHARS:
+                sentences.append(buffer)
+                buffer = ""
+        if buffer:
+            if sentences and len(buffer) < MIN_SENTENCE_CHARS:
+                sentences[-1] = f"{sentences[-1]} {buffer}"
+            else:
+                sentences.append(buffer)
+        return sentences
+
+    def text_to_speech(self, text: str, callback: Optional[Callable] = None,
+                       priority: int = PRIORITY_NORMAL) -> bool:
         """
         Matnni ovozga aylantirish (Edge TTS - Bilingual)
+        Matn gaplarga bo'linadi va hammasi birdaniga TTS worker navbatiga qo'yiladi:
+        birinchi gap ijro etilayotganda keyingilari sintez qilinadi (pipeline).
+        Ijro umumiy PlaybackManager navbatida (stop/barge_in bilan to'xtatiladi).
         """
         if not text:
             if callback: callback()
@@ -172,35 +249,29 @@ class SpeechEngine:
             lang = self._detect_language(text)
             print(f"[Edge TTS] Language: {lang}, Text: '{text[:40]}...'")
             
-            def run_edge_tts():
-                try:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    
-                    # Tilga qarab ovoz tanlash
-                    if lang == "en":
-                        voice = "en-US-AndrewMultilingualNeural" 
-                    elif config.ALICE_MODE:
-                        # Alisa rejimi uchun ruscha ayol ovozi (Alice-ga yaqin)
-                        voice = "ru-RU-SvetlanaNeural"
-                    else:
-                        voice = "uz-UZ-SardorNeural"
-                        
-                    temp_path = tempfile.mktemp(suffix=".mp3")
-                    
-                    communicate = edge_tts.Communicate(text, voice)
-                    loop.run_until_complete(communicate.save(temp_path))
-                    
-                    self.after_main_thread(lambda: self._play_audio(temp_path, callback))
-                    return True
-                except Exception as e:
-                    import traceback
-                    traceback.print_exc()
-                    print(f"[Edge TTS] Xato: {e}")
-                    self.after_main_thread(lambda: self._aivoov_fallback(text, callback))
-                    return False
+            start = time.perf_counter()
+            voice = self._select_voice(lang)
+            sentences = self._split_sentences(text)
+            futures = [tts_worker.submit(sentence, voice, priority) for sentence in sentences]
+            
+            def on_start():
+                self.tts_metrics["ttfa_ms"] = (time.perf_counter() - start) * 1000
+                print(f"[Edge TTS] Birinchi audio: {self.tts_metrics['ttfa_ms']:.0f} ms "
+                      f"({len(sentences)} ta gap)")
+            
+            def on_done():
+                self.tts_metrics["total_ms"] = (time.perf_counter() - start) * 1000
+                if callback:
+                    callback()
+            
+            def on_error(index, error):
+                print(f"[Edge TTS] Xato: {error}")
+                # Qolgan gaplarni zaxira TTS orqali aytish (ijro oqimini bloklamasdan)
+                threading.Thread(
+                    target=self._aivoov_fallback, args=(" ".join(sentences[index:]), callback), daemon=True
+                ).start()
             
-            threading.Thread(target=run_edge_tts, daemon=True).start()
+            playback.play(futures, on_done, on_start=on_start, on_error=on_error)
             return True
                 
         except Exception as e:
@@ -224,10 +295,8 @@ class SpeechEngine:
                 result = response.json()
                 if result.get('status'):
                     audio_bytes = base64.b64decode(result.get('audio', ''))
-                    with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as f:
-                        f.write(audio_bytes)
-                        self._play_audio(f.name, callback)
-                        return True
+                    self._play_audio(audio_bytes, callback)
+                    return True
             return self._pyttsx3_fallback(text, callback)
         except:
             return self._pyttsx3_fallback(text, callback)
@@ -255,11 +324,10 @@ class SpeechEngine:
             
             tts = gTTS(text=text, lang='ru', slow=False)
             
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as f:
-                tts.save(f.name)
-                temp_path = f.name
+            buffer = io.BytesIO()
+            tts.write_to_fp(buffer)
             
-            self._play_audio(temp_path, callback)
+            self._play_audio(buffer.getvalue(), callback)
             return True
             
         except Exception as e:
@@ -268,32 +336,13 @@ class SpeechEngine:
                 callback()
             return False
     
-    def _play_audio(self, file_path: str, callback: Optional[Callable] = None):
-        """Audio faylni ijro etish"""
-        def play():
-            try:
-                pygame.mixer.music.load(file_path)
-                pygame.mixer.music.set_volume(config.VOICE_VOLUME)
-                pygame.mixer.music.play()
-                
-                while pygame.mixer.music.get_busy():
-                    pygame.time.Clock().tick(10)
-                
-                try:
-                    os.unlink(file_path)
-                except:
-                    pass
-                    
-                if callback:
-                    callback()
-                    
-            except Exception as e:
-                print(f"[Audio] Xato: {e}")
-                if callback:
-                    callback()
-        
-        thread = threading.Thread(target=play, daemon=True)
-        thread.start()
+    def _play_audio(self, audio_bytes: bytes, callback: Optional[Callable] = None):
+        """Audioni ijro navbatiga qo'yish"""
+        playback.play([audio_bytes], callback)
+    
+    def stop_speaking(self, barge_in: bool = False) -> bool:
+        """Gapirishni to'xtatish (barge_in=True - foydalanuvchi gapira boshladi, ovoz tez so'nadi)"""
+        return playback.barge_in() if barge_in else playback.stop()
     
     def chat(self, message: str, context: list = None) -> Optional[str]:
         """Gemini yoki OpenAI orqali suhbat"""
@@ -375,84 +424,136 @@ class SpeechEngine:
 
 
 class AudioRecorder:
-    """Mikrofondan ovoz yozish"""
+    """
+    Mikrofondan ovoz yozish (umumiy capture oqimi orqali)
+
+    Audio oldindan ajratilgan halqa buferga yoziladi (har chunk uchun yangi obyekt va
+    b''.join nusxasi yo'q). Mikrofon ochiq bo'lsa (wake word tinglayotgan yoki arm()
+    qilingan) start_recording() dan oldingi pre_roll_ms audio ham yozuvga qo'shiladi.
+    """
     
-    def __init__(self):
+    def __init__(self, max_seconds: float = config.RECORD_MAX_SECONDS,
+                 pre_roll_ms: int = config.RECORD_PRE_ROLL_MS):
         self.sample_rate = 16000
         self.channels = 1
-        self.chunk = 1024
+        self.sample_width = 2  # paInt16
+        self.max_seconds = max_seconds
+        self.pre_roll_ms = pre_roll_ms
+        self.buffer: Optional[AudioRingBuffer] = None
+        self._size_buffer(self.sample_rate)
+        
         self.is_recording = False
-        self.frames = []
-        self.audio = None
-        self.stream = None
+        self.is_armed = False
+        self.subscription = None
+        self.record_thread = None
+        self._lock = threading.Lock()
+        self._start = 0
+        self._end = 0
+        self._limit_reached = False
+    
+    def _size_buffer(self, sample_rate: int):
+        """Chegaralarni chastotaga moslash; halqa sig'imi o'zgarsa - qayta ajratiladi (yozuv yo'q paytda)"""
+        frame_bytes = self.channels * self.sample_width
+        self.sample_rate = sample_rate
+        self.max_bytes = int(self.max_seconds * sample_rate) * frame_bytes
+        self.pre_roll_bytes = int(self.pre_roll_ms * sample_rate / 1000) * frame_bytes
+        capacity = self.max_bytes + self.pre_roll_bytes
+        if self.buffer is None or self.buffer.capacity != capacity:
+            self.buffer = AudioRingBuffer(capacity)
+    
+    def arm(self) -> bool:
+        """Mikrofonni oldindan ochib turish - yozuv pre-roll bilan boshlanadi"""
+        with self._lock:
+            if self.is_armed:
+                return True
+            try:
+                capture.acquire()
+            except Exception as e:
+                print(f"[Xato] Mikrofon: {e}")
+                return False
+            self.is_armed = True
+            return True
+    
+    def disarm(self):
+        """Oldindan tinglashni to'xtatish"""
+        with self._lock:
+            if self.is_armed:
+                self.is_armed = False
+                capture.release()
         
     def start_recording(self) -> bool:
         """Ovoz yozishni boshlash"""
-        try:
-            import pyaudio
-            
-            self.audio = pyaudio.PyAudio()
-            self.stream = self.audio.open(
-                format=pyaudio.paInt16,
-                channels=self.channels,
-                rate=self.sample_rate,
-                input=True,
-                frames_per_buffer=self.chunk
-            )
+        with self._lock:
+            if self.is_recording:
+                return True
+            # Mikrofon allaqachon ochiq bo'lsa - oxirgi pre_roll_ms ham yozuvga kiradi
+            start = capture.now() - self.pre_roll_ms / 1000.0 if capture.is_running else None
+            try:
+                self.subscription = capture.subscribe(start, max_queue_seconds=self.max_seconds)
+            except Exception as e:
+                print(f"[Xato] Mikrofon: {e}")
+                return False
             
+            # Qurilma 44.1/48 kHz bo'lsa - halqa ham shunga kattalashadi (yozuv boshi ustidan yozilmasin)
+            self._size_buffer(self.subscription.sample_rate)
+            self._start = self._end = self.buffer.position
+            self._limit_reached = False
             self.is_recording = True
-            self.frames = []
-            
-            self.record_thread = threading.Thread(target=self._record, daemon=True)
+            self.record_thread = threading.Thread(target=self._record, args=(self.subscription,), daemon=True)
             self.record_thread.start()
-            
-            print("[Mikrofon] Yozish boshlandi")
-            return True
-            
-        except Exception as e:
-            print(f"[Xato] Mikrofon: {e}")
-            return False
+        
+        print("[Mikrofon] Yozish boshlandi")
+        return True
     
-    def _record(self):
-        """Ovoz yozish loop"""
-        while self.is_recording:
-            try:
-                data = self.stream.read(self.chunk, exception_on_overflow=False)
-                self.frames.append(data)
-            except:
+    def _record(self, subscription):
+        """Ovoz yozish loop: obuna bloklari halqa buferga yoziladi"""
+        while True:
+            data = subscription.read()
+            if not data:
                 break
+            if self.buffer.position + len(data) - self._start > self.max_bytes:
+                # Maksimal davomiylik: yozuv boshini ustidan yozmaslik uchun qolganini tashlaymiz
+                if not self._limit_reached:
+                    self._limit_reached = True
+                    print(f"[Mikrofon] Maksimal davomiylikka yetildi ({self.max_seconds:g} s)")
+                continue
+            self.buffer.write(data)
+    
+    def recording_views(self) -> List[memoryview]:
+        """
+        Oxirgi yozuvning nusxasiz ko'rinishlari (PCM, halqa chegarasida ikki bo'lak)
+        
+        Keyingi start_recording() buferni qayta yozadi - ko'rinishlarni undan oldin ishlating.
+        """
+        return self.buffer.views(self._start, self._end)
     
     def stop_recording(self) -> bytes:
         """Ovoz yozishni to'xtatish"""
-        self.is_recording = False
+        with self._lock:
+            if not self.is_recording:
+                return b''
+            self.is_recording = False
+            subscription, thread = self.subscription, self.record_thread
+            self.subscription = None
+            self.record_thread = None
         
-        if hasattr(self, 'record_thread') and self.record_thread:
-            self.record_thread.join(timeout=1)
-        
-        if self.stream:
-            try:
-                self.stream.stop_stream()
-                self.stream.close()
-            except:
-                pass
-            
-        if self.audio:
-            try:
-                self.audio.terminate()
-            except:
-                pass
+        subscription.close()
+        thread.join(timeout=1)
+        self._end = self.buffer.position
         
-        print(f"[Mikrofon] Yozish to'xtadi. {len(self.frames)} frame")
+        views = self.recording_views()
+        size = sum(len(view) for view in views)
+        print(f"[Mikrofon] Yozish to'xtadi. {size / (self.sample_rate * self.sample_width * self.channels):.1f} s")
         
-        # WAV formatga aylantirish
-        if self.frames:
-            import pyaudio
+        # WAV formatga aylantirish (PCM buferdan to'g'ridan-to'g'ri yoziladi)
+        if size:
             buffer = io.BytesIO()
             with wave.open(buffer, 'wb') as wf:
                 wf.setnchannels(self.channels)
-                wf.setsampwidth(pyaudio.PyAudio().get_sample_size(pyaudio.paInt16))
+                wf.setsampwidth(self.sample_width)
                 wf.setframerate(self.sample_rate)
-                wf.writeframes(b''.join(self.frames))
+                for view in views:
+                    wf.writeframesraw(view)
             
             return buffer.getvalue()
         
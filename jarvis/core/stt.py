@@ -0,0 +1,89 @@
+"""
+Ko'p tilli STT
+Bir nechta til uchun tanib olish parallel yuboriladi; ishonchli natija ustuvorlik
+tartibida birinchi bo'lib tayyor bo'lganda qaytariladi (ketma-ket so'rovlar yig'indisi o'rniga
+eng sekin kerakli so'rov vaqti)
+"""
+
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, List, Optional, Sequence, Tuple
+
+# Tanib olish natijasi: (matn, ishonch 0..1 yoki None - servis ishonch qaytarmagan)
+Recognition = Tuple[str, Optional[float]]
+# til -> natija; nutq topilmasa None, tarmoq/servis xatosida exception
+RecognizeFn = Callable[[str], Optional[Recognition]]
+
+
+class MultiLanguageRecognizer:
+    """Tillar bo'yicha parallel tanib olish: birinchi ishonchli natija, tenglikda - ustuvorlik"""
+
+    def __init__(self, languages: Sequence[str], min_confidence: float = 0.6, timeout: float = 15.0):
+        """
+        Args:
+            languages: Tillar (ustuvorlik tartibida)
+            min_confidence: Ishonchli natija chegarasi
+            timeout: Natijani kutish chegarasi (soniya). recognize_fn o'z so'roviga ham shu
+                chegarani qo'yishi kerak: kerak bo'lmay qolgan so'rovlar to'xtatib bo'lmaydi,
+                ular fonda tugaguncha ishchini band qiladi
+        """
+        self.languages: List[str] = list(languages)
+        self.min_confidence = min_confidence
+        self.timeout = timeout
+        # Ikki baravar ishchi: oldingi chaqiruvdan qolib ketgan so'rovlar keyingisini navbatda ushlamaydi
+        self._executor = ThreadPoolExecutor(max_workers=2 * len(self.languages), thread_name_prefix="JarvisSTT")
+
+    def is_confident(self, result: Optional[Recognition]) -> bool:
+        """Natija yetarlicha ishonchlimi (ishonch berilmagan bo'lsa - ha)"""
+        if not result or not result[0]:
+            return False
+        confidence = result[1]
+        return confidence is None or confidence >= self.min_confidence
+
+    def recognize(self, recognize_fn: RecognizeFn) -> Optional[Tuple[str, str, Optional[float]]]:
+        """
+        Barcha tillarni parallel tanib olish
+
+        Til i ning ishonchli natijasi undan ustuvor barcha tillar tugab, ishonchli natija
+        bermaganida g'olib bo'ladi - ya'ni natija ketma-ket tekshiruv bilan bir xil,
+        lekin kutish faqat kerakli so'rovlargacha.
+        Hech bir natija ishonchli bo'lmasa - ustuvorlik bo'yicha birinchi bo'sh bo'lmagan natija.
+
+        Returns:
+            (til, matn, ishonch) yoki None
+        Raises:
+            Hech qanday natija bo'lmasa va so'rovlar xato bergan bo'lsa - eng ustuvor tilning xatosi
+        """
+        futures = [self._executor.submit(recognize_fn, lang) for lang in self.languages]
+        index_of = {future: i for i, future in enumerate(futures)}
+        results: List[Optional[Recognition]] = [None] * len(futures)
+        errors: List[Optional[BaseException]] = [None] * len(futures)
+        finished = [False] * len(futures)
+
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=self.timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                i = index_of[future]
+                finished[i] = True
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    errors[i] = e
+
+            # Ustuvorlik tartibida: tugamagan tilga yetguncha ishonchli natija izlash
+            for i, lang in enumerate(self.languages):
+                if not finished[i]:
+                    break
+                if self.is_confident(results[i]):
+                    # Qolgan so'rovlar kutilmaydi (ular fonda o'z timeout i bilan tugaydi)
+                    return lang, results[i][0], results[i][1]
+
+        for i, lang in enumerate(self.languages):
+            if results[i] and results[i][0]:
+                return lang, results[i][0], results[i][1]
+        for error in errors:
+            if error is not None:
+                raise error
+        return None
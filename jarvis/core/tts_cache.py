@@ -0,0 +1,154 @@
+"""
+TTS disk keshi
+Sintez qilingan audio (ovoz, tezlik, format va matn) xeshi bo'yicha data/tts_cache/ ga saqlanadi.
+Hajm chegarasi oshsa eng uzoq ishlatilmagan fayllar (LRU) o'chiriladi.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import config
+
+CACHE_SUFFIX = ".mp3"
+# Edge TTS qaytaradigan format (edge_tts da o'zgarmas) - kalitga kiradi
+OUTPUT_FORMAT = "audio-24khz-48kbitrate-mono-mp3"
+DEFAULT_RATE = "+0%"
+
+
+class TTSCache:
+    """Kontent-adresli (sha256) TTS audio keshi"""
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = config.TTS_CACHE_MAX_MB * 1024 * 1024):
+        self.directory = directory or os.path.join(os.path.dirname(__file__), "..", "data", "tts_cache")
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+        # kalit -> fayl hajmi, eng eskisi boshida (LRU tartibi)
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._load_index()
+
+    @staticmethod
+    def key(text: str, voice: str, rate: str = DEFAULT_RATE, output_format: str = OUTPUT_FORMAT) -> str:
+        """Kesh kaliti: ovoz, tezlik, format va matn xeshi (tezlik o'zgarsa eski audio qaytmaydi)"""
+        material = "\0".join((voice, rate, output_format, text.strip()))
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def _load_index(self):
+        """Mavjud fayllarni oxirgi ishlatilgan vaqti (mtime) bo'yicha indeksga yuklash"""
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.endswith(CACHE_SUFFIX):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, entry.name[:-len(CACHE_SUFFIX)], stat.st_size))
+        except OSError as e:
+            print(f"[TTS Cache] Indeks xatosi: {e}")
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+        self._evict()
+
+    def get(self, text: str, voice: str, rate: str = DEFAULT_RATE) -> Optional[bytes]:
+        """Keshdan audio olish (topilmasa None)"""
+        key = self.key(text, voice, rate)
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+        try:
+            with open(self._path(key), "rb") as f:
+                audio = f.read()
+            os.utime(self._path(key))
+        except OSError:
+            with self._lock:
+                self._forget(key)
+                self.misses += 1
+            return None
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+            self.hits += 1
+        return audio
+
+    def put(self, text: str, voice: str, audio: bytes, rate: str = DEFAULT_RATE):
+        """Audioni keshga yozish (atomik: vaqtinchalik fayl + replace)"""
+        if not audio or len(audio) > self.max_bytes:
+            return
+        key = self.key(text, voice, rate)
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[TTS Cache] Yozishda xato: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self._forget(key)
+            self._index[key] = len(audio)
+            self._total_bytes += len(audio)
+            self._evict()
+
+    def _forget(self, key: str):
+        """Kalitni indeksdan olib tashlash (_lock ichida)"""
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _evict(self):
+        """Hajm chegarasidan oshgan qismni LRU tartibida o'chirish (_lock ichida)"""
+        while self._total_bytes > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                os.unlink(self._path(key))
+            except OSError:
+                pass
+
+    def clear(self):
+        """Keshni butunlay tozalash"""
+        with self._lock:
+            for key in list(self._index):
+                try:
+                    os.unlink(self._path(key))
+                except OSError:
+                    pass
+            self._index.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Kesh statistikasi"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._index),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+            }
+
+
+# Global instance
+tts_cache = TTSCache()
@@ -0,0 +1,185 @@
+"""
+Edge TTS worker
+Bitta uzoq yashaydigan oqim va asyncio event loop: sintez so'rovlari navbatdan
+bittadan (ustuvorlik bo'yicha) olinadi, har gap uchun yangi oqim/loop ochilmaydi.
+Oldin aytilgan gaplar disk keshidan darhol qaytariladi.
+"""
+
+import asyncio
+import inspect
+import itertools
+import threading
+from concurrent.futures import Future
+from typing import Optional
+
+import edge_tts
+
+import config
+from core.tts_cache import TTSCache, tts_cache
+
+# Ustuvorlik: kichik son - birinchi
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+
+
+
+def speed_to_rate(speed: float) -> str:
+    """config.VOICE_SPEED (1.0 - odatiy) -> Edge TTS prosody rate ("+0%", "-10%", ...)"""
+    return f"{round((speed - 1.0) * 100):+d}%"
+
+
+# Umumiy connector dagi DNS natijasi shuncha soniya saqlanadi (aiohttp standarti - 10 s)
+DNS_CACHE_TTL = 300
+
+
+def _make_shared_connector():
+    """
+    edge_tts yopa olmaydigan TCP connector
+
+    edge_tts har so'rovda ClientSession(connector=...) ochadi va sessiya yopilganda
+    connector ham yopiladi (connector_owner ni berib bo'lmaydi). Shu sababli close()
+    e'tiborsiz qoldiriladi, haqiqiy yopish - shutdown() (worker to'xtaganda).
+    """
+    import aiohttp
+
+    class SharedConnector(aiohttp.TCPConnector):
+        created = 0
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            SharedConnector.created += 1
+
+        async def close(self, *args, **kwargs):
+            return None
+
+        async def shutdown(self):
+            result = super().close()
+            if inspect.isawaitable(result):
+                await result
+
+    return SharedConnector(limit=4, ttl_dns_cache=DNS_CACHE_TTL)
+
+
+class TTSWorker:
+    """Edge TTS sintezini bitta event loop da ketma-ket bajaruvchi worker"""
+
+    def __init__(self, timeout: float = 30.0, cache: Optional[TTSCache] = None,
+                 rate: Optional[str] = None):
+        self.timeout = timeout
+        self.cache = cache
+        # Nutq tezligi: berilmasa config.VOICE_SPEED dan (keshga ham kalit sifatida kiradi)
+        self.rate = rate or speed_to_rate(config.VOICE_SPEED)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._start_lock = threading.Lock()
+        self._seq = itertools.count()
+        self._connector = None
+
+        # edge_tts eski versiyalarida connector parametri yo'q
+        self._supports_connector = "connector" in inspect.signature(edge_tts.Communicate.__init__).parameters
+
+    def start(self):
+        """Worker oqimini ishga tushirish (birinchi so'rovda avtomatik chaqiriladi)"""
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._run, name="JarvisTTS", daemon=True)
+            self._thread.start()
+        self._ready.wait()
+
+    def _run(self):
+        """Event loop oqimi"""
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.PriorityQueue()
+        consumer = self._loop.create_task(self._consume())
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            consumer.cancel()
+            self._loop.run_until_complete(asyncio.gather(consumer, return_exceptions=True))
+            self._loop.run_until_complete(self._close_connector())
+            self._loop.close()
+
+    def submit(self, text: str, voice: str, priority: int = PRIORITY_NORMAL,
+               rate: Optional[str] = None) -> "Future[bytes]":
+        """
+        Sintez so'rovini navbatga qo'yish
+
+        Returns:
+            concurrent.futures.Future - natija MP3 baytlari
+        """
+        future: "Future[bytes]" = Future()
+        rate = rate or self.rate
+
+        # Keshdagi gap navbatni kutmaydi
+        cached = self.cache.get(text, voice, rate) if self.cache else None
+        if cached:
+            future.set_result(cached)
+            return future
+
+        self.start()
+        job = (priority, next(self._seq), text, voice, rate, future)
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, job)
+        return future
+
+    def synthesize(self, text: str, voice: str, priority: int = PRIORITY_NORMAL,
+                   rate: Optional[str] = None) -> bytes:
+        """Sintez natijasini kutib olish (bloklovchi)"""
+        return self.submit(text, voice, priority, rate).result(timeout=self.timeout + 5)
+
+    async def _consume(self):
+        """Navbatdan so'rovlarni bittadan bajarish (parallel so'rovlar poyga qilmaydi)"""
+        while True:
+            _, _, text, voice, rate, future = await self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                audio = await asyncio.wait_for(self._synthesize(text, voice, rate), self.timeout)
+                if self.cache:
+                    self.cache.put(text, voice, audio, rate)
+                future.set_result(audio)
+            except Exception as e:
+                future.set_exception(e)
+
+    def _get_connector(self):
+        """
+        Worker umri davomida bitta TCP connector
+
+        Qayta ishlatiladigani - DNS keshi va connector o'zi. Websocket ulanishlari aiohttp
+        pool iga qaytmaydi: TCP/TLS ulanish har so'rovda yangidan ochiladi (servis protokoli).
+        """
+        if self._connector is None or self._connector.closed:
+            self._connector = _make_shared_connector()
+        return self._connector
+
+    async def _close_connector(self):
+        if self._connector is not None and not self._connector.closed:
+            await self._connector.shutdown()
+
+    async def _synthesize(self, text: str, voice: str, rate: str) -> bytes:
+        """Bitta matnni MP3 baytlariga aylantirish"""
+        kwargs = {"connector": self._get_connector()} if self._supports_connector else {}
+        communicate = edge_tts.Communicate(text, voice, rate=rate, **kwargs)
+        chunks = []
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                chunks.append(chunk["data"])
+        if not chunks:
+            raise RuntimeError("Edge TTS audio qaytarmadi")
+        return b"".join(chunks)
+
+    def stop(self):
+        """Worker ni to'xtatish"""
+        if self._loop and self._thread and self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=2)
+
+
+# Global instance
+tts_worker = TTSWorker(cache=tts_cache)
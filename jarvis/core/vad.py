@@ -0,0 +1,297 @@
+"""
+Nutq faolligi detektori (VAD, NumPy)
+STT ga yuborishdan oldin WAV boshidagi va oxiridagi sukunatni kesadi,
+nutq umuman bo'lmagan yozuvlarni esa butunlay rad etadi (tarmoq so'rovi yuborilmaydi).
+PhraseSegmenter - oqimdagi audio bloklardan iboralarni ajratadi (mikrofonga bog'liq emas).
+"""
+
+import io
+import threading
+import wave
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+import config
+
+
+class VoiceActivityDetector:
+    """
+    Energiya asosidagi VAD
+
+    Shovqin darajasi - oqimda kalibrlangan qiymat (berilsa) yoki yozuvning o'zidan baholanadi.
+    Yozuvdan baholangani max_noise_db dan oshmaydi: boshida/oxirida sukunatsiz, to'liq nutqdan
+    iborat yozuvda past persentil ham nutq darajasi bo'ladi va nutq kesilib ketardi.
+    """
+
+    def __init__(self, frame_ms: int = 30, margin_db: float = 10.0, min_db: float = -50.0,
+                 max_noise_db: float = -45.0, min_speech_ms: int = 250, padding_ms: int = 200,
+                 calls_per_clip: int = 1):
+        """
+        Args:
+            frame_ms: Tahlil oynasi
+            margin_db: Nutq kadri shovqin darajasidan kamida shuncha baland bo'lishi kerak
+            min_db: Mutlaq pastki chegara (dBFS) - jim xonada shovqin ham "nutq" bo'lib qolmasligi uchun
+            max_noise_db: Yozuvdan baholangan shovqin darajasining yuqori chegarasi (dBFS)
+            min_speech_ms: Shundan kam nutq bo'lsa yozuv rad etiladi
+            padding_ms: Kesishda nutq atrofida qoldiriladigan zaxira
+            calls_per_clip: Rad etilgan bitta yozuv tejaydigan STT so'rovlari soni (statistika uchun)
+        """
+        self.frame_ms = frame_ms
+        self.margin_db = margin_db
+        self.min_db = min_db
+        self.max_noise_db = max_noise_db
+        self.min_speech_ms = min_speech_ms
+        self.padding_ms = padding_ms
+        self.calls_per_clip = calls_per_clip
+
+        self._lock = threading.Lock()
+        self.clips = 0
+        self.rejected = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def _speech_mask(self, samples: np.ndarray, frame_len: int,
+                     noise_floor: Optional[float] = None) -> np.ndarray:
+        """Har bir kadr uchun: nutq bormi"""
+        frames = samples[: len(samples) // frame_len * frame_len].reshape(-1, frame_len).astype(np.float32)
+        rms = np.sqrt(np.mean(frames * frames, axis=1)) / 32768.0
+        energy_db = 20.0 * np.log10(np.maximum(rms, 1e-10))
+        if noise_floor is None:
+            noise_floor = min(float(np.percentile(energy_db, 10)), self.max_noise_db)
+        return energy_db > max(noise_floor + self.margin_db, self.min_db)
+
+    def process(self, wav_bytes: bytes, noise_floor: Optional[float] = None) -> Optional[bytes]:
+        """
+        WAV ni tekshirish va sukunatdan tozalash
+
+        Args:
+            noise_floor: Oqimda kalibrlangan shovqin darajasi (dBFS, PhraseSegmenter.noise_floor);
+                None - yozuvning o'zidan
+        Returns:
+            Kesilgan WAV baytlari, nutq bo'lmasa None
+            (WAV 16-bit PCM bo'lmasa - o'zgarishsiz qaytariladi)
+        """
+        try:
+            with wave.open(io.BytesIO(wav_bytes), "rb") as wf:
+                channels, width, rate = wf.getnchannels(), wf.getsampwidth(), wf.getframerate()
+                pcm = wf.readframes(wf.getnframes())
+        except (wave.Error, EOFError) as e:
+            print(f"[VAD] WAV o'qilmadi: {e}")
+            return wav_bytes
+        if width != 2:
+            return wav_bytes
+
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        mono = samples.reshape(-1, channels).mean(axis=1) if channels > 1 else samples
+        frame_len = max(1, rate * self.frame_ms // 1000)
+        if len(mono) < frame_len:
+            return self._record(wav_bytes, None)
+
+        speech = self._speech_mask(mono, frame_len, noise_floor)
+        if speech.sum() * self.frame_ms < self.min_speech_ms:
+            return self._record(wav_bytes, None)
+
+        active = np.flatnonzero(speech)
+        pad = self.padding_ms // self.frame_ms
+        start = max(0, active[0] - pad) * frame_len
+        end = min(len(speech), active[-1] + 1 + pad) * frame_len
+        if end >= len(mono) - frame_len:
+            end = len(mono)
+
+        frame_bytes = channels * width
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wf:
+            wf.setnchannels(channels)
+            wf.setsampwidth(width)
+            wf.setframerate(rate)
+            wf.writeframes(pcm[start * frame_bytes:end * frame_bytes])
+        return self._record(wav_bytes, buffer.getvalue())
+
+    def _record(self, original: bytes, result: Optional[bytes]) -> Optional[bytes]:
+        """Statistikani yangilash va natijani qaytarish"""
+        with self._lock:
+            self.clips += 1
+            self.bytes_in += len(original)
+            if result is None:
+                self.rejected += 1
+            else:
+                self.bytes_out += len(result)
+        if result is None:
+            print(f"[VAD] Nutq topilmadi - STT so'rovi yuborilmadi ({len(original) // 1024} KB)")
+        elif len(result) < len(original):
+            print(f"[VAD] Sukunat kesildi: {len(original) // 1024} KB -> {len(result) // 1024} KB")
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        """Tejalgan baytlar va so'rovlar"""
+        with self._lock:
+            return {
+                "clips": self.clips,
+                "rejected": self.rejected,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "bytes_saved": self.bytes_in - self.bytes_out,
+                "calls_avoided": self.rejected * self.calls_per_clip,
+            }
+
+
+class Phrase(NamedTuple):
+    """Ajratilgan ibora: PCM va manba soati bo'yicha boshlanish/tugash vaqti"""
+    pcm: bytes
+    sample_rate: int
+    start: float
+    end: float
+
+
+class PhraseSegmenter:
+    """
+    Oqimli iboralarni ajratish (sr.Recognizer.listen o'rniga)
+
+    Blok energiyasi shovqin darajasidan margin_db baland bo'lsa - nutq. Ibora pauza
+    (pause_seconds) yoki max_seconds bilan tugaydi; boshlanishdan oldingi pre_seconds ham qo'shiladi.
+    Shovqin darajasi jimlikda moslashadi: pasayishga tez, ko'tarilishga sekin. Xona keskin
+    shovqinli bo'lib qolsa (drift) yoki recalibrate_seconds o'tsa - oxirgi window_seconds
+    blok darajalaridan qayta o'lchanadi.
+    """
+
+    def __init__(self, sample_rate: int = 16000, pause_seconds: float = 0.5, max_seconds: float = 1.5,
+                 pre_seconds: float = 0.2, margin_db: float = 10.0, min_db: float = -50.0,
+                 min_speech_seconds: float = 0.1,
+                 recalibrate_seconds: Optional[float] = config.MIC_RECALIBRATE_INTERVAL,
+                 drift_db: Optional[float] = config.MIC_DRIFT_DB, window_seconds: float = 5.0):
+        self.sample_rate = sample_rate
+        self.pause_seconds = pause_seconds
+        self.max_seconds = max_seconds
+        self.pre_seconds = pre_seconds
+        self.margin_db = margin_db
+        self.min_db = min_db
+        self.min_speech_seconds = min_speech_seconds
+        self.recalibrate_seconds = recalibrate_seconds
+        self.drift_db = drift_db
+        self.window_seconds = window_seconds
+        self.noise_floor: Optional[float] = None
+        self.recalibrations = 0
+        # (blok oxiri, daraja) - oxirgi window_seconds
+        self._levels: "deque[tuple]" = deque()
+        self._calibrated_at: Optional[float] = None
+        self._speech_at: Optional[float] = None
+        self.reset()
+
+    def reset(self):
+        """Joriy iborani va pre-roll tarixini tashlash (shovqin darajasi saqlanadi)"""
+        self._history: "deque[tuple]" = deque()
+        self._blocks: List[bytes] = []
+        self._active = False
+        self._start = 0.0
+        self._speech = 0.0
+        self._silence = 0.0
+
+    def calibrate(self, pcm: bytes, block_frames: int = 1024, percentile: float = 20.0):
+        """
+        Shovqin darajasini oldingi audiodan aniqlash (birinchi blok nutq bo'lib qolmasligi uchun)
+
+        Audio ichida nutq ham bo'lishi mumkin - blok darajalarining past persentili olinadi.
+        """
+        step = block_frames * 2
+        levels = [self._level(pcm[offset:offset + step]) for offset in range(0, len(pcm) - step + 1, step)]
+        if levels:
+            self.noise_floor = float(np.percentile(levels, percentile))
+            # Qayta o'lchash oralig'i keyingi blokdan hisoblanadi
+            self._calibrated_at = None
+
+    def _track_drift(self, level: float, end_time: float, speech: bool):
+        """Oxirgi darajalarni saqlash; drift yoki oraliq tugasa - shovqin darajasini qayta o'lchash"""
+        if speech:
+            self._speech_at = end_time
+        levels = self._levels
+        levels.append((end_time, level))
+        while end_time - levels[0][0] > self.window_seconds:
+            levels.popleft()
+        if self._calibrated_at is None:
+            self._calibrated_at = end_time
+        if end_time - levels[0][0] < self.window_seconds * 0.9:
+            return
+
+        quietest = min(value for _, value in levels)
+        reason = None
+        # Nutqda so'zlar orasida pauza bo'ladi - butun oyna davomida past daraja yo'qligi = shovqin
+        if self.drift_db is not None and quietest > self.noise_floor + self.drift_db:
+            reason = "drift"
+        elif (self.recalibrate_seconds is not None
+              and end_time - self._calibrated_at >= self.recalibrate_seconds
+              and (self._speech_at is None or end_time - self._speech_at >= self.window_seconds)):
+            # Oraliq bo'yicha - faqat butun oyna nutqsiz bo'lsa (nutq darajasi shovqin deb olinmasin)
+            reason = "oraliq"
+        if reason is None:
+            return
+        old = self.noise_floor
+        self.noise_floor = float(np.percentile([value for _, value in levels], 20))
+        self._calibrated_at = end_time
+        self.recalibrations += 1
+        if reason == "drift":
+            print(f"[VAD] Shovqin darajasi o'zgardi: {old:.1f} -> {self.noise_floor:.1f} dB")
+
+    @property
+    def in_phrase(self) -> bool:
+        """Ibora boshlangan, lekin hali tugamagan"""
+        return self._active
+
+    def _level(self, pcm: bytes) -> float:
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32)
+        rms = np.sqrt(np.mean(samples * samples)) / 32768.0 if len(samples) else 0.0
+        return 20.0 * np.log10(max(rms, 1e-10))
+
+    def feed(self, pcm: bytes, end_time: float) -> Optional[Phrase]:
+        """
+        Navbatdagi blokni qo'shish
+
+        Args:
+            end_time: Blok oxirining manba soatidagi vaqti
+        Returns:
+            Tugagan ibora yoki None
+        """
+        duration = len(pcm) / 2 / float(self.sample_rate)
+        level = self._level(pcm)
+        if self.noise_floor is None:
+            self.noise_floor = level
+        speech = level > max(self.noise_floor + self.margin_db, self.min_db)
+
+        # Shovqin darajasi: jimlikda pasayishga tez, ko'tarilishga sekin; nutqda - juda sekin
+        rate = 0.01 if speech else (0.5 if level < self.noise_floor else 0.05)
+        self.noise_floor += rate * (level - self.noise_floor)
+        self._track_drift(level, end_time, speech)
+
+        if not self._active:
+            self._history.append((pcm, end_time - duration))
+            while len(self._history) > 1 and end_time - self._history[1][1] >= self.pre_seconds + duration:
+                self._history.popleft()
+            if not speech:
+                return None
+            self._active = True
+            self._blocks = [block for block, _ in self._history]
+            self._start = self._history[0][1]
+            self._history.clear()
+            self._speech = duration
+            self._silence = 0.0
+            return None
+
+        self._blocks.append(pcm)
+        if speech:
+            self._speech += duration
+            self._silence = 0.0
+        else:
+            self._silence += duration
+        if self._silence < self.pause_seconds and end_time - self._start < self.max_seconds:
+            return None
+
+        blocks, start, spoken = self._blocks, self._start, self._speech
+        self.reset()
+        if spoken < self.min_speech_seconds:
+            return None
+        return Phrase(b"".join(blocks), self.sample_rate, start, end_time)
+
+
+# Global instance (rad etilgan yozuv - har bir STT tili uchun bittadan so'rov tejaydi)
+vad = VoiceActivityDetector(calls_per_clip=len(config.STT_LANGUAGES))
@@ -0,0 +1,97 @@
+"""
+Wake word matcher
+STT matnida wake word ni so'z chegaralari bo'yicha qidiradi (substring emas: "ja" - "jadval"
+ichida topilmaydi). Kirill va lotin yozuvlari bir xil ko'rinishga keltiriladi, har bir
+shaklning ishonch og'irligi bor. Hammasi konstruktorda bir marta tayyorlanadi.
+"""
+
+import re
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Kirill -> lotin (o'zbek lotin yozuviga yaqin); "дж" alohida - "джарвис" == "jarvis"
+_CYRILLIC_DIGRAPHS = (("дж", "j"),)
+_CYRILLIC_TO_LATIN = str.maketrans({
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "yo", "ж": "j",
+    "з": "z", "и": "i", "й": "y", "к": "k", "л": "l", "м": "m", "н": "n", "о": "o",
+    "п": "p", "р": "r", "с": "s", "т": "t", "у": "u", "ф": "f", "х": "x", "ц": "ts",
+    "ч": "ch", "ш": "sh", "щ": "sh", "ъ": "", "ы": "i", "ь": "", "э": "e", "ю": "yu",
+    "я": "ya", "ў": "o", "қ": "q", "ғ": "g", "ҳ": "h",
+})
+
+
+def normalize(text: str) -> List[str]:
+    """Matn -> lotin yozuvidagi kichik harfli so'zlar"""
+    text = text.lower()
+    for cyrillic, latin in _CYRILLIC_DIGRAPHS:
+        text = text.replace(cyrillic, latin)
+    return _TOKEN_RE.findall(text.translate(_CYRILLIC_TO_LATIN))
+
+
+class WakeWordMatcher:
+    """So'z darajasidagi wake word qidiruvi (og'irliklar bilan)"""
+
+    def __init__(self, entries: Iterable[str], weights: Optional[Mapping[str, float]] = None,
+                 min_score: float = 0.5):
+        """
+        Args:
+            entries: Wake word shakllari (bir yoki bir necha so'z, istalgan yozuvda)
+            weights: Shakl -> ishonch 0..1 (berilmaganlari 1.0)
+            min_score: Ishga tushish uchun kerakli umumiy ishonch
+        """
+        weights = weights or {}
+        self.min_score = min_score
+        # Birinchi so'z -> [(so'zlar, og'irlik)]; kirill/lotin dublikatlari birlashadi (kattasi qoladi)
+        phrases: Dict[Tuple[str, ...], float] = {}
+        for entry in entries:
+            tokens = tuple(normalize(entry))
+            if tokens:
+                weight = weights.get(entry, 1.0)
+                phrases[tokens] = max(weight, phrases.get(tokens, 0.0))
+        self._by_first: Dict[str, List[Tuple[Tuple[str, ...], float]]] = {}
+        for tokens, weight in sorted(phrases.items(), key=lambda item: -len(item[0])):
+            self._by_first.setdefault(tokens[0], []).append((tokens, weight))
+
+    def find(self, text: str) -> Dict[str, float]:
+        """Matndagi wake word shakllari: shakl -> og'irlik"""
+        found, _ = self._scan(normalize(text))
+        return found
+
+    def _scan(self, tokens: List[str]) -> Tuple[Dict[str, float], int]:
+        """Topilgan shakllar va ular qoplagan so'zlar soni"""
+        found: Dict[str, float] = {}
+        covered = 0
+        i = 0
+        while i < len(tokens):
+            for phrase, weight in self._by_first.get(tokens[i], ()):
+                if tuple(tokens[i:i + len(phrase)]) == phrase:
+                    found[" ".join(phrase)] = weight
+                    covered += len(phrase)
+                    i += len(phrase)
+                    break
+            else:
+                i += 1
+        return found, covered
+
+    def score(self, text: str) -> float:
+        """
+        Umumiy ishonch 0..1
+
+        Bir nechta shakl topilsa - "noisy-or" (1 - (1-w1)(1-w2)...). Matn faqat wake word dan
+        iborat bo'lsa (masalan STT yolg'iz "jar" deb eshitgan) kuchsiz shakllar og'irligi ikki
+        baravar oshadi - gap ichida esa ular yolg'iz ishga tushirmaydi.
+        """
+        tokens = normalize(text)
+        found, covered = self._scan(tokens)
+        if not found:
+            return 0.0
+        alone = covered == len(tokens)
+        miss = 1.0
+        for weight in found.values():
+            miss *= 1.0 - min(1.0, weight * 2 if alone else weight)
+        return 1.0 - miss
+
+    def match(self, text: str) -> bool:
+        """Matn wake word deb qabul qilinadimi"""
+        return self.score(text) >= self.min_score
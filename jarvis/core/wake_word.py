@@ -1,13 +1,12 @@
 """
 Wake Word Detector - "Jarvis" so'zini aniqlash
-Orqa fonda doimiy tinglaydi
+Orqa fonda doimiy tinglaydi. Audio AudioSource dan olinadi (jonli mikrofon yoki WAV),
+bulutli tanib olish esa almashtiriladigan funksiya - detektorni offline sinash mumkin.
 """
 
-import io
-import wave
 import threading
 import time
-from typing import Callable, Optional
+from typing import Callable, Iterator, NamedTuple, Optional
 
 try:
     import speech_recognition as sr
@@ -16,55 +15,159 @@ except ImportError:
     SR_AVAILABLE = False
 
 import config
+from core.audio_source import AudioSource
+from core.capture import capture, Subscription
+from core.keyword_spotter import KeywordSpotter
+from core.stt import MultiLanguageRecognizer
+from core.wake_matcher import WakeWordMatcher
+from core.vad import Phrase, PhraseSegmenter
+
+# (ibora, til) -> matn; nutq topilmasa None yoki exception
+Recognizer = Callable[[Phrase, str], Optional[str]]
+
+
+class WakeEvent(NamedTuple):
+    """Aniqlangan wake word"""
+    time: float  # Manba soati bo'yicha qaror qabul qilingan ibora oxiri (soniya)
+    processing: float  # Lokal tekshiruv va bulutli so'rovlarga ketgan vaqt (soniya)
+    calls: int  # Shu ibora uchun yuborilgan bulutli so'rovlar
+    text: str
 
 
 class WakeWordDetector:
     """Wake word (Jarvis) aniqlash"""
-    
-    def __init__(self):
+
+    # Iborani ajratish: wake word qisqa - tez javob uchun 1.5 s chegara va 0.5 s pauza
+    PHRASE_TIME_LIMIT = 1.5
+    PAUSE_THRESHOLD = 0.5
+    # Bitta bulutli so'rov chegarasi (soniya) - wake word uchun uzoq kutishning ma'nosi yo'q
+    CLOUD_TIMEOUT = 5.0
+
+    def __init__(self, recognizer: Optional[Recognizer] = None,
+                 spotter: Optional[KeywordSpotter] = None,
+                 source_factory: Callable[[], AudioSource] = capture.subscribe):
+        """
+        Args:
+            recognizer: Bulutli tanib olish o'rnini bosuvchi (berilmasa - Google STT)
+            spotter: Lokal filtr (berilmasa - data/wake_templates shablonlari bilan)
+            source_factory: Jonli tinglash uchun audio manba (standart - umumiy mikrofon oqimi)
+        """
         self.wake_words = config.JARVIS_WAKE_WORDS  # ["jarvis", "жарвис", "jarvi"]
+        # So'z chegarasi, kirill/lotin va og'irliklar - bir marta tayyorlanadi
+        self.matcher = WakeWordMatcher(self.wake_words, config.WAKE_WORD_WEIGHTS, config.WAKE_MATCH_MIN_SCORE)
         self.is_listening = False
         self.on_wake_word: Optional[Callable] = None
-        self.recognizer = None
-        self.microphone = None
+        self.source_factory = source_factory
         self._stop_event = threading.Event()
-        
-        if SR_AVAILABLE:
-            self.recognizer = sr.Recognizer()
-            # Pro Parameters for Wake Word
-            self.recognizer.energy_threshold = config.VOICE_VOLUME * 100 # Sensitive default
-            self.recognizer.dynamic_energy_threshold = True
-            self.recognizer.pause_threshold = 0.5  # Standard for wake word
-            self.recognizer.non_speaking_duration = 0.2
-    
+        # Bulutli tekshiruv tillari (eng ustuvori birinchi)
+        self.languages = list(dict.fromkeys([f"{config.LANGUAGE}-{config.LANGUAGE.upper()}", "en-US"]))
+        # Tillar parallel so'raladi (ustuvorlik saqlanadi) - kechikish eng sekin kerakli so'rovgacha
+        self.stt = MultiLanguageRecognizer(self.languages, timeout=self.CLOUD_TIMEOUT)
+        # Lokal filtr: "Jarvis" ga o'xshamagan yozuvlar Google ga yuborilmaydi
+        self.spotter = spotter or KeywordSpotter(calls_per_clip=len(self.languages))
+        self.cloud_calls = 0
+
+        self.recognizer = sr.Recognizer() if SR_AVAILABLE else None
+        if self.recognizer is not None:
+            self.recognizer.operation_timeout = self.CLOUD_TIMEOUT
+        self.recognize: Optional[Recognizer] = recognizer
+        if self.recognize is None and SR_AVAILABLE:
+            self.recognize = self._recognize_google
+
     def start(self, callback: Callable):
         """Wake word tinglashni boshlash"""
-        if not SR_AVAILABLE:
+        if self.recognize is None:
             print("[Wake Word] SpeechRecognition kutubxonasi topilmadi")
             return
-        
+
         self.on_wake_word = callback
         self.is_listening = True
         self._stop_event.clear()
-        
+
         self._listen_thread = threading.Thread(target=self._listen_loop, daemon=True)
         self._listen_thread.start()
         print("[Wake Word] Jarvis tayyor va tinglamoqda...")
-    
+
     def stop(self):
         """Tinglashni to'xtatish"""
         self.is_listening = False
         self._stop_event.set()
         print("[Wake Word] To'xtatildi")
-    
+
     def pause(self):
         """Vaqtincha to'xtatish"""
         self.is_listening = False
-    
+
     def resume(self):
         """Davom ettirish"""
         self.is_listening = True
-    
+
+    def _recognize_google(self, phrase: Phrase, language: str) -> Optional[str]:
+        """Google STT orqali tanib olish"""
+        audio = sr.AudioData(phrase.pcm, phrase.sample_rate, 2)
+        return self.recognizer.recognize_google(audio, language=language)
+
+    def _is_wake(self, text: str) -> bool:
+        """Matnda wake word bormi"""
+        return self.matcher.match(text)
+
+    def check_phrase(self, phrase: Phrase) -> Optional[WakeEvent]:
+        """
+        Bitta iborani tekshirish: lokal filtr -> bulutli tanib olish -> wake word qidirish
+
+        Returns:
+            Wake word topilsa WakeEvent, aks holda None
+        """
+        started = time.perf_counter()
+        # Lokal MFCC+DTW tekshiruvi: wake word ga o'xshamasa - tarmoq so'rovi yo'q
+        if not self.spotter.check(phrase.pcm, phrase.sample_rate):
+            return None
+
+        # Recognition - barcha tillar parallel, natija ustuvorlik bo'yicha
+        def recognize(lang):
+            text = self.recognize(phrase, lang)
+            return (text, None) if text else None
+
+        calls = len(self.languages)
+        self.cloud_calls += calls
+        try:
+            recognition = self.stt.recognize(recognize)
+        except Exception:
+            recognition = None
+        text = recognition[1].lower() if recognition else ""
+
+        if not text:
+            return None
+        print(f"[Wake Word] Eshitildi: '{text}'")
+        # "Jarvis" so'zi bormi tekshirish
+        if not self._is_wake(text):
+            return None
+
+        event = WakeEvent(phrase.end, time.perf_counter() - started, calls, text)
+        # Tasdiqlangan yozuv - foydalanuvchi ovozidan yangi shablon
+        if self.spotter.needs_templates:
+            self.spotter.enroll(phrase.pcm, phrase.sample_rate)
+        return event
+
+    def detect(self, source: AudioSource) -> Iterator[WakeEvent]:
+        """
+        Manbadan o'qib, har bir aniqlangan wake word ni qaytarish
+
+        Manba tugaganda, stop() yoki pause() chaqirilganda to'xtaydi.
+        """
+        segmenter = PhraseSegmenter(source.sample_rate, pause_seconds=self.PAUSE_THRESHOLD,
+                                    max_seconds=self.PHRASE_TIME_LIMIT)
+        while self.is_listening and not self._stop_event.is_set():
+            block = source.read()
+            if not block:
+                return
+            phrase = segmenter.feed(block, source.time)
+            if phrase is None:
+                continue
+            event = self.check_phrase(phrase)
+            if event:
+                yield event
+
     def _listen_loop(self):
         """Doimiy tinglash loop"""
         while not self._stop_event.is_set():
@@ -72,49 +175,18 @@ class WakeWordDetector:
                 if not self.is_listening:
                     time.sleep(1.0)
                     continue
-                    
+
                 print(f"[Wake Word] Mikrofon ochilmoqda...")
                 try:
-                    with sr.Microphone() as source:
-                        # Faqat bir marta shovqinni o'lchash (barqarorlik uchun)
-                        self.recognizer.adjust_for_ambient_noise(source, duration=0.8)
-                        self.recognizer.dynamic_energy_threshold = True
-                        # Sezgirlikni oshirish
-                        self.recognizer.energy_threshold = 300 
-                        
-                        print(f"[Wake Word] Tinglamoqda (Baza Shovqin: {int(self.recognizer.energy_threshold)})")
-                        
-                        while self.is_listening and not self._stop_event.is_set():
-                            try:
-                                # phrase_time_limit ni 1.5 ga tushirdik (tezroq javob berish uchun)
-                                audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=1.5)
-                                
-                                # Recognition - Parallel kabi tez ishlashi uchun listni qisqartirdik
-                                text = ""
-                                langs = [f"{config.LANGUAGE}-{config.LANGUAGE.upper()}", "en-US"]
-                                langs = list(dict.fromkeys(langs))
-                                
-                                for lang in langs:
-                                    try:
-                                        # Google recognition
-                                        text = self.recognizer.recognize_google(audio, language=lang).lower()
-                                        if text: break
-                                    except: continue
-                                
-                                if text:
-                                    print(f"[Wake Word] Eshitildi: '{text}'")
-                                    # "Jarvis" so'zi bormi tekshirish
-                                    if any(word.lower() in text for word in self.wake_words):
-                                        print(f"[Wake Word] TRIGGER DETECTED!")
-                                        self._trigger_callback()
-                                        break
-                                        
-                            except sr.WaitTimeoutError:
-                                continue
-                            except Exception as e:
-                                if "Stream closed" not in str(e):
-                                    print(f"[Wake Word] Listen xato: {e}")
-                                break
+                    with self.source_factory() as source:
+                        print(f"[Wake Word] Tinglamoqda ({source.sample_rate} Hz)")
+                        for event in self.detect(source):
+                            print(f"[Wake Word] TRIGGER DETECTED!")
+                            if isinstance(source, Subscription):
+                                # Buyruq yozuvi shu joydan davom etadi (mikrofon ochiq qoladi)
+                                source.service.mark(event.time)
+                            self._trigger_callback()
+                            break
                 except Exception as e:
                     print(f"[Wake Word] Mikrofon xato: {e}")
                     time.sleep(2)
@@ -4,6 +4,8 @@ AI Chat - Muxlisa.ai orqali suhbat
 
 from typing import Dict, Any, List
 from core.speech import muxlisa
+from core.commands import CommandType
+from core.dispatch import command_handler, action_table
 
 
 class AIChatFeatures:
@@ -13,6 +15,7 @@ class AIChatFeatures:
         self.context: List[Dict] = []
         self.max_context = 10
     
+    @command_handler(CommandType.AI_CHAT, "chat", message="")
     def chat(self, message: str) -> str:
         """AI bilan suhbat"""
         # Muxlisa API orqali javob olish
@@ -28,6 +31,7 @@ class AIChatFeatures:
         
         return response or "Kechirasiz, javob olishda xatolik yuz berdi."
     
+    @command_handler(CommandType.AI_CHAT, "clear")
     def clear_context(self) -> str:
         """Kontekstni tozalash"""
         self.context = []
@@ -35,12 +39,9 @@ class AIChatFeatures:
     
     def execute(self, action: str, params: Dict[str, Any]) -> str:
         """Buyruqni bajarish"""
-        if action == "chat":
-            message = params.get("message", "")
-            return self.chat(message)
-        elif action == "clear":
-            return self.clear_context()
-        
+        handler = action_table(self).get(action)
+        if handler:
+            return handler(params)
         return "Kechirasiz, bu buyruqni bajara olmadim."
 
 
@@ -5,6 +5,8 @@ Umumiy buyruqlar - Salomlashish, vaqt, sana
 import datetime
 import random
 from typing import Dict, Any
+from core.commands import CommandType
+from core.dispatch import command_handler, action_table
 
 
 class GeneralFeatures:
@@ -52,6 +54,7 @@ class GeneralFeatures:
             3: "payshanba", 4: "juma", 5: "shanba", 6: "yakshanba"
         }
     
+    @command_handler(CommandType.GREETING, "hello")
     def greet(self) -> str:
         """Salomlashish"""
         now = datetime.datetime.now()
@@ -68,14 +71,17 @@ class GeneralFeatures:
         
         return f"{time_greeting}! {random.choice(self.greetings)}"
     
+    @command_handler(CommandType.GREETING, "goodbye")
     def goodbye(self) -> str:
         """Xayrlashish"""
         return random.choice(self.goodbyes)
     
+    @command_handler(CommandType.GREETING, "how_are_you")
     def how_are_you(self) -> str:
         """Holat so'rash javob"""
         return random.choice(self.how_are_you_responses)
     
+    @command_handler(CommandType.TIME_DATE, "time")
     def get_time(self) -> str:
         """Hozirgi vaqtni aytish"""
         now = datetime.datetime.now()
@@ -84,6 +90,7 @@ class GeneralFeatures:
         
         return f"Hozir soat {hour} va {minute} daqiqa."
     
+    @command_handler(CommandType.TIME_DATE, "date")
     def get_date(self) -> str:
         """Bugungi sanani aytish"""
         now = datetime.datetime.now()
@@ -96,18 +103,10 @@ class GeneralFeatures:
     
     def execute(self, action: str, params: Dict[str, Any]) -> str:
         """Buyruqni bajarish"""
-        if action == "hello":
-            return self.greet()
-        elif action == "goodbye":
-            return self.goodbye()
-        elif action == "how_are_you":
-            return self.how_are_you()
-        elif action == "time":
-            return self.get_time()
-        elif action == "date":
-            return self.get_date()
-        else:
-            return "Kechirasiz, tushunmadim."
+        handler = action_table(self).get(action)
+        if handler:
+            return handler(params)
+        return "Kechirasiz, tushunmadim."
 
 
 # Global instance
@@ -4,6 +4,8 @@ Keyboard - Yozish, clipboard va ilova ichidagi boshqaruv
 
 import time
 import subprocess
+from core.commands import CommandType
+from core.dispatch import command_handler, action_table
 try:
     import pyautogui
     PYAUTOGUI_AVAILABLE = True
@@ -37,6 +39,7 @@ class KeyboardFeatures:
         except Exception as e:
             return f"Yozishda xatolik: {e}"
     
+    @command_handler(CommandType.KEYBOARD, "type", text="")
     def type_text_unicode(self, text: str) -> str:
         """Unicode matnni yozish (kirill, lotin)"""
         if not PYAUTOGUI_AVAILABLE:
@@ -53,6 +56,7 @@ class KeyboardFeatures:
             return f"Yozishda xatolik: {e}"
     
     # ============== TUGMALAR ==============
+    @command_handler(CommandType.KEYBOARD, "press", key="")
     def press_key(self, key: str) -> str:
         """Bitta tugmani bosish"""
         if not PYAUTOGUI_AVAILABLE:
@@ -74,18 +78,23 @@ class KeyboardFeatures:
             return f"Tugmalar kombinatsiyasida xatolik: {e}"
     
     # ============== CLIPBOARD ==============
+    @command_handler(CommandType.KEYBOARD, "copy")
     def copy(self) -> str:
         return self.hotkey('ctrl', 'c')
     
+    @command_handler(CommandType.KEYBOARD, "paste")
     def paste(self) -> str:
         return self.hotkey('ctrl', 'v')
     
+    @command_handler(CommandType.KEYBOARD, "cut")
     def cut(self) -> str:
         return self.hotkey('ctrl', 'x')
     
+    @command_handler(CommandType.KEYBOARD, "select_all")
     def select_all(self) -> str:
         return self.hotkey('ctrl', 'a')
     
+    @command_handler(CommandType.KEYBOARD, "read_clipboard")
     def read_clipboard(self) -> str:
         """Clipboarddagi matnni o'qish"""
         if PYPERCLIP_AVAILABLE:
@@ -98,6 +107,7 @@ class KeyboardFeatures:
                 return "Clipboardni o'qishda xatolik."
         return "pyperclip kutubxonasi kerak."
     
+    @command_handler(CommandType.KEYBOARD, "clipboard_search")
     def clipboard_to_search(self) -> str:
         """Clipboarddagi matnni Googleda qidirish"""
         if PYPERCLIP_AVAILABLE:
@@ -113,43 +123,53 @@ class KeyboardFeatures:
         return "pyperclip kutubxonasi kerak."
     
     # ============== APP-SPECIFIC SHORTCUTS ==============
+    @command_handler(CommandType.KEYBOARD, "undo")
     def undo(self) -> str:
         return self.hotkey('ctrl', 'z')
     
+    @command_handler(CommandType.KEYBOARD, "redo")
     def redo(self) -> str:
         return self.hotkey('ctrl', 'y')
     
+    @command_handler(CommandType.KEYBOARD, "save")
     def save(self) -> str:
         return self.hotkey('ctrl', 's')
     
+    @command_handler(CommandType.KEYBOARD, "find")
     def find(self) -> str:
         """Topish (Ctrl+F)"""
         return self.hotkey('ctrl', 'f')
     
+    @command_handler(CommandType.KEYBOARD, "new")
     def new_file(self) -> str:
         """Yangi (Ctrl+N)"""
         return self.hotkey('ctrl', 'n')
     
+    @command_handler(CommandType.KEYBOARD, "print")
     def print_page(self) -> str:
         """Chop etish (Ctrl+P)"""
         return self.hotkey('ctrl', 'p')
     
     # ============== BROWSER TAB CONTROL ==============
+    @command_handler(CommandType.KEYBOARD, "new_tab")
     def new_tab(self) -> str:
         """Yangi tab (Ctrl+T)"""
         self.hotkey('ctrl', 't')
         return "Yangi tab ochildi."
     
+    @command_handler(CommandType.KEYBOARD, "close_tab")
     def close_tab(self) -> str:
         """Tabni yopish (Ctrl+W)"""
         self.hotkey('ctrl', 'w')
         return "Tab yopildi."
     
+    @command_handler(CommandType.KEYBOARD, "refresh")
     def refresh_page(self) -> str:
         """Sahifani yangilash (F5)"""
         self.press_key('f5')
         return "Sahifa yangilandi."
     
+    @command_handler(CommandType.KEYBOARD, "switch_tab", direction="next")
     def switch_tab(self, direction: str = "next") -> str:
         """Tab o'zgartirish"""
         if direction == "next":
@@ -159,11 +179,13 @@ class KeyboardFeatures:
             self.hotkey('ctrl', 'shift', 'tab')
             return "Oldingi tabga qaytildi."
     
+    @command_handler(CommandType.KEYBOARD, "address_bar")
     def address_bar(self) -> str:
         """Manzil satriga o'tish (Ctrl+L)"""
         self.hotkey('ctrl', 'l')
         return "Manzil satri tanlandi."
     
+    @command_handler(CommandType.KEYBOARD, "open_url", url="")
     def open_url_in_browser(self, url: str) -> str:
         """Brauzerda URL ochish"""
         self.hotkey('ctrl', 'l')
@@ -178,23 +200,28 @@ class KeyboardFeatures:
         return f"'{url[:40]}' brauzerda ochilmoqda."
     
     # ============== WINDOW SHORTCUTS ==============
+    @command_handler(CommandType.KEYBOARD, "zoom_in")
     def zoom_in(self) -> str:
         self.hotkey('ctrl', 'plus')
         return "Kattalashtrildi."
     
+    @command_handler(CommandType.KEYBOARD, "zoom_out")
     def zoom_out(self) -> str:
         self.hotkey('ctrl', 'minus')
         return "Kichraytirildi."
     
+    @command_handler(CommandType.KEYBOARD, "full_screen")
     def full_screen(self) -> str:
         self.press_key('f11')
         return "To'liq ekran rejimiga o'tildi."
     
+    @command_handler(CommandType.KEYBOARD, "alt_tab")
     def alt_tab(self) -> str:
         """Dasturlar orasida o'tish"""
         self.hotkey('alt', 'tab')
         return "Boshqa dasturga o'tildi."
     
+    @command_handler(CommandType.KEYBOARD, "screenshot_region")
     def screenshot_region(self) -> str:
         """Ekranning bir qismini suratga olish"""
         self.hotkey('win', 'shift', 's')
@@ -203,61 +230,10 @@ class KeyboardFeatures:
     # ============== EXECUTE ==============
     def execute(self, action: str, params: dict) -> str:
         """Buyruqni bajarish"""
-        if action == "type":
-            return self.type_text_unicode(params.get("text", ""))
-        elif action == "press":
-            return self.press_key(params.get("key", ""))
-        elif action == "copy":
-            return self.copy()
-        elif action == "paste":
-            return self.paste()
-        elif action == "cut":
-            return self.cut()
-        elif action == "select_all":
-            return self.select_all()
-        elif action == "undo":
-            return self.undo()
-        elif action == "redo":
-            return self.redo()
-        elif action == "save":
-            return self.save()
-        elif action == "find":
-            return self.find()
-        elif action == "new":
-            return self.new_file()
-        elif action == "print":
-            return self.print_page()
-        # Browser
-        elif action == "new_tab":
-            return self.new_tab()
-        elif action == "close_tab":
-            return self.close_tab()
-        elif action == "refresh":
-            return self.refresh_page()
-        elif action == "switch_tab":
-            return self.switch_tab(params.get("direction", "next"))
-        elif action == "address_bar":
-            return self.address_bar()
-        elif action == "open_url":
-            return self.open_url_in_browser(params.get("url", ""))
-        # Clipboard
-        elif action == "read_clipboard":
-            return self.read_clipboard()
-        elif action == "clipboard_search":
-            return self.clipboard_to_search()
-        # Window
-        elif action == "zoom_in":
-            return self.zoom_in()
-        elif action == "zoom_out":
-            return self.zoom_out()
-        elif action == "full_screen":
-            return self.full_screen()
-        elif action == "alt_tab":
-            return self.alt_tab()
-        elif action == "screenshot_region":
-            return self.screenshot_region()
-        else:
-            return "Noma'lum klaviatura buyrug'i."
+        handler = action_table(self).get(action)
+        if handler:
+            return handler(params)
+        return "Noma'lum klaviatura buyrug'i."
 
 
 # Global instance
@@ -5,6 +5,8 @@ Media boshqaruvi - Musiqa, video
 import os
 import subprocess
 from typing import Dict, Any
+from core.commands import CommandType
+from core.dispatch import command_handler, action_table
 
 try:
     from pycaw.pycaw import AudioUtilities
@@ -19,6 +21,7 @@ class MediaFeatures:
     def __init__(self):
         self.music_dir = os.path.expanduser("~/Music")
     
+    @command_handler(CommandType.MEDIA, "play")
     def play_music(self) -> str:
         """Musiqa qo'yish"""
         try:
@@ -33,6 +36,7 @@ class MediaFeatures:
         except Exception as e:
             return f"Musiqani qo'yishda xatolik: {str(e)}"
     
+    @command_handler(CommandType.MEDIA, "pause")
     def pause_media(self) -> str:
         """Media to'xtatish (Windows klavish simulyatsiya)"""
         try:
@@ -42,6 +46,7 @@ class MediaFeatures:
         except:
             return "Media boshqaruvida xatolik."
     
+    @command_handler(CommandType.MEDIA, "resume")
     def resume_media(self) -> str:
         """Media davom ettirish"""
         try:
@@ -51,6 +56,7 @@ class MediaFeatures:
         except:
             return "Media boshqaruvida xatolik."
     
+    @command_handler(CommandType.MEDIA, "next")
     def next_track(self) -> str:
         """Keyingi trek"""
         try:
@@ -60,6 +66,7 @@ class MediaFeatures:
         except:
             return "Media boshqaruvida xatolik."
     
+    @command_handler(CommandType.MEDIA, "previous")
     def previous_track(self) -> str:
         """Oldingi trek"""
         try:
@@ -71,17 +78,9 @@ class MediaFeatures:
     
     def execute(self, action: str, params: Dict[str, Any]) -> str:
         """Buyruqni bajarish"""
-        if action == "play":
-            return self.play_music()
-        elif action == "pause":
-            return self.pause_media()
-        elif action == "resume":
-            return self.resume_media()
-        elif action == "next":
-            return self.next_track()
-        elif action == "previous":
-            return self.previous_track()
-        
+        handler = action_table(self).get(action)
+        if handler:
+            return handler(params)
         return "Kechirasiz, bu buyruqni bajara olmadim."
 
 
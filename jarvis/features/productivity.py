@@ -10,6 +10,8 @@ import threading
 import datetime
 from typing import Dict, Any, List
 import time as time_module
+from core.commands import CommandType
+from core.dispatch import command_handler, action_table
 
 
 class ProductivityFeatures:
@@ -42,6 +44,7 @@ class ProductivityFeatures:
         except:
             pass
     
+    @command_handler(CommandType.REMINDER, "set", time=5, unit="daqiqa")
     def set_timer(self, time_value: int, unit: str, callback=None) -> str:
         """Taymer qo'yish"""
         # Sekundga aylantirish
@@ -64,6 +67,7 @@ class ProductivityFeatures:
         
         return f"{time_value} {unit}dan keyin eslatib qo'yaman."
     
+    @command_handler(CommandType.REMINDER, "add", text="")
     def add_reminder(self, text: str) -> str:
         """Eslatma qo'shish"""
         reminder = {
@@ -75,6 +79,7 @@ class ProductivityFeatures:
         
         return f"Eslatma saqlandi: {text}"
     
+    @command_handler(CommandType.REMINDER, "list")
     def list_reminders(self) -> str:
         """Eslatmalarni o'qish"""
         if not self.reminders:
@@ -86,6 +91,7 @@ class ProductivityFeatures:
         
         return " ".join(result)
     
+    @command_handler(CommandType.MATH, "calculate", expression="")
     def calculate(self, expression: str) -> str:
         """Matematik hisoblash"""
         expression_lower = expression.lower()
@@ -160,19 +166,9 @@ class ProductivityFeatures:
     
     def execute(self, action: str, params: Dict[str, Any]) -> str:
         """Buyruqni bajarish"""
-        if action == "set":
-            time_value = params.get("time", 5)
-            unit = params.get("unit", "daqiqa")
-            return self.set_timer(time_value, unit)
-        elif action == "add":
-            text = params.get("text", "")
-            return self.add_reminder(text)
-        elif action == "list":
-            return self.list_reminders()
-        elif action == "calculate":
-            expression = params.get("expression", "")
-            return self.calculate(expression)
-        
+        handler = action_table(self).get(action)
+        if handler:
+            return handler(params)
         return "Kechirasiz, bu buyruqni bajara olmadim."
 
 
@@ -14,6 +14,8 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 
 import config
+from core.commands import CommandType
+from core.dispatch import command_handler
 
 
 class SmartCommands:
@@ -71,18 +73,22 @@ class SmartCommands:
             "Sizday aqlli foydalanuvchim bor ekanligidan xursandman! 🎉",
         ]
     
+    @command_handler(CommandType.SMART, "joke")
     def tell_joke(self) -> str:
         return random.choice(self.jokes)
     
+    @command_handler(CommandType.SMART, "motivation")
     def motivate(self) -> str:
         return random.choice(self.motivations)
     
+    @command_handler(CommandType.SMART, "fact")
     def tell_fact(self) -> str:
         return random.choice(self.facts)
     
     def compliment(self) -> str:
         return random.choice(self.compliments)
     
+    @command_handler(CommandType.SMART, "day_info")
     def get_day_info(self) -> str:
         """Kun haqida ma'lumot"""
         now = datetime.now()
@@ -99,14 +105,17 @@ class SmartCommands:
     def convert_currency_info(self) -> str:
         return "Hozircha valyuta kurslari API'si ulanmagan. Tez orada qo'shiladi!"
     
+    @command_handler(CommandType.SMART, "random")
     def get_random_number(self, min_val: int = 1, max_val: int = 100) -> str:
         num = random.randint(min_val, max_val)
         return f"Tasodifiy son: {num}"
     
+    @command_handler(CommandType.SMART, "coin")
     def flip_coin(self) -> str:
         result = random.choice(["Bosh", "Yozuv"])
         return f"Tanga tashlandi: {result}!"
     
+    @command_handler(CommandType.SMART, "dice")
     def roll_dice(self) -> str:
         num = random.randint(1, 6)
         return f"Zar tashlandi: {num} 🎲"
@@ -142,6 +151,7 @@ class SmartCommands:
             return f"{platform.capitalize()} ochilmoqda."
         return f"Kechirasiz, {platform} topilmadi."
     
+    @command_handler(CommandType.SMART, "ip")
     def get_ip_info(self) -> str:
         try:
             import socket
@@ -153,6 +163,7 @@ class SmartCommands:
     
     # ===== YANGI FUNKSIYALAR =====
     
+    @command_handler(CommandType.SMART, "password")
     def generate_password(self, length: int = 16) -> str:
         """Kuchli parol generatsiyasi"""
         chars = string.ascii_letters + string.digits + "!@#$%^&*"
@@ -193,6 +204,7 @@ class SmartCommands:
             return f"⏱️ Taymer {minutes} daqiqa {secs} soniyaga o'rnatildi."
         return f"⏱️ Taymer {seconds} soniyaga o'rnatildi."
     
+    @command_handler(CommandType.SMART, "disk")
     def get_disk_space(self) -> str:
         """Disk hajmi"""
         try:
@@ -206,6 +218,7 @@ class SmartCommands:
         except:
             return "Disk ma'lumotini olishda xatolik."
     
+    @command_handler(CommandType.SMART, "running_apps")
     def list_running_apps(self) -> str:
         """Ishga tushirilgan dasturlar"""
         try:
@@ -223,6 +236,7 @@ class SmartCommands:
         except:
             return "Dasturlar ro'yxatini olishda xatolik."
     
+    @command_handler(CommandType.SMART, "uptime")
     def system_uptime(self) -> str:
         """Tizim qancha vaqtdan beri ishlayapti"""
         try:
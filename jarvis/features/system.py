@@ -8,6 +8,8 @@ import platform
 import time
 import psutil
 from typing import Dict, Any
+from core.commands import CommandType
+from core.dispatch import command_handler, action_table
 
 try:
     from ctypes import cast, POINTER
@@ -46,6 +48,7 @@ class SystemFeatures:
                 print(f"[System] Volume init error: {e}")
                 self.volume = None
     
+    @command_handler(CommandType.SYSTEM, "info")
     def get_system_info(self) -> str:
         """Tizim haqida ma'lumot"""
         info = []
@@ -71,6 +74,7 @@ class SystemFeatures:
         
         return ". ".join(info)
     
+    @command_handler(CommandType.SYSTEM, "battery")
     def get_battery(self) -> str:
         """Batareya holati"""
         try:
@@ -84,6 +88,7 @@ class SystemFeatures:
         except:
             return "Batareya ma'lumotini olishda xatolik."
     
+    @command_handler(CommandType.SYSTEM, "volume_up")
     def volume_up(self, step: float = 0.1) -> str:
         """Ovozni ko'tarish"""
         if self.volume:
@@ -107,6 +112,7 @@ class SystemFeatures:
         except:
             return "Ovozni boshqarishda xatolik."
 
+    @command_handler(CommandType.SYSTEM, "volume_down")
     def volume_down(self, step: float = 0.1) -> str:
         """Ovozni pasaytirish"""
         if self.volume:
@@ -129,6 +135,7 @@ class SystemFeatures:
         except:
             return "Ovozni boshqarishda xatolik."
 
+    @command_handler(CommandType.SYSTEM, "volume_set", level=50)
     def set_volume(self, level: int) -> str:
         """Ovozni aniq darajaga o'rnatish (0-100)"""
         if self.volume:
@@ -153,6 +160,12 @@ class SystemFeatures:
         except:
             return "Ovozni boshqarishda xatolik."
 
+    @command_handler(CommandType.SYSTEM, "volume_max")
+    def volume_max(self) -> str:
+        """Ovozni maksimumga ko'tarish"""
+        return self.set_volume(100)
+
+    @command_handler(CommandType.SYSTEM, "mute")
     def volume_mute(self) -> str:
         """Ovozni o'chirish"""
         if self.volume:
@@ -163,6 +176,7 @@ class SystemFeatures:
                 return "Ovozni boshqarishda xatolik."
         return "Ovoz boshqaruvi ishlamayapti."
 
+    @command_handler(CommandType.SYSTEM, "unmute")
     def volume_unmute(self) -> str:
         """Ovozni yoqish"""
         if self.volume:
@@ -173,6 +187,7 @@ class SystemFeatures:
                 return "Ovozni boshqarishda xatolik."
         return "Ovoz boshqaruvi ishlamayapti."
 
+    @command_handler(CommandType.SYSTEM, "brightness_set", level=50)
     def set_brightness(self, level: int) -> str:
         """Yorqinlikni o'rnatish (0-100)"""
         try:
@@ -183,6 +198,7 @@ class SystemFeatures:
         except:
             return "Yorqinlikni boshqarishda xatolik."
 
+    @command_handler(CommandType.SYSTEM, "brightness_up")
     def brightness_up(self, step: int = 20) -> str:
         """Yorqinlikni oshirish"""
         try:
@@ -194,6 +210,7 @@ class SystemFeatures:
         except:
             return self.set_brightness(70)
 
+    @command_handler(CommandType.SYSTEM, "brightness_down")
     def brightness_down(self, step: int = 20) -> str:
         """Yorqinlikni pasaytirish"""
         try:
@@ -204,6 +221,7 @@ class SystemFeatures:
         except:
             return self.set_brightness(30)
 
+    @command_handler(CommandType.SYSTEM, "minimize_all")
     def minimize_all(self) -> str:
         """Barcha oynalarni kichraytirish (Ish stoli)"""
         try:
@@ -213,6 +231,7 @@ class SystemFeatures:
         except:
             return "Oynalarni boshqarishda xatolik."
 
+    @command_handler(CommandType.SYSTEM, "close_window")
     def close_window(self) -> str:
         """Faol oynani yopish"""
         try:
@@ -222,6 +241,7 @@ class SystemFeatures:
         except:
             return "Oynani yopishda xatolik."
 
+    @command_handler(CommandType.SYSTEM, "empty_trash")
     def empty_trash(self) -> str:
         """Savatchani bo'shatish"""
         try:
@@ -230,36 +250,43 @@ class SystemFeatures:
         except:
             return "Savatchani bo'shatishda xatolik."
 
+    @command_handler(CommandType.SYSTEM, "lock")
     def lock_computer(self) -> str:
         """Kompyuterni qulflash"""
         os.system("rundll32.exe user32.dll,LockWorkStation")
         return "Kompyuter qulflanmoqda."
 
+    @command_handler(CommandType.SYSTEM, "hibernate")
     def hibernate(self) -> str:
         """Gibrid uyqu"""
         os.system("shutdown /h")
         return "Kompyuter gibrid uyqu rejimiga o'tkazilmoqda."
 
+    @command_handler(CommandType.SYSTEM, "shutdown")
     def shutdown(self) -> str:
         """Kompyuterni o'chirish"""
         os.system("shutdown /s /t 60")
         return "Kompyuter 1 daqiqadan keyin o'chadi. Bekor qilish uchun 'shutdown bekor' deng."
     
+    @command_handler(CommandType.SYSTEM, "restart")
     def restart(self) -> str:
         """Kompyuterni qayta yuklash"""
         os.system("shutdown /r /t 60")
         return "Kompyuter 1 daqiqadan keyin qayta yuklanadi."
     
+    @command_handler(CommandType.SYSTEM, "sleep")
     def sleep(self) -> str:
         """Uxlash rejimi"""
         os.system("rundll32.exe powrprof.dll,SetSuspendState 0,1,0")
         return "Kompyuter uxlash rejimiga o'tmoqda."
     
+    @command_handler(CommandType.SYSTEM, "cancel_shutdown")
     def cancel_shutdown(self) -> str:
         """O'chirishni bekor qilish"""
         os.system("shutdown /a")
         return "O'chirish bekor qilindi."
     
+    @command_handler(CommandType.SYSTEM, "list_processes")
     def list_processes(self) -> str:
         """Top 5 CPU/RAM ishlatayotgan dasturlar"""
         try:
@@ -279,6 +306,7 @@ class SystemFeatures:
         except:
             return "Dasturlar ro'yxatini olishda xatolik."
 
+    @command_handler(CommandType.SYSTEM, "kill_process", app="")
     def kill_process(self, name: str) -> str:
         """Dasturni yopish (force kill)"""
         try:
@@ -294,6 +322,14 @@ class SystemFeatures:
         except:
             return f"{name} dasturini yopishda xatolik."
 
+    @command_handler(CommandType.SYSTEM, "focus_window", app="")
+    def focus_app(self, app: str) -> str:
+        """Dasturni fokusga keltirish (javob matni bilan)"""
+        if app:
+            success = self.focus_window(app)
+            return f"{app.capitalize()} fokusga keltirildi." if success else f"{app.capitalize()}ni topib bo'lmadi."
+        return "Qaysi dasturni fokusga keltirish kerak?"
+
     def focus_window(self, app_name: str) -> bool:
         """Dastur oynasini topish va fokusga keltirish"""
         if not PYWIN32_AVAILABLE:
@@ -327,6 +363,7 @@ class SystemFeatures:
                 return False
         return False
 
+    @command_handler(CommandType.SYSTEM, "network_status")
     def get_network_status(self) -> str:
         """Internet tezligi va Wi-Fi holati"""
         try:
@@ -348,6 +385,7 @@ class SystemFeatures:
         except:
             return "Internet aloqasi yo'q yoki Wi-Fi o'chirilgan."
 
+    @command_handler(CommandType.SYSTEM, "study_mode")
     def macro_study_mode(self) -> str:
         """Dars rejimi: Ovoz o'chadi, kerakli saytlar ochiladi"""
         self.volume_mute()
@@ -356,6 +394,7 @@ class SystemFeatures:
         os.system("start https://translate.google.com")
         return "Dars rejimi yoqildi. Omad tilayman!"
 
+    @command_handler(CommandType.SYSTEM, "cleaning_mode")
     def macro_cleaning_mode(self) -> str:
         """Tozalash rejimi: Savatcha va temp fayllar"""
         res1 = self.empty_trash()
@@ -372,65 +411,10 @@ class SystemFeatures:
 
     def execute(self, action: str, params: Dict[str, Any]) -> str:
         """Buyruqni bajarish"""
-        if action == "info":
-            return self.get_system_info()
-        elif action == "battery":
-            return self.get_battery()
-        elif action == "volume_up":
-            return self.volume_up()
-        elif action == "volume_down":
-            return self.volume_down()
-        elif action == "volume_max":
-            return self.set_volume(100)
-        elif action == "volume_set":
-            return self.set_volume(params.get("level", 50))
-        elif action == "mute":
-            return self.volume_mute()
-        elif action == "unmute":
-            return self.volume_unmute()
-        elif action == "brightness_set":
-            return self.set_brightness(params.get("level", 50))
-        elif action == "brightness_up":
-            return self.brightness_up()
-        elif action == "brightness_down":
-            return self.brightness_down()
-        elif action == "minimize_all":
-            return self.minimize_all()
-        elif action == "close_window":
-            return self.close_window()
-        elif action == "empty_trash":
-            return self.empty_trash()
-        elif action == "lock":
-            return self.lock_computer()
-        elif action == "focus_window":
-            app = params.get("app", "")
-            if app:
-                success = self.focus_window(app)
-                return f"{app.capitalize()} fokusga keltirildi." if success else f"{app.capitalize()}ni topib bo'lmadi."
-            return "Qaysi dasturni fokusga keltirish kerak?"
-        elif action == "hibernate":
-            return self.hibernate()
-        elif action == "shutdown":
-            return self.shutdown()
-        elif action == "restart":
-            return self.restart()
-        elif action == "sleep":
-            return self.sleep()
-        elif action == "cancel_shutdown":
-            return self.cancel_shutdown()
-        # PRO ACTIONS
-        elif action == "list_processes":
-            return self.list_processes()
-        elif action == "kill_process":
-            return self.kill_process(params.get("app", ""))
-        elif action == "network_status":
-            return self.get_network_status()
-        elif action == "study_mode":
-            return self.macro_study_mode()
-        elif action == "cleaning_mode":
-            return self.macro_cleaning_mode()
-        else:
-            return "Kechirasiz, bu buyruqni bajara olmadim."
+        handler = action_table(self).get(action)
+        if handler:
+            return handler(params)
+        return "Kechirasiz, bu buyruqni bajara olmadim."
 
 
 # Global instance
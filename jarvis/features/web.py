@@ -5,6 +5,8 @@ import urllib.parse
 from typing import Dict, Any, List
 
 import config
+from core.commands import CommandType
+from core.dispatch import command_handler, action_table
 
 
 class WebFeatures:
@@ -207,12 +209,26 @@ class WebFeatures:
         """Backward compatibility — smart_search ga yo'naltirish"""
         return self.smart_search(query)
     
+    @command_handler(CommandType.WEB_SEARCH, "search", engine="google", query="")
+    def search(self, engine: str, query: str) -> str:
+        """Tanlangan qidiruv tizimida qidirish"""
+        if engine == "google":
+            return self.search_google(query)
+        elif engine == "youtube":
+            return self.search_youtube(query)
+        elif engine == "wikipedia":
+            return self.search_wikipedia(query)
+        elif engine == "direct":
+            return self.open_website(query)
+        return "Kechirasiz, bu buyruqni bajara olmadim."
+
     def search_youtube(self, query: str) -> str:
         """YouTubeda qidirish"""
         url = f"https://www.youtube.com/results?search_query={urllib.parse.quote(query)}"
         webbrowser.open(url)
         return f"YouTube'da '{query}' qidirilmoqda."
     
+    @command_handler(CommandType.MEDIA, "youtube_music", query="")
     def play_youtube_music(self, query: str) -> str:
         """YouTubeda musiqa qo'yish"""
         # YouTube Music orqali
@@ -220,6 +236,7 @@ class WebFeatures:
         webbrowser.open(url)
         return f"YouTube Music'da '{query}' qo'shig'i qo'yilmoqda."
     
+    @command_handler(CommandType.MEDIA, "youtube_video", query="")
     def play_youtube_video(self, query: str) -> str:
         """YouTubeda birinchi videoni ochish"""
         try:
@@ -243,6 +260,7 @@ class WebFeatures:
         webbrowser.open(url)
         return f"Sayt ochilmoqda."
     
+    @command_handler(CommandType.SOCIAL, "open", "social", platform="")
     def open_social(self, platform: str) -> str:
         """Ijtimoiy tarmoqni ochish"""
         urls = {
@@ -265,6 +283,7 @@ class WebFeatures:
         else:
             return f"{platform} topilmadi."
     
+    @command_handler(CommandType.WEATHER, "current", city=None)
     def get_weather(self, city: str = None) -> str:
         """Ob-havo ma'lumoti"""
         city = city or self.default_city
@@ -300,31 +319,9 @@ class WebFeatures:
     
     def execute(self, action: str, params: Dict[str, Any]) -> str:
         """Buyruqni bajarish"""
-        if action == "search":
-            engine = params.get("engine", "google")
-            query = params.get("query", "")
-            
-            if engine == "google":
-                return self.search_google(query)
-            elif engine == "youtube":
-                return self.search_youtube(query)
-            elif engine == "wikipedia":
-                return self.search_wikipedia(query)
-            elif engine == "direct":
-                return self.open_website(query)
-        elif action == "youtube_music":
-            query = params.get("query", "")
-            return self.play_youtube_music(query)
-        elif action == "youtube_video":
-            query = params.get("query", "")
-            return self.play_youtube_video(query)
-        elif action == "social":
-            platform = params.get("platform", "")
-            return self.open_social(platform)
-        elif action == "current":
-            city = params.get("city")
-            return self.get_weather(city)
-        
+        handler = action_table(self).get(action)
+        if handler:
+            return handler(params)
         return "Kechirasiz, bu buyruqni bajara olmadim."
 
 
@@ -380,7 +380,8 @@ class JarvisPyQtApp(QMainWindow):
     def _toggle_mic(self):
         """Mic tugmasi bosilganda"""
         if jarvis.is_speaking:
-            return # Gapirayotgan bo'lsa kutish kerak
+            jarvis.stop_speaking()  # Gapirayotgan bo'lsa - to'xtatish (barge-in)
+            return
             
         if not jarvis.is_listening:
             wake_detector.pause()
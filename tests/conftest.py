@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Loyiha modullari (config, core.*) jarvis/ papkasidan import qilinadi
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "jarvis"))
@@ -0,0 +1,57 @@
+"""
+VAD testlari uchun WAV fixturelarni yaratish (16 kHz, mono, 16-bit)
+Nutq o'rnida - bo'g'in ritmida (~4 Hz) o'zgaruvchan, formantli garmonik signal.
+
+    python tests/fixtures/vad/make_fixtures.py
+"""
+
+import os
+import wave
+
+import numpy as np
+
+RATE = 16000
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def dbfs(level_db, n, rng):
+    """Berilgan darajadagi oq shovqin"""
+    return rng.normal(0, 32768 * 10 ** (level_db / 20), n)
+
+
+def speech(seconds, rng, level_db=-22, depth=0.45):
+    """Nutqqa o'xshash signal: asosiy ton 105-155 Hz, bo'g'in ritmida amplituda o'zgaradi (depth)"""
+    t = np.arange(int(seconds * RATE)) / RATE
+    pitch = 130 + 25 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / RATE
+    voiced = sum(np.sin(k * phase) / k * (1.5 if 4 <= k <= 6 else 1.0) for k in range(1, 20))
+    syllables = 1 - depth + depth * np.sin(2 * np.pi * 4.2 * t + rng.uniform(0, np.pi))
+    signal = voiced * syllables ** 2
+    signal *= 32768 * 10 ** (level_db / 20) / np.sqrt(np.mean(signal ** 2))
+    return signal + dbfs(-55, len(t), rng)
+
+
+def write(name, signal):
+    with wave.open(os.path.join(HERE, name), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(RATE)
+        wf.writeframes(np.clip(signal, -32768, 32767).astype(np.int16).tobytes())
+
+
+def main():
+    rng = np.random.default_rng(19)
+    # Jim xona - nutq yo'q
+    write("silence.wav", dbfs(-62, RATE, rng))
+    # Ventilyator/ko'cha shovqini - nutq yo'q
+    write("noise_only.wav", dbfs(-40, RATE, rng))
+    # Boshida va oxirida sukunatsiz, uzluksiz nutq (bo'g'inlar orasida ham deyarli pasayish yo'q)
+    write("speech_only.wav", speech(1.5, rng, depth=0.15))
+    # Shovqin ichida nutq: 0.8 s shovqin, 0.8 s nutq, 0.8 s shovqin
+    noise = dbfs(-40, int(2.4 * RATE), rng)
+    noise[int(0.8 * RATE):int(1.6 * RATE)] += speech(0.8, rng)
+    write("noisy_speech.wav", noise)
+
+
+if __name__ == "__main__":
+    main()
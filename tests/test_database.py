@@ -0,0 +1,112 @@
+"""
+DatabaseManager - vaqtinchalik bazada
+Write-behind navbati (await_flush, close, xatoda qayta navbatga qo'yish),
+find_similar - o'xshash savollar qidiruvi
+"""
+
+import sqlite3
+
+import pytest
+
+from core import database
+from core.commands import CommandType
+from core.database import DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(db_path=str(tmp_path / "jarvis.db"), maintenance_interval=0)
+    yield manager
+    manager.close()
+
+
+def stored(db_path):
+    """Alohida ulanish orqali bazadagi savol-javoblar"""
+    conn = sqlite3.connect(db_path)
+    try:
+        return dict(conn.execute("SELECT question, answer FROM qa"))
+    finally:
+        conn.close()
+
+
+def test_await_flush_commits_queued_writes(db):
+    for index in range(5):
+        db.save_qa(f"savol {index}", f"javob {index}", CommandType.AI_CHAT.value)
+    assert db.await_flush()
+    assert stored(db.db_path) == {f"savol {index}": f"javob {index}" for index in range(5)}
+
+
+def test_close_flushes_pending_writes(tmp_path):
+    # Taymer ham, to'plam hajmi ham yetmaydi - yozuvni faqat close() tushiradi
+    manager = DatabaseManager(db_path=str(tmp_path / "jarvis.db"), batch_size=100,
+                              flush_interval=60, maintenance_interval=0)
+    manager.save_qa("savol", "javob", CommandType.AI_CHAT.value)
+    assert stored(manager.db_path) == {}
+    manager.close()
+    assert stored(manager.db_path) == {"savol": "javob"}
+
+
+def test_failed_flush_requeues_writes(db, monkeypatch):
+    monkeypatch.setattr(database, "SQL_SAVE_QA", "INSERT INTO missing_table VALUES (?, ?, ?, ?, ?, ?)")
+    db.save_qa("birinchi", "javob 1", CommandType.AI_CHAT.value)
+    db.save_qa("ikkinchi", "javob 2", CommandType.AI_CHAT.value)
+    assert not db.await_flush()
+    assert db._flush_failures >= 1 and db._flush_error is not None
+    assert stored(db.db_path) == {}
+    # Yozuvlar yo'qolmagan: navbatdan o'qiladi va xato tuzalgach yoziladi
+    db.clear_cache()
+    assert db.get_answer("birinchi") == "javob 1"
+    monkeypatch.undo()
+    db.save_qa("ikkinchi", "javob 2 (yangi)", CommandType.AI_CHAT.value)
+    assert db.await_flush()
+    assert stored(db.db_path) == {"birinchi": "javob 1", "ikkinchi": "javob 2 (yangi)"}
+    assert db._flush_error is None
+
+
+def test_similar_finds_saved_chat_answer(db):
+    db.save_qa("python nima", "Python - dasturlash tili.", CommandType.AI_CHAT.value)
+    assert db.await_flush()
+    question, answer, score = db.find_similar("python nima?")
+    assert (question, answer, score) == ("python nima", "Python - dasturlash tili.", 1.0)
+
+
+def test_similar_never_returns_web_search_confirmation(db):
+    # web_search yozuvi - brauzer ochilgani haqida tasdiq; qaytarilsa qidiruv bajarilmaydi
+    db.save_qa("google da python qidir", "Google'da 'python' qidirilmoqda.", CommandType.WEB_SEARCH.value)
+    db.save_qa("youtube da musiqa qidir", "YouTube'da 'musiqa' qidirilmoqda.", CommandType.WEB_SEARCH.value)
+    assert db.await_flush()
+    for text in ("google da python qidir", "python qidir", "youtube da musiqa qidir"):
+        assert db.find_similar(text) is None
+
+
+def test_similar_scores_whole_words(db):
+    db.save_qa("python nima", "Python - dasturlash tili.", CommandType.AI_CHAT.value)
+    db.save_qa("soat necha bo'ldi", "Soat 12:00.", CommandType.AI_CHAT.value)
+    assert db.await_flush()
+    # Umumiy 4 harfli boshlanish ma'noni bir xil qilmaydi
+    assert db.find_similar("python nimadir") is None
+    # Harf xatosi - o'sha savol
+    question, _, score = db.find_similar("soat necha boldi")
+    assert question == "soat necha bo'ldi" and db.similar_min_score <= score < 1.0
+
+
+@pytest.mark.parametrize("a, b", [
+    ("python nima", "python nimadir"),
+    ("java nima o'zi", "python nima o'zi"),
+    ("5 plyus 5", "5 plyus 6"),
+])
+def test_different_questions_score_below_default(db, a, b):
+    assert db._similarity(a, b) < db.similar_min_score
+
+
+def test_close_does_not_repool_checked_out_connection(db):
+    # Shutdown paytida boshqa oqim ulanishni ushlab turibdi
+    with db._connection() as busy:
+        db.close()
+        assert busy.execute("SELECT 1").fetchone() == (1,)
+    # Qaytarilgan eski ulanish yopilgan va hovuzga tushmagan
+    with pytest.raises(Exception):
+        busy.execute("SELECT 1")
+    with db._connection() as conn:
+        assert conn is not busy
+        assert conn.execute("SELECT 1").fetchone() == (1,)
@@ -0,0 +1,111 @@
+"""
+VoiceActivityDetector - WAV fixturelar bilan (tests/fixtures/vad, make_fixtures.py yaratadi)
+PhraseSegmenter - shovqin darajasini qayta o'lchash (drift va oraliq)
+"""
+
+import io
+import os
+import wave
+
+import numpy as np
+import pytest
+
+from core.vad import PhraseSegmenter, VoiceActivityDetector
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "vad")
+
+
+def load(name):
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+def duration(wav_bytes):
+    with wave.open(io.BytesIO(wav_bytes), "rb") as wf:
+        return wf.getnframes() / wf.getframerate()
+
+
+@pytest.fixture
+def vad():
+    return VoiceActivityDetector()
+
+
+@pytest.mark.parametrize("name", ["silence.wav", "noise_only.wav"])
+def test_no_speech_is_rejected(vad, name):
+    assert vad.process(load(name)) is None
+    assert vad.stats()["rejected"] == 1
+
+
+def test_speech_only_clip_is_kept_whole(vad):
+    # Sukunatsiz yozuvda o'z persentili nutq darajasi - chegara max_noise_db bilan cheklanadi
+    result = vad.process(load("speech_only.wav"))
+    assert result is not None
+    assert duration(result) == pytest.approx(1.5, abs=0.01)
+
+
+def test_noisy_speech_is_trimmed_around_speech(vad):
+    result = vad.process(load("noisy_speech.wav"))
+    assert result is not None
+    # Nutq 0.8-1.6 s; atrofida padding_ms zaxira qoladi
+    assert 0.8 <= duration(result) <= 0.8 + 2 * vad.padding_ms / 1000 + 0.1
+
+
+def test_calibrated_noise_floor_is_used(vad):
+    assert vad.process(load("speech_only.wav"), noise_floor=-60.0) is not None
+    assert vad.process(load("noise_only.wav"), noise_floor=-40.0) is None
+    result = vad.process(load("noisy_speech.wav"), noise_floor=-40.0)
+    assert result is not None and duration(result) < 1.4
+
+
+def test_non_pcm16_is_passed_through(vad):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(1)
+        wf.setframerate(8000)
+        wf.writeframes(b"\x80" * 8000)
+    assert vad.process(buffer.getvalue()) == buffer.getvalue()
+
+
+def feed_all(segmenter, pcm, block=2048):
+    """PCM ni bloklab berish -> ajratilgan iboralar"""
+    phrases = []
+    for offset in range(0, len(pcm), block):
+        phrase = segmenter.feed(pcm[offset:offset + block], (offset + block) / 2 / 16000)
+        if phrase:
+            phrases.append(phrase)
+    return phrases
+
+
+def noise(level_db, seconds, rng):
+    return rng.normal(0, 32768 * 10 ** (level_db / 20), int(seconds * 16000))
+
+
+def to_pcm(signal):
+    return np.clip(signal, -32768, 32767).astype(np.int16).tobytes()
+
+
+def test_segmenter_recalibrates_on_noise_drift():
+    rng = np.random.default_rng(18)
+    segmenter = PhraseSegmenter(recalibrate_seconds=None)
+    # Jim xona, keyin ventilyator yoqildi (+30 dB)
+    feed_all(segmenter, to_pcm(np.concatenate([noise(-60, 5, rng), noise(-30, 8, rng)])))
+    assert segmenter.recalibrations == 1
+    assert segmenter.noise_floor == pytest.approx(-30, abs=2)
+
+
+def test_segmenter_does_not_treat_speech_as_drift():
+    rng = np.random.default_rng(18)
+    segmenter = PhraseSegmenter(max_seconds=12)
+    speech = load("speech_only.wav")[44:]
+    pcm = to_pcm(noise(-60, 5, rng)) + speech * 2 + to_pcm(noise(-60, 2, rng))
+    phrases = feed_all(segmenter, pcm)
+    assert segmenter.recalibrations == 0
+    assert len(phrases) == 1 and phrases[0].end - phrases[0].start >= 3.0
+
+
+def test_segmenter_recalibrates_on_interval_only_in_silence():
+    rng = np.random.default_rng(18)
+    segmenter = PhraseSegmenter(recalibrate_seconds=10, drift_db=None)
+    feed_all(segmenter, to_pcm(noise(-60, 25, rng)))
+    assert segmenter.recalibrations >= 1